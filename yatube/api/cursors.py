@@ -0,0 +1,34 @@
+"""Непрозрачные курсоры по (pub_date, id) для постраничного вывода.
+
+Курсор указывает на последний отданный пост; следующая страница —
+посты строго раньше него в порядке (-pub_date, -id). В отличие от
+номера страницы, курсор не сдвигается при появлении новых постов
+и не требует OFFSET.
+"""
+import base64
+import binascii
+from datetime import datetime
+
+from django.db.models import Q
+
+
+def encode(pub_date, pk):
+    raw = f'{pub_date.isoformat()}|{pk}'.encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode()
+
+
+def decode(token):
+    """(pub_date, pk) из курсора; ValueError, если курсор испорчен."""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        pub_date, _, pk = raw.decode().partition('|')
+        return datetime.fromisoformat(pub_date), int(pk)
+    except (binascii.Error, UnicodeDecodeError) as error:
+        raise ValueError(str(error))
+
+
+def before(queryset, cursor):
+    pub_date, pk = cursor
+    return queryset.filter(
+        Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, pk__lt=pk)
+    )
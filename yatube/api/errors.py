@@ -0,0 +1,6 @@
+class ApiError(Exception):
+    """Ошибка запроса к API: отдаётся клиенту JSON с этим статусом."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
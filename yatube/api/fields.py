@@ -0,0 +1,78 @@
+"""Поля поста в ответах API и колонки values(), из которых они берутся."""
+from core.reverse import reverse_cached
+from posts.models import Post, stored_text
+
+IMAGE_STORAGE = Post._meta.get_field('image').storage
+# Колонки курсора всегда идут первыми.
+CURSOR_COLUMNS = ('pub_date', 'pk')
+
+
+def _same(value):
+    return value
+
+
+def _full_name(first_name, last_name):
+    return f'{first_name} {last_name}'.strip()
+
+
+def _image(name):
+    return IMAGE_STORAGE.url(name) if name else None
+
+
+def _url(pk):
+    return reverse_cached('posts:post_detail', (pk,))
+
+
+LIST_FIELDS = {
+    'id': (('pk',), _same),
+    'excerpt': (('excerpt',), _same),
+    'is_long': (('is_long',), _same),
+    'pub_date': (('pub_date',), lambda value: value.isoformat()),
+    'author': (('author__username',), _same),
+    'author_name': (('author__first_name', 'author__last_name'), _full_name),
+    'group': (('group__slug',), _same),
+    'group_title': (('group__title',), _same),
+    'image': (('image',), _image),
+    'url': (('pk',), _url),
+}
+DETAIL_FIELDS = {
+    **LIST_FIELDS,
+    'text': (('text', 'text_compressed'), stored_text),
+}
+
+
+class Projection:
+    """Выбранные поля: колонки для values_list и сборка словаря из строки."""
+
+    def __init__(self, names, fields):
+        columns = list(CURSOR_COLUMNS)
+        self.getters = []
+        for name in names:
+            needed, convert = fields[name]
+            for column in needed:
+                if column not in columns:
+                    columns.append(column)
+            self.getters.append((
+                name, tuple(columns.index(column) for column in needed),
+                convert,
+            ))
+        self.columns = tuple(columns)
+
+    @classmethod
+    def parse(cls, value, fields):
+        """Разбирает параметр fields=a,b; ValueError на неизвестное поле."""
+        if not value:
+            return cls(list(fields), fields)
+        names = list(dict.fromkeys(
+            name.strip() for name in value.split(',') if name.strip()
+        ))
+        unknown = [name for name in names if name not in fields]
+        if unknown or not names:
+            raise ValueError(f'Неизвестные поля: {", ".join(unknown)}')
+        return cls(names, fields)
+
+    def serialize(self, row):
+        return {
+            name: convert(*(row[index] for index in indexes))
+            for name, indexes, convert in self.getters
+        }
@@ -0,0 +1,136 @@
+"""Сервер долгого опроса для проверки новых постов.
+
+Принимает те же параметры, что и api/v1/posts/since/, плюс wait —
+сколько секунд держать соединение, если новых постов нет. Все
+соединения обслуживает один цикл asyncio: ожидающий клиент — это
+Future, а не занятый поток. Проверку (кеш и, при изменениях, база)
+выполняет небольшой пул потоков. Ожидание заканчивается по
+UDP-уведомлению от процессов сайта (api.since.notify) или по времени.
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qsl, urlsplit
+
+from django.db import close_old_connections
+
+from .errors import ApiError
+from .since import SinceQuery
+from .views import dumps
+
+logger = logging.getLogger(__name__)
+
+MAX_HEADERS = 100
+
+
+class Notifications(asyncio.DatagramProtocol):
+    def __init__(self, server):
+        self.server = server
+
+    def datagram_received(self, data, address):
+        self.server.wake(data.decode(errors='replace').split())
+
+
+class LongPollServer:
+    def __init__(self, max_wait, threads):
+        self.max_wait = max_wait
+        # Без потоков проверка идёт прямо в цикле: для тестов и отладки.
+        self.executor = ThreadPoolExecutor(threads) if threads else None
+        self.waiters = defaultdict(set)
+
+    async def run(self, func, *args):
+        if self.executor is None:
+            return func(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    def wake(self, scopes):
+        for scope in scopes:
+            for future in self.waiters.pop(scope, ()):
+                if not future.done():
+                    future.set_result(None)
+
+    def _unsubscribe(self, scope, future):
+        waiters = self.waiters.get(scope)
+        if waiters is not None:
+            waiters.discard(future)
+            if not waiters:
+                del self.waiters[scope]
+
+    def _check(self, query):
+        close_old_connections()
+        return query.result()
+
+    def _wait(self, params):
+        try:
+            wait = float(params.get('wait', 0))
+        except ValueError:
+            raise ApiError(400, 'Неверное значение wait')
+        return min(max(wait, 0.0), self.max_wait)
+
+    async def respond(self, params):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._wait(params)
+        query = await self.run(SinceQuery.from_params, params)
+        while True:
+            # Подписка до проверки: уведомление между ними не теряется.
+            future = loop.create_future()
+            self.waiters[query.scope].add(future)
+            try:
+                data = await self.run(self._check, query)
+                remaining = deadline - loop.time()
+                if data['count'] or remaining <= 0:
+                    return data
+                try:
+                    await asyncio.wait_for(future, remaining)
+                except asyncio.TimeoutError:
+                    pass
+            finally:
+                self._unsubscribe(query.scope, future)
+
+    async def _read_params(self, reader):
+        request_line = (await reader.readline()).decode('latin-1')
+        for _ in range(MAX_HEADERS):
+            if (await reader.readline()) in (b'\r\n', b'\n', b''):
+                break
+        method, target, _ = request_line.split(' ', 2)
+        if method != 'GET':
+            raise ApiError(405, 'Поддерживается только GET')
+        return dict(parse_qsl(urlsplit(target).query))
+
+    async def handle(self, reader, writer):
+        try:
+            try:
+                data = await self.respond(await self._read_params(reader))
+                status = 200
+            except ApiError as error:
+                data, status = {'error': str(error)}, error.status
+            except ValueError:
+                data, status = {'error': 'Неверный запрос'}, 400
+            body = dumps(data)
+            head = (
+                f'HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n'
+                'Content-Type: application/json\r\n'
+                'Cache-Control: no-store\r\n'
+                f'Content-Length: {len(body)}\r\n'
+                'Connection: close\r\n\r\n'
+            )
+            writer.write(head.encode() + body)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        except Exception:
+            logger.exception('Ошибка долгого опроса')
+        finally:
+            writer.close()
+
+    async def start(self, host, port, notify_address):
+        """Открывает HTTP- и UDP-сокеты; возвращает (сервер, транспорт)."""
+        loop = asyncio.get_running_loop()
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: Notifications(self), local_addr=tuple(notify_address)
+        )
+        server = await asyncio.start_server(self.handle, host, port)
+        return server, transport
@@ -0,0 +1,52 @@
+import asyncio
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.longpoll import LongPollServer
+
+
+class Command(BaseCommand):
+    help = 'Запускает сервер долгого опроса новых постов на asyncio'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default=settings.LONGPOLL_HOST)
+        parser.add_argument(
+            '--port', type=int, default=settings.LONGPOLL_PORT
+        )
+        parser.add_argument(
+            '--max-wait', type=float, default=settings.LONGPOLL_MAX_WAIT,
+            help='Наибольшее время ожидания одного запроса, секунд',
+        )
+        parser.add_argument(
+            '--threads', type=int, default=settings.LONGPOLL_THREADS,
+            help='Потоков для проверок по кешу и базе',
+        )
+
+    async def serve(self, options):
+        longpoll = LongPollServer(options['max_wait'], options['threads'])
+        server, transport = await longpoll.start(
+            options['host'], options['port'],
+            settings.LONGPOLL_NOTIFY_ADDRESS,
+        )
+        host, port = server.sockets[0].getsockname()[:2]
+        notify_host, notify_port = transport.get_extra_info('sockname')[:2]
+        self.stdout.write(
+            f'Слушаю http://{host}:{port}/, '
+            f'уведомления udp://{notify_host}:{notify_port}'
+        )
+        self.stdout.flush()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            transport.close()
+
+    def handle(self, *args, **options):
+        if settings.LONGPOLL_NOTIFY_ADDRESS is None:
+            raise CommandError('Не задан LONGPOLL_NOTIFY_ADDRESS')
+        try:
+            asyncio.run(self.serve(options))
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write('Сервер остановлен')
@@ -0,0 +1,135 @@
+"""Проверка «появились ли посты новее», почти без запросов к базе.
+
+Для всей ленты, каждой группы и каждого автора в общем кеше хранится
+отметка самого нового поста: id и время публикации. Если клиент уже
+видел этот пост, ответ собирается без обращения к базе. Сохранение
+и удаление поста сбрасывают отметки его лент и шлют UDP-уведомление
+серверу долгого опроса (api.longpoll).
+"""
+import socket
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from posts.lookups import groups, users
+from posts.models import Post
+from .errors import ApiError
+
+_socket = None
+
+
+def post_scopes(post):
+    scopes = ['all', f'author:{post.author_id}']
+    if post.group_id is not None:
+        scopes.append(f'group:{post.group_id}')
+    return scopes
+
+
+def _key(scope):
+    return f'since:{scope}'
+
+
+def notify(scopes):
+    """Шлёт серверу долгого опроса список изменившихся лент."""
+    global _socket
+    address = settings.LONGPOLL_NOTIFY_ADDRESS
+    if address is None:
+        return
+    try:
+        if _socket is None:
+            _socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            _socket.setblocking(False)
+        _socket.sendto(' '.join(scopes).encode(), tuple(address))
+    except OSError:
+        pass
+
+
+def forget(post):
+    """Сбрасывает отметки лент поста сейчас и после коммита."""
+    scopes = post_scopes(post)
+    keys = [_key(scope) for scope in scopes]
+    cache.delete_many(keys)
+
+    def on_commit():
+        cache.delete_many(keys)
+        notify(scopes)
+
+    transaction.on_commit(on_commit)
+
+
+def _parse_date(value):
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment
+
+
+class SinceQuery:
+    def __init__(self, scope, queryset, after=None, since=None):
+        self.scope = scope
+        self.queryset = queryset
+        self.after = after
+        self.since = since
+
+    @classmethod
+    def from_params(cls, params):
+        """Запрос из after=<id> или since=<ISO-время> и group/author."""
+        after, since = params.get('after'), params.get('since')
+        if (after is None) == (since is None):
+            raise ApiError(400, 'Нужен один из параметров: after или since')
+        try:
+            after = int(after) if after is not None else None
+            since = _parse_date(since) if since is not None else None
+        except ValueError:
+            raise ApiError(400, 'Неверное значение after или since')
+        scope, queryset = 'all', Post.objects.all()
+        if params.get('group'):
+            group = groups.get(params['group'])
+            if group is None:
+                raise ApiError(404, 'Группа не найдена')
+            scope = f'group:{group.pk}'
+            queryset = queryset.filter(group_id=group.pk)
+        elif params.get('author'):
+            author = users.get(params['author'])
+            if author is None:
+                raise ApiError(404, 'Пользователь не найден')
+            scope = f'author:{author.pk}'
+            queryset = queryset.filter(author_id=author.pk)
+        return cls(scope, queryset, after, since)
+
+    def high_water(self):
+        """(id, pub_date) самого нового поста ленты; (0, None) — пусто."""
+        mark = cache.get(_key(self.scope))
+        if mark is None:
+            mark = self.queryset.order_by('-pub_date', '-pk').values_list(
+                'pk', 'pub_date'
+            ).first() or (0, None)
+            cache.add(_key(self.scope), mark, settings.SINCE_CACHE_TIMEOUT)
+        return mark
+
+    def seen(self, mark):
+        pk, pub_date = mark
+        if pub_date is None:
+            return True
+        if self.after is not None:
+            return self.after >= pk
+        return self.since >= pub_date
+
+    def newer(self):
+        if self.after is not None:
+            return self.queryset.filter(pk__gt=self.after)
+        return self.queryset.filter(pub_date__gt=self.since)
+
+    def result(self):
+        mark = self.high_water()
+        if self.seen(mark):
+            return {'latest': mark[0] or None, 'count': 0, 'ids': []}
+        newer = self.newer()
+        limit = settings.API_MAX_PAGE_SIZE
+        ids = list(newer.order_by('-pub_date', '-pk').values_list(
+            'pk', flat=True
+        )[:limit])
+        count = len(ids) if len(ids) < limit else newer.count()
+        return {'latest': mark[0], 'count': count, 'ids': ids}
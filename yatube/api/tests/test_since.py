@@ -0,0 +1,142 @@
+import asyncio
+import json
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Group, Post
+from ..longpoll import LongPollServer
+from ..since import notify
+
+User = get_user_model()
+
+
+class SinceTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(author=cls.user, text='Пост')
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('api:posts_since')
+
+    def since(self, **params):
+        response = self.client.get(self.url, params)
+        return response.status_code, json.loads(response.content)
+
+    def test_nothing_new_without_queries(self):
+        """Если клиент видел последний пост, база не читается."""
+        self.since(after=self.post.pk)
+        with self.assertNumQueries(0):
+            status, data = self.since(after=self.post.pk)
+        self.assertEqual(status, 200)
+        self.assertEqual(
+            data, {'latest': self.post.pk, 'count': 0, 'ids': []}
+        )
+
+    def test_new_posts_counted(self):
+        """Новые посты приходят по id и по времени, с учётом группы."""
+        self.since(after=self.post.pk)
+        new = Post.objects.create(
+            author=self.user, group=self.group, text='Новый'
+        )
+        cases = (
+            ({'after': self.post.pk}, [new.pk]),
+            ({'since': self.post.pub_date.isoformat()}, [new.pk]),
+            ({'after': 0, 'group': 'test-slug'}, [new.pk]),
+            ({'after': 0, 'author': 'auth'}, [new.pk, self.post.pk]),
+        )
+        for params, ids in cases:
+            with self.subTest(params=params):
+                status, data = self.since(**params)
+                self.assertEqual(data['count'], len(ids))
+                self.assertEqual(data['ids'], ids)
+                self.assertEqual(data['latest'], new.pk)
+
+    def test_bad_parameters(self):
+        """Без after/since или с неизвестной группой — ошибка."""
+        cases = (
+            ({}, 400),
+            ({'after': 'x'}, 400),
+            ({'after': 1, 'since': '2020-01-01'}, 400),
+            ({'after': 1, 'group': 'missing'}, 404),
+        )
+        for params, expected in cases:
+            with self.subTest(params=params):
+                self.assertEqual(self.since(**params)[0], expected)
+
+
+class LongPollTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='auth')
+        cls.post = Post.objects.create(author=cls.user, text='Пост')
+
+    def setUp(self):
+        cache.clear()
+        self.server = LongPollServer(max_wait=5, threads=0)
+
+    def test_timeout_without_news(self):
+        """Без новых постов ответ приходит по истечении wait."""
+        started = time.monotonic()
+        data = asyncio.run(self.server.respond(
+            {'after': str(self.post.pk), 'wait': '0.1'}
+        ))
+        self.assertEqual(data['count'], 0)
+        self.assertGreaterEqual(time.monotonic() - started, 0.1)
+        self.assertFalse(self.server.waiters)
+
+    def test_udp_notification_wakes_waiter(self):
+        """Уведомление по UDP сразу будит ожидающий запрос."""
+        async def scenario():
+            server, transport = await self.server.start(
+                '127.0.0.1', 0, ('127.0.0.1', 0)
+            )
+            address = transport.get_extra_info('sockname')[:2]
+            waiting = asyncio.ensure_future(self.server.respond(
+                {'after': str(self.post.pk), 'wait': '5'}
+            ))
+            await asyncio.sleep(0.05)
+            self.assertFalse(waiting.done())
+            new = Post.objects.create(author=self.user, text='Новый')
+            with override_settings(LONGPOLL_NOTIFY_ADDRESS=address):
+                notify(['all'])
+            data = await asyncio.wait_for(waiting, 1)
+            server.close()
+            transport.close()
+            return new, data
+
+        new, data = asyncio.run(scenario())
+        self.assertEqual(data['ids'], [new.pk])
+
+    def test_http_response(self):
+        """Сервер отвечает на HTTP-запрос JSON без кеширования."""
+        async def scenario():
+            server, transport = await self.server.start(
+                '127.0.0.1', 0, ('127.0.0.1', 0)
+            )
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(
+                f'GET /?after={self.post.pk}&wait=0 HTTP/1.1\r\n'
+                'Host: localhost\r\n\r\n'.encode()
+            )
+            response = await reader.read()
+            writer.close()
+            server.close()
+            transport.close()
+            return response
+
+        head, _, body = asyncio.run(scenario()).partition(b'\r\n\r\n')
+        self.assertTrue(head.startswith(b'HTTP/1.1 200 OK'))
+        self.assertIn(b'Cache-Control: no-store', head)
+        self.assertEqual(json.loads(body)['count'], 0)
@@ -0,0 +1,110 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class ApiTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='auth', first_name='Имя', last_name='Автор'
+        )
+        cls.other = User.objects.create_user(username='other')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.posts = [
+            Post.objects.create(
+                author=cls.user, group=cls.group, text=f'Пост {number}'
+            )
+            for number in range(5)
+        ]
+        cls.foreign = Post.objects.create(author=cls.other, text='Чужой')
+
+    def get_json(self, url, **params):
+        response = self.client.get(url, params)
+        return response, json.loads(response.content)
+
+    def test_cursor_walks_all_posts(self):
+        """Курсоры проходят ленту без пропусков и повторов."""
+        url = reverse('api:index')
+        seen, params = [], {'limit': 2}
+        while True:
+            response, data = self.get_json(url, **params)
+            self.assertEqual(response.status_code, 200)
+            seen += [post['id'] for post in data['results']]
+            if data['next'] is None:
+                break
+            params['cursor'] = data['next']
+        expected = [
+            post.pk for post in Post.objects.order_by('-pub_date', '-pk')
+        ]
+        self.assertEqual(seen, expected)
+
+    def test_fields_projection(self):
+        """fields= оставляет в ответе только перечисленные поля."""
+        _, data = self.get_json(reverse('api:index'), fields='id,author')
+        self.assertEqual(
+            data['results'][0],
+            {'id': self.foreign.pk, 'author': 'other'},
+        )
+        response, _ = self.get_json(reverse('api:index'), fields='secret')
+        self.assertEqual(response.status_code, 400)
+
+    def test_group_and_profile(self):
+        """Лента группы и автора содержит только их посты."""
+        cases = {
+            reverse('api:group_list', args=('test-slug',)): 'group',
+            reverse('api:profile', args=('other',)): 'author',
+        }
+        for url, key in cases.items():
+            with self.subTest(url=url):
+                _, data = self.get_json(url, limit=100)
+                self.assertIn(key, data)
+                authors = {post['author'] for post in data['results']}
+                groups = {post['group'] for post in data['results']}
+                if key == 'group':
+                    self.assertEqual(len(data['results']), 5)
+                    self.assertEqual(groups, {'test-slug'})
+                else:
+                    self.assertEqual(authors, {'other'})
+        response, _ = self.get_json(
+            reverse('api:group_list', args=('missing',))
+        )
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(POST_EXCERPT_LENGTH=5, POST_COMPRESS_MIN_LENGTH=10)
+    def test_post_detail_full_text(self):
+        """Страница поста отдаёт полный текст, даже сжатый в базе."""
+        post = Post.objects.create(author=self.user, text='Длинный ' * 10)
+        _, data = self.get_json(
+            reverse('api:post_detail', args=(post.pk,)), fields='text,url'
+        )
+        self.assertEqual(
+            data, {'text': 'Длинный ' * 10, 'url': f'/posts/{post.pk}/'}
+        )
+
+    def test_bad_parameters(self):
+        """Испорченный курсор и неверный limit — 400."""
+        for params in ({'cursor': 'мусор'}, {'limit': 0}, {'limit': 'x'}):
+            with self.subTest(params=params):
+                response, data = self.get_json(reverse('api:index'), **params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('error', data)
+
+    def test_caching_headers(self):
+        """Ответ компактный, с ETag; повторный запрос с ним получает 304."""
+        url = reverse('api:index')
+        response = self.client.get(url)
+        self.assertNotIn(b', ', response.content)
+        self.assertIn('max-age', response['Cache-Control'])
+        repeated = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(repeated.status_code, 304)
@@ -0,0 +1,156 @@
+"""JSON-версии лент и страницы поста для мобильного клиента.
+
+Ответы собираются прямо из values_list без моделей и шаблонов,
+сериализуются компактно и отдаются с ETag и Cache-Control.
+"""
+import hashlib
+import json
+from functools import partial, wraps
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from django.views.decorators.http import require_safe
+
+from posts.lookups import groups, users
+from posts.models import Post
+from . import cursors, since
+from .errors import ApiError
+from .fields import DETAIL_FIELDS, LIST_FIELDS, Projection
+
+
+def dumps(data):
+    return json.dumps(
+        data, ensure_ascii=False, separators=(',', ':')
+    ).encode()
+
+
+def json_response(request, data, status=200, max_age=None):
+    if max_age is None:
+        max_age = settings.API_MAX_AGE
+    body = dumps(data)
+    etag = quote_etag(hashlib.md5(body).hexdigest())
+    response = None
+    if status == 200:
+        response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(
+            body, status=status, content_type='application/json'
+        )
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=max_age)
+    return response
+
+
+def api_view(view=None, *, max_age=None):
+    """Отдаёт словарь из view как JSON, а ApiError — как ошибку."""
+    if view is None:
+        return partial(api_view, max_age=max_age)
+
+    @require_safe
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            data = view(request, *args, **kwargs)
+        except ApiError as error:
+            return json_response(
+                request, {'error': str(error)}, status=error.status,
+                max_age=max_age,
+            )
+        return json_response(request, data, max_age=max_age)
+    return wrapper
+
+
+def _limit(request):
+    value = request.GET.get('limit')
+    if value is None:
+        return settings.API_PAGE_SIZE
+    try:
+        limit = int(value)
+    except ValueError:
+        limit = 0
+    if not 1 <= limit <= settings.API_MAX_PAGE_SIZE:
+        raise ApiError(
+            400, f'limit: число от 1 до {settings.API_MAX_PAGE_SIZE}'
+        )
+    return limit
+
+
+def _projection(request, fields):
+    try:
+        return Projection.parse(request.GET.get('fields'), fields)
+    except ValueError as error:
+        raise ApiError(400, str(error))
+
+
+def posts_page(request, queryset):
+    """Страница постов после курсора и курсор следующей страницы."""
+    projection = _projection(request, LIST_FIELDS)
+    limit = _limit(request)
+    queryset = queryset.order_by('-pub_date', '-pk')
+    token = request.GET.get('cursor')
+    if token:
+        try:
+            queryset = cursors.before(queryset, cursors.decode(token))
+        except ValueError:
+            raise ApiError(400, 'Неверный курсор')
+    rows = list(queryset.values_list(*projection.columns)[:limit + 1])
+    next_token = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_token = cursors.encode(*rows[-1][:2])
+    return {
+        'results': [projection.serialize(row) for row in rows],
+        'next': next_token,
+    }
+
+
+@api_view
+def index(request):
+    return posts_page(request, Post.objects.all())
+
+
+@api_view
+def group_posts(request, slug):
+    group = groups.get(slug)
+    if group is None:
+        raise ApiError(404, 'Группа не найдена')
+    return {
+        'group': {
+            'slug': group.slug,
+            'title': group.title,
+            'description': group.description,
+        },
+        **posts_page(request, Post.objects.filter(group_id=group.pk)),
+    }
+
+
+@api_view
+def profile(request, username):
+    author = users.get(username)
+    if author is None:
+        raise ApiError(404, 'Пользователь не найден')
+    return {
+        'author': {
+            'username': author.username,
+            'name': author.get_full_name(),
+        },
+        **posts_page(request, Post.objects.filter(author_id=author.pk)),
+    }
+
+
+@api_view
+def post_detail(request, post_id):
+    projection = _projection(request, DETAIL_FIELDS)
+    row = Post.objects.filter(pk=post_id).values_list(
+        *projection.columns
+    ).first()
+    if row is None:
+        raise ApiError(404, 'Пост не найден')
+    return projection.serialize(row)
+
+
+@api_view(max_age=0)
+def posts_since(request):
+    return since.SinceQuery.from_params(request.GET).result()
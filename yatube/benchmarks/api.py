@@ -0,0 +1,59 @@
+"""CPU на запрос: HTML-страницы против JSON API.
+
+Вызывает представления напрямую через RequestFactory, без кеша
+страниц, чтобы сравнить стоимость самой сборки ответа.
+
+    python -m benchmarks.api --posts 200 --number 200
+"""
+import argparse
+
+from benchmarks.utils import measure, report, seed, setup
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--posts', type=int, default=200)
+    parser.add_argument('--number', type=int, default=200)
+    args = parser.parse_args()
+
+    setup()
+    from django.contrib.auth.models import AnonymousUser
+    from django.test import RequestFactory
+
+    from api import views as api_views
+    from posts import views as html_views
+    from posts.models import Post
+
+    authors, group_list = seed(posts=args.posts)
+    post_id = Post.objects.values_list('pk', flat=True).first()
+    factory = RequestFactory()
+
+    def call(view, *view_args):
+        request = factory.get('/')
+        request.user = AnonymousUser()
+        return lambda: view(request, *view_args)
+
+    pages = {
+        'index': (
+            html_views.index.__wrapped__, api_views.index, ()
+        ),
+        'group': (
+            html_views.group_posts, api_views.group_posts,
+            (group_list[0].slug,),
+        ),
+        'profile': (
+            html_views.profile, api_views.profile, (authors[0].username,)
+        ),
+        'post': (
+            html_views.post_detail, api_views.post_detail, (post_id,)
+        ),
+    }
+    for name, (html, api, view_args) in pages.items():
+        report(name, [
+            ('html', measure(call(html, *view_args), args.number)),
+            ('json', measure(call(api, *view_args), args.number)),
+        ])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""CPU на запрос главной страницы для анонима.
+
+Сравнивает Django cache_page + GZipMiddleware, которые сжимают
+закешированную страницу на каждом запросе, с gzip_page_cache,
+который хранит страницу уже сжатой.
+
+    python -m benchmarks.gzip_index
+"""
+import argparse
+
+from benchmarks.utils import measure, report, seed, setup
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--posts', type=int, default=100)
+    args = parser.parse_args()
+
+    setup()
+    from django.conf import settings
+    from django.test import Client, override_settings
+    from django.urls import include, path
+    from django.views.decorators.cache import cache_page
+
+    from posts.views import index
+
+    class Urls:
+        urlpatterns = [
+            path(
+                'gzip-middleware/',
+                cache_page(settings.INDEX_CACHE_TIMEOUT)(index.__wrapped__)
+            ),
+            path('', include('yatube.urls')),
+        ]
+
+    seed(posts=args.posts)
+    client = Client()
+    rows = []
+    middleware = ['django.middleware.gzip.GZipMiddleware']
+    middleware += settings.MIDDLEWARE
+    with override_settings(ROOT_URLCONF=Urls, MIDDLEWARE=middleware):
+        rows.append(('cache_page + GZipMiddleware', measure(
+            lambda: client.get(
+                '/gzip-middleware/', HTTP_ACCEPT_ENCODING='gzip'
+            ),
+            args.requests,
+        )))
+    with override_settings(ROOT_URLCONF=Urls):
+        rows.append(('gzip_page_cache, gzip', measure(
+            lambda: client.get('/', HTTP_ACCEPT_ENCODING='gzip'),
+            args.requests,
+        )))
+        rows.append(('gzip_page_cache, без gzip', measure(
+            lambda: client.get('/'), args.requests,
+        )))
+    report(f'Главная страница, {args.posts} постов в базе', rows)
+
+
+if __name__ == '__main__':
+    main()
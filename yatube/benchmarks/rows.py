@@ -0,0 +1,65 @@
+"""Память и время отрисовки ленты: модели против строк posts.rows.
+
+Для каждого размера страницы загружает посты экземплярами моделей
+с select_related и строками Rows, замеряет пик памяти на загрузку
+через tracemalloc и время загрузки и отрисовки карточек.
+
+    python -m benchmarks.rows --sizes 10 50 200
+"""
+import argparse
+import tracemalloc
+
+from benchmarks.utils import measure, report, seed, setup
+
+TEMPLATE = (
+    "{% for post in posts %}"
+    "{% include 'posts/includes/card.html' %}"
+    "{% endfor %}"
+)
+
+
+def peak_memory(load):
+    tracemalloc.start()
+    posts = load()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del posts
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 50, 200])
+    parser.add_argument('--number', type=int, default=100)
+    args = parser.parse_args()
+
+    setup()
+    from django.template import engines
+
+    from posts.models import Post
+    from posts.rows import Rows
+
+    template = engines['django'].from_string(TEMPLATE)
+    seed(posts=max(args.sizes))
+    loaders = {
+        'модели': lambda size: list(
+            Post.objects.select_related('author', 'group')[:size]
+        ),
+        'строки': lambda size: Rows(Post.objects.all())[:size],
+    }
+    for size in args.sizes:
+        rows = []
+        for name, load in loaders.items():
+            result = measure(
+                lambda: template.render({'posts': load(size)}), args.number
+            )
+            result['load_ms'] = measure(lambda: load(size), args.number)[
+                'cpu_ms'
+            ]
+            result['peak_kb'] = peak_memory(lambda: load(size)) / 1024
+            rows.append((name, result))
+        report(f'Страница из {size} постов', rows)
+
+
+if __name__ == '__main__':
+    main()
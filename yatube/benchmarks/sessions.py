@@ -0,0 +1,41 @@
+"""Авторизованный запрос главной страницы в разных режимах сессий.
+
+    python -m benchmarks.sessions
+"""
+import argparse
+
+from benchmarks.utils import measure, report, seed, setup
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=300)
+    args = parser.parse_args()
+
+    setup()
+    from django.conf import settings
+    from django.db import connection
+    from django.test import Client, override_settings
+    from django.test.utils import CaptureQueriesContext
+
+    authors, _ = seed()
+    rows = []
+    for mode, engine in settings.SESSION_ENGINES.items():
+        with override_settings(SESSION_ENGINE=engine):
+            client = Client()
+            client.force_login(authors[0])
+            with CaptureQueriesContext(connection) as queries:
+                client.get('/')
+            total_queries = len(queries)
+            session_queries = sum(
+                'django_session' in query['sql'] for query in queries
+            )
+            result = measure(lambda: client.get('/'), args.requests)
+            result['queries'] = total_queries
+            result['session_queries'] = session_queries
+            rows.append((mode, result))
+    report('Главная страница, авторизованный пользователь', rows)
+
+
+if __name__ == '__main__':
+    main()
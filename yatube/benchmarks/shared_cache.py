@@ -0,0 +1,101 @@
+"""Несколько процессов-воркеров над одним кешем.
+
+Каждый процесс читает случайные ключи из общего набора и при промахе
+«строит» значение и кладёт его в кеш. Для LocMemCache каждый процесс
+строит всё сам, для MmapCache и FileBasedCache построенное видно всем.
+
+    python -m benchmarks.shared_cache [--processes 8]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from benchmarks.utils import report, setup
+
+VALUE = {'posts': [{'id': n, 'text': 'Текст поста ' * 10} for n in range(10)]}
+
+
+def worker(cache, keys, operations, seed, results):
+    rng = random.Random(seed)
+    builds = 0
+    start = time.perf_counter()
+    for _ in range(operations):
+        key = f'object:{rng.randrange(keys)}'
+        if cache.get(key) is None:
+            builds += 1
+            cache.set(key, VALUE, 300)
+    results.put((builds, time.perf_counter() - start))
+
+
+def run(cache, processes, keys, operations):
+    context = multiprocessing.get_context('fork')
+    results = context.Queue()
+    workers = [
+        context.Process(
+            target=worker,
+            args=(cache, keys, operations, number, results),
+        )
+        for number in range(processes)
+    ]
+    start = time.perf_counter()
+    for process in workers:
+        process.start()
+    collected = [results.get() for _ in workers]
+    for process in workers:
+        process.join()
+    elapsed = time.perf_counter() - start
+    return {
+        'ops_per_s': processes * operations / elapsed,
+        'builds': sum(builds for builds, _ in collected),
+        'us_per_op': sum(seconds for _, seconds in collected)
+        / (processes * operations) * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--processes', type=int, default=8)
+    parser.add_argument('--keys', type=int, default=1000)
+    parser.add_argument('--operations', type=int, default=20000)
+    args = parser.parse_args()
+
+    setup(database=False)
+    from django.core.cache.backends.filebased import FileBasedCache
+    from django.core.cache.backends.locmem import LocMemCache
+
+    from core.cache.mmap import MmapCache
+
+    directory = tempfile.mkdtemp()
+    try:
+        backends = (
+            ('LocMemCache', LocMemCache('benchmark', {
+                'OPTIONS': {'MAX_ENTRIES': args.keys * 2},
+            })),
+            ('FileBasedCache', FileBasedCache(
+                os.path.join(directory, 'files'),
+                {'OPTIONS': {'MAX_ENTRIES': args.keys * 2}},
+            )),
+            ('MmapCache', MmapCache(
+                os.path.join(directory, 'cache.mmap'),
+                {'OPTIONS': {'SLOTS': args.keys * 4, 'SLOT_SIZE': 4096}},
+            )),
+        )
+        rows = [
+            (name, run(cache, args.processes, args.keys, args.operations))
+            for name, cache in backends
+        ]
+    finally:
+        shutil.rmtree(directory)
+    report(
+        f'{args.processes} процессов, {args.keys} ключей, '
+        f'{args.operations} операций на процесс',
+        rows,
+    )
+
+
+if __name__ == '__main__':
+    main()
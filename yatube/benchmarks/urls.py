@@ -0,0 +1,66 @@
+"""Ссылки карточек: {% url %} против get_absolute_url на reverse_cached.
+
+Отрисовывает три ссылки карточки (профиль, пост, группа) для страницы
+из --posts постов обоими способами и всю страницу главной целиком.
+
+    python -m benchmarks.urls --posts 100
+"""
+import argparse
+
+from benchmarks.utils import measure, report, seed, setup
+
+URL_TAGS = (
+    "{% for post in posts %}"
+    "{% url 'posts:profile' post.author %}"
+    "{% url 'posts:post_detail' post.pk %}"
+    "{% url 'posts:group_list' post.group.slug %}"
+    "{% endfor %}"
+)
+ABSOLUTE_URLS = (
+    "{% for post in posts %}"
+    "{{ post.author.get_absolute_url }}"
+    "{{ post.get_absolute_url }}"
+    "{{ post.group.get_absolute_url }}"
+    "{% endfor %}"
+)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--posts', type=int, default=100)
+    parser.add_argument('--number', type=int, default=200)
+    args = parser.parse_args()
+
+    setup()
+    from django.template import engines
+
+    from posts.models import Post
+    from posts.rows import Rows
+
+    seed(posts=args.posts)
+    posts = Rows(Post.objects.all())[:args.posts]
+    engine = engines['django']
+    context = {'posts': posts}
+    card = engine.from_string(
+        "{% for post in posts %}"
+        "{% include 'posts/includes/card.html' %}"
+        "{% endfor %}"
+    )
+    url_tags = engine.from_string(URL_TAGS)
+    absolute_urls = engine.from_string(ABSOLUTE_URLS)
+    rows = [
+        ('{% url %}', measure(
+            lambda: url_tags.render(context), args.number,
+        )),
+        ('get_absolute_url', measure(
+            lambda: absolute_urls.render(context), args.number,
+        )),
+        ('карточки целиком', measure(
+            lambda: card.render(context), args.number,
+        )),
+    ]
+    report(f'Ссылки для страницы из {args.posts} постов', rows)
+
+
+if __name__ == '__main__':
+    main()
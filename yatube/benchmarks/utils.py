@@ -0,0 +1,87 @@
+"""Общие помощники для бенчмарков.
+
+Бенчмарки запускаются из каталога с manage.py:
+
+    python -m benchmarks.<имя>
+
+Каждый создаёт отдельную тестовую базу в памяти и не трогает db.sqlite3.
+"""
+import os
+import statistics
+import time
+
+import django
+
+
+def setup(database=True):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
+    django.setup()
+    from django.conf import settings
+    from django.db import connection
+
+    settings.DEBUG = False
+    if database:
+        connection.creation.create_test_db(verbosity=0, serialize=False)
+
+
+def seed(posts=100, groups=5, users=10, text='Тестовый пост'):
+    from django.contrib.auth import get_user_model
+
+    from posts.models import Group, Post
+
+    User = get_user_model()
+    authors = User.objects.bulk_create(
+        User(username=f'user{number}', first_name='Имя', last_name='Автор')
+        for number in range(users)
+    )
+    authors = list(User.objects.filter(
+        username__in=[author.username for author in authors]
+    ))
+    group_list = Group.objects.bulk_create(
+        Group(
+            title=f'Группа {number}',
+            slug=f'group-{number}',
+            description='Описание',
+        )
+        for number in range(groups)
+    )
+    group_list = list(Group.objects.filter(
+        slug__in=[group.slug for group in group_list]
+    ))
+    Post.objects.bulk_create(
+        Post(
+            text=f'{text} {number}',
+            author=authors[number % len(authors)],
+            group=group_list[number % len(group_list)] if group_list else None,
+        )
+        for number in range(posts)
+    )
+    return authors, group_list
+
+
+def measure(func, number=200, warmup=20):
+    """Возвращает CPU и wall-время одного вызова func в миллисекундах."""
+    for _ in range(warmup):
+        func()
+    cpu, wall = [], []
+    for _ in range(number):
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        func()
+        cpu.append(time.process_time() - cpu_start)
+        wall.append(time.perf_counter() - wall_start)
+    return {
+        'cpu_ms': statistics.mean(cpu) * 1000,
+        'wall_ms': statistics.median(wall) * 1000,
+    }
+
+
+def report(title, rows):
+    print(title)
+    width = max(len(name) for name, _ in rows)
+    for name, result in rows:
+        values = '  '.join(
+            f'{key}={value:.3f}' if isinstance(value, float)
+            else f'{key}={value}'
+            for key, value in result.items()
+        )
+        print(f'  {name.ljust(width)}  {values}')
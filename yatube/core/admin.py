@@ -0,0 +1,28 @@
+from django.contrib import admin
+
+from .models import Job, OutgoingEmail
+
+
+class JobAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk',
+        'name',
+        'status',
+        'attempts',
+        'run_after',
+        'created',
+    )
+    search_fields = ('name', 'key')
+    list_filter = ('status', 'name')
+    empty_value_display = '-пусто-'
+
+
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'to', 'subject', 'status', 'attempts', 'created')
+    search_fields = ('to', 'subject')
+    list_filter = ('status',)
+    empty_value_display = '-пусто-'
+
+
+admin.site.register(Job, JobAdmin)
+admin.site.register(OutgoingEmail, OutgoingEmailAdmin)
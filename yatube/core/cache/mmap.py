@@ -0,0 +1,304 @@
+"""Кеш в общем memory-mapped файле для всех процессов на машине.
+
+Файл — хеш-таблица фиксированного размера: заголовок и SLOTS слотов
+по SLOT_SIZE байт. Ключ ищется линейным пробированием в окне из PROBE
+слотов; если свободного слота в окне нет, жертва выбирается по CLOCK.
+Доступ между процессами упорядочивается через flock, между потоками —
+обычной блокировкой. Значения, не влезающие в слот, не кешируются:
+старое значение ключа удаляется, в лог пишется предупреждение.
+
+    CACHES = {
+        'default': {
+            'BACKEND': 'core.cache.mmap.MmapCache',
+            'LOCATION': '/tmp/yatube-cache.mmap',
+            'OPTIONS': {'SLOTS': 8192, 'SLOT_SIZE': 8192},
+        },
+    }
+"""
+import fcntl
+import hashlib
+import logging
+import mmap
+import os
+import pickle
+import struct
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+MAGIC = b'YTMC'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sIIII')
+HEADER_SIZE = 64
+# хеш ключа, срок жизни, длина ключа, длина значения, флаги
+SLOT = struct.Struct('<QdHIB')
+FLAGS_OFFSET = SLOT.size - 1
+REFERENCED = 1
+CLEAR_CHUNK = 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+class MmapCache(BaseCache):
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._path = location
+        self._slots = int(options.get('SLOTS', 8192))
+        self._slot_size = int(options.get('SLOT_SIZE', 8192))
+        self._probe = min(int(options.get('PROBE', 8)), self._slots)
+        self._size = HEADER_SIZE + self._slots * self._slot_size
+        self._lock = threading.Lock()
+        self._pid = None
+        self._fd = None
+        self._mm = None
+
+    def _open(self):
+        if self._fd is not None:
+            # Унаследовано от родителя после fork: flock должен
+            # работать на собственном открытом файле процесса.
+            self._mm.close()
+            os.close(self._fd)
+        fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            header = os.pread(fd, HEADER.size, 0)
+            expected = HEADER.pack(
+                MAGIC, FORMAT_VERSION, self._slots, self._slot_size, 0
+            )
+            if (
+                os.fstat(fd).st_size != self._size
+                or header[:-4] != expected[:-4]
+            ):
+                os.ftruncate(fd, 0)
+                os.ftruncate(fd, self._size)
+                os.pwrite(fd, expected, 0)
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        self._fd = fd
+        self._mm = mmap.mmap(fd, self._size)
+        self._pid = os.getpid()
+
+    @contextmanager
+    def _locked(self, shared=False):
+        with self._lock:
+            if self._pid != os.getpid():
+                self._open()
+            fcntl.flock(self._fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield self._mm
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _encode_key(self, key, version):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        key_bytes = key.encode()
+        key_hash = int.from_bytes(
+            hashlib.blake2b(key_bytes, digest_size=8).digest(), 'little'
+        )
+        return key_bytes, key_hash or 1
+
+    def _offset(self, index):
+        return HEADER_SIZE + index * self._slot_size
+
+    def _window(self, key_hash):
+        start = key_hash % self._slots
+        for step in range(self._probe):
+            yield self._offset((start + step) % self._slots)
+
+    def _find(self, mm, key_bytes, key_hash):
+        """Возвращает (смещение, заголовок) живой записи или None."""
+        for offset in self._window(key_hash):
+            header = SLOT.unpack_from(mm, offset)
+            if header[0] != key_hash:
+                continue
+            start = offset + SLOT.size
+            if mm[start:start + header[2]] != key_bytes:
+                continue
+            if header[1] and header[1] <= time.time():
+                return None
+            return offset, header
+        return None
+
+    def _read(self, mm, offset, header):
+        start = offset + SLOT.size + header[2]
+        return pickle.loads(mm[start:start + header[3]])
+
+    def _victim(self, mm, key_hash):
+        """Выбирает слот для записи: пустой, просроченный или по CLOCK."""
+        now = time.time()
+        offsets = list(self._window(key_hash))
+        for offset in offsets:
+            stored_hash, expires = SLOT.unpack_from(mm, offset)[:2]
+            if not stored_hash or (expires and expires <= now):
+                return offset
+        hand = HEADER.unpack_from(mm, 0)[4]
+        for step in range(2 * len(offsets)):
+            offset = offsets[(hand + step) % len(offsets)]
+            if mm[offset + FLAGS_OFFSET] & REFERENCED:
+                mm[offset + FLAGS_OFFSET] &= ~REFERENCED & 0xFF
+                continue
+            struct.pack_into(
+                '<I', mm, HEADER.size - 4, (hand + step + 1) & 0xFFFFFFFF
+            )
+            return offset
+        return offsets[0]
+
+    def _write(self, mm, key_bytes, key_hash, value, timeout):
+        """Записывает значение; False, если оно не влезает в слот."""
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        found = self._find_any(mm, key_bytes, key_hash)
+        if SLOT.size + len(key_bytes) + len(data) > self._slot_size:
+            if found is not None:
+                self._clear_slot(mm, found)
+            logger.warning(
+                'Значение ключа %s (%d байт) не влезает в слот '
+                '(%d байт) и не закешировано',
+                key_bytes.decode(), len(data),
+                self._slot_size,
+            )
+            return False
+        offset = found if found is not None else self._victim(mm, key_hash)
+        expires = self.get_backend_timeout(timeout) or 0
+        SLOT.pack_into(
+            mm, offset, key_hash, expires, len(key_bytes), len(data),
+            REFERENCED
+        )
+        start = offset + SLOT.size
+        mm[start:start + len(key_bytes)] = key_bytes
+        start += len(key_bytes)
+        mm[start:start + len(data)] = data
+        return True
+
+    def _find_any(self, mm, key_bytes, key_hash):
+        """Ищет слот с ключом, в том числе просроченный."""
+        for offset in self._window(key_hash):
+            header = SLOT.unpack_from(mm, offset)
+            start = offset + SLOT.size
+            if (
+                header[0] == key_hash
+                and mm[start:start + header[2]] == key_bytes
+            ):
+                return offset
+        return None
+
+    def _clear_slot(self, mm, offset):
+        SLOT.pack_into(mm, offset, 0, 0, 0, 0, 0)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key_bytes, key_hash = self._encode_key(key, version)
+        with self._locked() as mm:
+            if self._find(mm, key_bytes, key_hash) is not None:
+                return False
+            return self._write(mm, key_bytes, key_hash, value, timeout)
+
+    def get(self, key, default=None, version=None):
+        key_bytes, key_hash = self._encode_key(key, version)
+        with self._locked(shared=True) as mm:
+            found = self._find(mm, key_bytes, key_hash)
+            if found is None:
+                return default
+            offset, header = found
+            mm[offset + FLAGS_OFFSET] = header[4] | REFERENCED
+            return self._read(mm, offset, header)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key_bytes, key_hash = self._encode_key(key, version)
+        with self._locked() as mm:
+            self._write(mm, key_bytes, key_hash, value, timeout)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key_bytes, key_hash = self._encode_key(key, version)
+        with self._locked() as mm:
+            found = self._find(mm, key_bytes, key_hash)
+            if found is None:
+                return False
+            expires = self.get_backend_timeout(timeout) or 0
+            struct.pack_into('<d', mm, found[0] + 8, expires)
+            return True
+
+    def delete(self, key, version=None):
+        key_bytes, key_hash = self._encode_key(key, version)
+        with self._locked() as mm:
+            found = self._find_any(mm, key_bytes, key_hash)
+            if found is not None:
+                self._clear_slot(mm, found)
+
+    def has_key(self, key, version=None):
+        key_bytes, key_hash = self._encode_key(key, version)
+        with self._locked(shared=True) as mm:
+            return self._find(mm, key_bytes, key_hash) is not None
+
+    def incr(self, key, delta=1, version=None):
+        key_bytes, key_hash = self._encode_key(key, version)
+        with self._locked() as mm:
+            found = self._find(mm, key_bytes, key_hash)
+            if found is None:
+                raise ValueError("Key '%s' not found" % key)
+            offset, header = found
+            value = self._read(mm, offset, header) + delta
+            data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            start = offset + SLOT.size + header[2]
+            if len(data) > self._slot_size - SLOT.size - header[2]:
+                raise ValueError("Value for key '%s' is too large" % key)
+            mm[start:start + len(data)] = data
+            struct.pack_into('<I', mm, offset + 18, len(data))
+            return value
+
+    def update(self, key, func, timeout=DEFAULT_TIMEOUT, version=None):
+        """Атомарно для всех процессов заменяет значение ключа.
+
+        func получает текущее значение (None, если ключа нет) и
+        возвращает пару (новое значение, результат для вызывающего).
+        """
+        key_bytes, key_hash = self._encode_key(key, version)
+        with self._locked() as mm:
+            found = self._find(mm, key_bytes, key_hash)
+            value = None if found is None else self._read(mm, *found)
+            value, result = func(value)
+            self._write(mm, key_bytes, key_hash, value, timeout)
+            return result
+
+    def get_many(self, keys, version=None):
+        encoded = {
+            key: self._encode_key(key, version) for key in keys
+        }
+        result = {}
+        with self._locked(shared=True) as mm:
+            for key, (key_bytes, key_hash) in encoded.items():
+                found = self._find(mm, key_bytes, key_hash)
+                if found is not None:
+                    offset, header = found
+                    mm[offset + FLAGS_OFFSET] = header[4] | REFERENCED
+                    result[key] = self._read(mm, offset, header)
+        return result
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        encoded = [
+            (key, self._encode_key(key, version), value)
+            for key, value in data.items()
+        ]
+        failed = []
+        with self._locked() as mm:
+            for key, (key_bytes, key_hash), value in encoded:
+                if not self._write(mm, key_bytes, key_hash, value, timeout):
+                    failed.append(key)
+        return failed
+
+    def delete_many(self, keys, version=None):
+        encoded = [self._encode_key(key, version) for key in keys]
+        with self._locked() as mm:
+            for key_bytes, key_hash in encoded:
+                found = self._find_any(mm, key_bytes, key_hash)
+                if found is not None:
+                    self._clear_slot(mm, found)
+
+    def clear(self):
+        with self._locked() as mm:
+            zeros = bytes(CLEAR_CHUNK)
+            for start in range(HEADER_SIZE, self._size, CLEAR_CHUNK):
+                end = min(start + CLEAR_CHUNK, self._size)
+                mm[start:end] = zeros[:end - start]
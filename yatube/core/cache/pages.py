@@ -0,0 +1,118 @@
+import gzip
+import hashlib
+from functools import wraps
+
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import parse_http_date_safe, quote_etag
+
+from ..files import accepts_gzip
+from .stampede import get_or_compute
+from .versions import bump_version, get_version
+
+
+def invalidate(key_prefix):
+    """Сбрасывает все закешированные страницы с этим префиксом."""
+    bump_version(f'pages:{key_prefix}')
+
+
+def _page_key(request, key_prefix):
+    version = get_version(f'pages:{key_prefix}')
+    # Хост входит в ключ: ленты содержат абсолютные адреса.
+    path = hashlib.md5(
+        (request.get_host() + request.get_full_path()).encode()
+    ).hexdigest()
+    return f'pages:{key_prefix}:{version}:{path}'
+
+
+def _cacheable(response):
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        and not response.has_header('Content-Encoding')
+        and 'private' not in response.get('Cache-Control', '')
+    )
+
+
+def _build_entry(response):
+    content = response.content
+    return {
+        'content_type': response['Content-Type'],
+        'etag': quote_etag(hashlib.md5(content).hexdigest()),
+        'last_modified': response.get('Last-Modified'),
+        'body': gzip.compress(content, compresslevel=6, mtime=0),
+    }
+
+
+def _full_response(entry, use_gzip):
+    if use_gzip:
+        response = HttpResponse(
+            entry['body'], content_type=entry['content_type']
+        )
+        response['Content-Encoding'] = 'gzip'
+        return response
+    return HttpResponse(
+        gzip.decompress(entry['body']), content_type=entry['content_type']
+    )
+
+
+def _respond(request, entry):
+    """Отдаёт запись кеша или 304 по If-None-Match/If-Modified-Since."""
+    use_gzip = accepts_gzip(request)
+    etag = entry['etag']
+    if use_gzip:
+        # Сжатое тело — другие байты, и сильный ETag у него свой,
+        # как у статики в core.files.
+        etag = etag[:-1] + '-gz"'
+    last_modified = entry.get('last_modified')
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=last_modified and parse_http_date_safe(last_modified),
+    )
+    if response is None:
+        response = _full_response(entry, use_gzip)
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = last_modified
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
+
+
+class _Uncacheable(Exception):
+    def __init__(self, response):
+        self.response = response
+
+
+def gzip_page_cache(timeout, key_prefix):
+    """Кеширует страницу для анонимов сразу в сжатом виде.
+
+    Клиенты с gzip получают сохранённые байты как есть,
+    остальным страница распаковывается на лету. Истёкшую страницу
+    пересчитывает один запрос, остальные получают прежнюю версию.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if (
+                request.method not in ('GET', 'HEAD')
+                or request.user.is_authenticated
+            ):
+                return view(request, *args, **kwargs)
+
+            def build():
+                response = view(request, *args, **kwargs)
+                if not _cacheable(response):
+                    raise _Uncacheable(response)
+                return _build_entry(response)
+
+            try:
+                entry = get_or_compute(
+                    _page_key(request, key_prefix), build, timeout
+                )
+            except _Uncacheable as uncacheable:
+                return uncacheable.response
+            return _respond(request, entry)
+        return wrapper
+    return decorator
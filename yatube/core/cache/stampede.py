@@ -0,0 +1,103 @@
+"""Защита горячих ключей кеша от одновременного пересчёта.
+
+Значение хранится вместе со сроком годности и временем расчёта.
+Пересчитывает его только тот, кто взял блокировку ``<ключ>:lock``
+через cache.add; с общим кешем это работает и между потоками, и между
+процессами. Остальные получают устаревшее значение или, если его нет,
+ждут результата. Незадолго до истечения срока ключ может быть
+пересчитан заранее с вероятностью, растущей к концу срока (XFetch).
+"""
+import math
+import random
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+METRICS = ('computed', 'early', 'coalesced', 'waited')
+
+
+def _count(name):
+    key = f'stampede:{name}'
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, None)
+        try:
+            cache.incr(key)
+        except ValueError:
+            pass
+
+
+def stats():
+    """Счётчики пересчётов и склеенных запросов по всем процессам."""
+    values = cache.get_many([f'stampede:{name}' for name in METRICS])
+    return {name: values.get(f'stampede:{name}', 0) for name in METRICS}
+
+
+def reset_stats():
+    cache.delete_many([f'stampede:{name}' for name in METRICS])
+
+
+def _fresh(entry, beta):
+    value, expires_at, delta = entry
+    gap = -delta * beta * math.log(1 - random.random())
+    return time.time() + gap < expires_at
+
+
+def _compute_and_store(key, compute, timeout, stale_timeout):
+    start = time.time()
+    value = compute()
+    delta = time.time() - start
+    cache.set(
+        key, (value, time.time() + timeout, delta), timeout + stale_timeout
+    )
+    return value
+
+
+def get_or_compute(key, compute, timeout, stale_timeout=None, beta=None):
+    """Возвращает значение ключа, пересчитывая его не более чем в одном месте.
+
+    compute вызывается без аргументов. Если compute бросает исключение,
+    блокировка снимается и исключение пробрасывается дальше.
+    """
+    if stale_timeout is None:
+        stale_timeout = settings.STAMPEDE_STALE_TIMEOUT
+    if beta is None:
+        beta = settings.STAMPEDE_BETA
+    entry = cache.get(key)
+    if entry is not None and _fresh(entry, beta):
+        return entry[0]
+    lock_key = f'{key}:lock'
+    token = uuid.uuid4().hex
+    if cache.add(lock_key, token, settings.STAMPEDE_LOCK_TIMEOUT):
+        try:
+            value = _compute_and_store(key, compute, timeout, stale_timeout)
+        finally:
+            if cache.get(lock_key) == token:
+                cache.delete(lock_key)
+        _count('computed')
+        if entry is not None and entry[1] > time.time():
+            _count('early')
+        return value
+    if entry is not None:
+        _count('coalesced')
+        return entry[0]
+    entry = _wait_for(key, lock_key)
+    if entry is not None:
+        _count('waited')
+        return entry[0]
+    _count('computed')
+    return _compute_and_store(key, compute, timeout, stale_timeout)
+
+
+def _wait_for(key, lock_key):
+    """Ждёт, пока ключ посчитает держатель блокировки."""
+    deadline = time.time() + settings.STAMPEDE_LOCK_TIMEOUT
+    while time.time() < deadline:
+        time.sleep(settings.STAMPEDE_WAIT_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None or cache.get(lock_key) is None:
+            return entry
+    return None
@@ -0,0 +1,34 @@
+"""Версии закешированных данных, общие для всех процессов.
+
+Версия — случайная строка, а не счётчик: кеш общий для процессов
+и переживает перезапуски, поэтому номера версий не должны повторяться.
+"""
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+def _key(name):
+    return f'versions:{name}'
+
+
+def get_version(name):
+    version = cache.get(_key(name))
+    if version is None:
+        cache.add(_key(name), uuid.uuid4().hex, None)
+        version = cache.get(_key(name))
+    return version or uuid.uuid4().hex
+
+
+def bump_version(name):
+    """Меняет версию сразу и ещё раз после коммита транзакции.
+
+    Второй сдвиг нужен, чтобы процесс, успевший перечитать данные
+    до коммита, не закешировал их под новой версией.
+    """
+    def bump():
+        cache.set(_key(name), uuid.uuid4().hex, None)
+
+    bump()
+    transaction.on_commit(bump)
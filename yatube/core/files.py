@@ -0,0 +1,68 @@
+import mimetypes
+import os
+import re
+
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import (
+    get_conditional_response, patch_cache_control, patch_vary_headers
+)
+from django.utils.http import http_date, quote_etag
+
+re_accepts_gzip = re.compile(r'\bgzip\b')
+
+
+def accepts_gzip(request):
+    return bool(re_accepts_gzip.search(
+        request.META.get('HTTP_ACCEPT_ENCODING', '')
+    ))
+
+
+def serve_file(request, root, path, max_age, immutable=False):
+    """Отдаёт файл из root без чтения в память Python.
+
+    Если рядом лежит сжатый вариант ``<имя>.gz`` и клиент
+    принимает gzip, отдаётся он. Файл передаётся через FileResponse,
+    поэтому WSGI-сервер может использовать wsgi.file_wrapper (sendfile).
+    Возвращает None, если файла нет.
+    """
+    try:
+        fullpath = safe_join(root, path)
+    except SuspiciousFileOperation:
+        return None
+    if not os.path.isfile(fullpath):
+        return None
+    content_type, encoding = mimetypes.guess_type(fullpath)
+    content_type = content_type or 'application/octet-stream'
+    has_gzip = encoding is None and os.path.isfile(fullpath + '.gz')
+    use_gzip = has_gzip and accepts_gzip(request)
+    served_path = fullpath + '.gz' if use_gzip else fullpath
+    stat = os.stat(served_path)
+    etag = quote_etag('{:x}-{:x}{}'.format(
+        int(stat.st_mtime), stat.st_size, '-gz' if use_gzip else ''
+    ))
+    # If-None-Match со списком и слабыми метками разбирает Django.
+    response = get_conditional_response(
+        request, etag=etag, last_modified=int(stat.st_mtime)
+    )
+    if response is None:
+        if request.method == 'HEAD':
+            response = HttpResponse(content_type=content_type)
+            response['Content-Length'] = stat.st_size
+        else:
+            response = FileResponse(
+                open(served_path, 'rb'), content_type=content_type
+            )
+            response['Content-Type'] = content_type
+        if use_gzip:
+            response['Content-Encoding'] = 'gzip'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    if has_gzip:
+        patch_vary_headers(response, ('Accept-Encoding',))
+    directives = {'public': True, 'max_age': max_age}
+    if immutable:
+        directives['immutable'] = True
+    patch_cache_control(response, **directives)
+    return response
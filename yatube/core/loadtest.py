@@ -0,0 +1,176 @@
+"""Нагрузочный генератор с открытой моделью поступления запросов.
+
+Запросы приходят пуассоновским потоком с заданной частотой и не ждут
+ответов на предыдущие, поэтому медленный сервер не снижает нагрузку
+(в отличие от замкнутого цикла «запрос — ответ — запрос»). Задержка
+считается от запланированного момента отправки, а не от фактического.
+"""
+import asyncio
+import json
+import math
+import random
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+PERCENTILES = (50, 95, 99)
+
+
+def parse_mix(text):
+    """'index=50,profile=10' -> {'index': 50.0, 'profile': 10.0}."""
+    mix = {}
+    for item in filter(None, text.split(',')):
+        name, _, weight = item.partition('=')
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def percentile(values, percent):
+    """Перцентиль методом ближайшего ранга по отсортированному списку."""
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(percent / 100 * len(values)))
+    return values[rank - 1]
+
+
+async def fetch(host, port, method, path, headers, body=b''):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        lines = [f'{method} {path} HTTP/1.1', f'Host: {host}:{port}']
+        lines += [f'{name}: {value}' for name, value in headers.items()]
+        lines += [f'Content-Length: {len(body)}', 'Connection: close']
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode() + body)
+        await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()
+        return int(status_line.split()[1])
+    finally:
+        writer.close()
+
+
+async def _run(url, choose, rate, duration, max_inflight):
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    results = []
+    inflight = set()
+    dropped = 0
+
+    async def one(name, request, scheduled):
+        method, path, headers, body = request
+        try:
+            status = await fetch(host, port, method, path, headers, body)
+        except (OSError, ValueError, IndexError) as error:
+            status = type(error).__name__
+        results.append((name, time.perf_counter() - scheduled, status))
+
+    start = time.perf_counter()
+    scheduled = start
+    while True:
+        scheduled += random.expovariate(rate)
+        if scheduled - start >= duration:
+            break
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if len(inflight) >= max_inflight:
+            dropped += 1
+            continue
+        name, request = choose()
+        task = asyncio.ensure_future(one(name, request, scheduled))
+        inflight.add(task)
+        task.add_done_callback(inflight.discard)
+    if inflight:
+        await asyncio.wait(inflight)
+    return results, dropped, time.perf_counter() - start
+
+
+def run(url, choose, rate, duration, max_inflight=1000):
+    """Гоняет нагрузку и возвращает (результаты, отброшено, длительность).
+
+    choose() возвращает имя сценария и запрос
+    (метод, путь, заголовки, тело).
+    """
+    return asyncio.run(_run(url, choose, rate, duration, max_inflight))
+
+
+def _stats(latencies, errors, elapsed):
+    latencies = sorted(latencies)
+    stats = {
+        'requests': len(latencies) + errors,
+        'errors': errors,
+        'rps': len(latencies) / elapsed if elapsed else 0.0,
+    }
+    for percent in PERCENTILES:
+        stats[f'p{percent}_ms'] = percentile(latencies, percent) * 1000
+    return stats
+
+
+def summarize(results, dropped, elapsed, config=None):
+    """Сводка по каждому сценарию и по всем запросам вместе."""
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    for name, latency, status in results:
+        if isinstance(status, int) and status < 400:
+            latencies[name].append(latency)
+            latencies['total'].append(latency)
+        else:
+            errors[name] += 1
+            errors['total'] += 1
+    names = sorted((set(latencies) | set(errors)) - {'total'}) + ['total']
+    return {
+        'config': config or {},
+        'elapsed': elapsed,
+        'dropped': dropped,
+        'endpoints': {
+            name: _stats(latencies[name], errors[name], elapsed)
+            for name in names
+        },
+    }
+
+
+def format_report(summary):
+    lines = [
+        f"Длительность {summary['elapsed']:.1f} с, "
+        f"отброшено {summary['dropped']}"
+    ]
+    for name, stats in summary['endpoints'].items():
+        lines.append(
+            f'  {name:<12} запросов={stats["requests"]:<6} '
+            f'ошибок={stats["errors"]:<4} rps={stats["rps"]:<8.1f} '
+            + ' '.join(
+                f'p{percent}={stats[f"p{percent}_ms"]:.1f}мс'
+                for percent in PERCENTILES
+            )
+        )
+    return '\n'.join(lines)
+
+
+def format_diff(old, new):
+    """Изменения метрик new относительно old по сценариям."""
+    lines = []
+    for name, stats in new['endpoints'].items():
+        before = old['endpoints'].get(name)
+        if before is None:
+            continue
+        changes = []
+        for key in ['rps'] + [f'p{percent}_ms' for percent in PERCENTILES]:
+            delta = (
+                (stats[key] - before[key]) / before[key] * 100
+                if before[key] else 0.0
+            )
+            changes.append(
+                f'{key}: {before[key]:.1f} -> {stats[key]:.1f} '
+                f'({delta:+.0f}%)'
+            )
+        lines.append(f'  {name:<12} ' + ', '.join(changes))
+    return '\n'.join(lines)
+
+
+def save(summary, path):
+    with open(path, 'w') as file:
+        json.dump(summary, file, ensure_ascii=False, indent=2)
+
+
+def load(path):
+    with open(path) as file:
+        return json.load(file)
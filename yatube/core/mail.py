@@ -0,0 +1,143 @@
+import logging
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutgoingEmail
+from .tasks import add_job
+
+logger = logging.getLogger(__name__)
+
+# Чьё это письмо, если на один адрес заведено несколько аккаунтов:
+# значение входит в ключ склейки, и письма разным аккаунтам не
+# заменяют друг друга.
+ACCOUNT_HEADER = 'X-Outbox-Account'
+
+
+class OutboxBackend(BaseEmailBackend):
+    """Почтовый бэкенд, который только складывает письма в очередь.
+
+    Письмо хранится целиком, как его сериализует Django: с копиями,
+    Reply-To, заголовками и вложениями. Повторное письмо тому же
+    адресату с той же темой (и тем же ACCOUNT_HEADER) заменяет
+    ещё не отправленное, а не добавляется рядом с ним.
+    """
+
+    def send_messages(self, email_messages):
+        count = 0
+        for message in email_messages:
+            data = message.message().as_bytes()
+            account = message.extra_headers.get(ACCOUNT_HEADER, '')
+            for recipient in message.recipients():
+                store(
+                    recipient,
+                    message.subject,
+                    message.body,
+                    data,
+                    from_email=message.from_email,
+                    account=account,
+                )
+            count += 1
+        if count:
+            add_job('core.send_outbox', key='send_outbox')
+        return count
+
+
+def store(to, subject, body, message, from_email=None, account=''):
+    fields = {
+        'from_email': from_email or settings.DEFAULT_FROM_EMAIL,
+        'body': body,
+        'message': message,
+        'attempts': 0,
+        'last_error': '',
+    }
+    coalesce_key = f'{to.lower()}:{account}:{subject}'
+    with transaction.atomic():
+        updated = OutgoingEmail.objects.filter(
+            coalesce_key=coalesce_key, status=OutgoingEmail.PENDING
+        ).update(**fields)
+        if not updated:
+            OutgoingEmail.objects.create(
+                to=to, subject=subject, coalesce_key=coalesce_key, **fields
+            )
+
+
+class _SerializedMessage:
+    """Готовое письмо в том виде, в каком его ждут почтовые бэкенды."""
+
+    def __init__(self, data):
+        self.data = data
+
+    def get_charset(self):
+        return None
+
+    def as_bytes(self, unixfrom=False, linesep='\n'):
+        return self.data.replace(b'\n', linesep.encode())
+
+
+class StoredEmail(EmailMessage):
+    """Письмо из очереди: конверт — один получатель строки."""
+
+    def __init__(self, row):
+        super().__init__(row.subject, row.body, row.from_email, [row.to])
+        self.data = bytes(row.message)
+
+    def message(self):
+        return _SerializedMessage(self.data)
+
+
+def deliver(batch_size=None):
+    """Отправляет ожидающие письма пачками через одно соединение.
+
+    Каждое письмо пробуется один раз за вызов; неотправленные
+    остаются в очереди до следующего запуска.
+    """
+    batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+    sent = failed = 0
+    last_pk = 0
+    connection = get_connection(settings.OUTBOX_DELIVERY_BACKEND)
+    with connection:
+        while True:
+            batch = list(OutgoingEmail.objects.filter(
+                status=OutgoingEmail.PENDING, pk__gt=last_pk
+            ).order_by('pk')[:batch_size])
+            if not batch:
+                break
+            for row in batch:
+                try:
+                    connection.send_messages([StoredEmail(row)])
+                except Exception as error:
+                    row.attempts += 1
+                    row.last_error = repr(error)
+                    if row.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                        row.status = OutgoingEmail.FAILED
+                    else:
+                        failed += 1
+                    logger.warning(
+                        'Письмо %s не отправлено: %r', row.pk, error
+                    )
+                else:
+                    row.status = OutgoingEmail.SENT
+                    row.sent_at = timezone.now()
+                    sent += 1
+                # Пока письмо уходило, store() мог заменить его новым:
+                # тогда строка остаётся в очереди с новым текстом.
+                OutgoingEmail.objects.filter(
+                    pk=row.pk, message=row.message
+                ).update(
+                    status=row.status,
+                    attempts=row.attempts,
+                    last_error=row.last_error,
+                    sent_at=row.sent_at,
+                )
+            last_pk = batch[-1].pk
+    if failed:
+        add_job(
+            'core.send_outbox',
+            key='send_outbox',
+            delay=settings.TASKS_RETRY_DELAY,
+        )
+    return sent
@@ -0,0 +1,106 @@
+import re
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+
+from core import loadtest
+
+
+class Command(BaseCommand):
+    help = 'Нагружает сайт открытым потоком запросов и считает перцентили'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--url', help='Адрес запущенного сервера; иначе поднимается serve',
+        )
+        parser.add_argument('--workers', type=int, default=2)
+        parser.add_argument(
+            '--rate', type=float, default=settings.LOADTEST_RATE,
+            help='Запросов в секунду',
+        )
+        parser.add_argument(
+            '--duration', type=float, default=settings.LOADTEST_DURATION,
+            help='Длительность, сек.',
+        )
+        parser.add_argument(
+            '--mix', default=settings.LOADTEST_MIX,
+            help='Веса сценариев: index=50,profile=10,...',
+        )
+        parser.add_argument('--max-inflight', type=int, default=1000)
+        parser.add_argument('--save', help='Сохранить сводку в JSON')
+        parser.add_argument(
+            '--diff', help='Сравнить со сводкой из этого JSON',
+        )
+        parser.add_argument(
+            '--report', help='Не нагружать, а взять сводку из этого JSON',
+        )
+        parser.add_argument(
+            '--keep-posts', action='store_true',
+            help='Не удалять посты, созданные нагрузкой',
+        )
+
+    def handle(self, *args, **options):
+        if options['report']:
+            summary = loadtest.load(options['report'])
+        else:
+            summary = self.run_load(options)
+        self.stdout.write(loadtest.format_report(summary))
+        if options['save']:
+            loadtest.save(summary, options['save'])
+        if options['diff']:
+            self.stdout.write(f'Относительно {options["diff"]}:')
+            self.stdout.write(loadtest.format_diff(
+                loadtest.load(options['diff']), summary
+            ))
+
+    def run_load(self, options):
+        scenario = import_string(settings.LOADTEST_SCENARIO)(
+            loadtest.parse_mix(options['mix'])
+        )
+        if scenario.skipped:
+            self.stderr.write(
+                'Нет данных для: ' + ', '.join(scenario.skipped)
+            )
+        if not scenario.names:
+            raise CommandError('Нечего нагружать')
+        server = None
+        url = options['url']
+        if url is None:
+            server, url = self.start_server(options['workers'])
+        try:
+            results, dropped, elapsed = loadtest.run(
+                url, scenario.choose, options['rate'], options['duration'],
+                options['max_inflight'],
+            )
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+                server.stdout.close()
+            if not options['keep_posts']:
+                scenario.cleanup()
+        config = {
+            key: options[key] for key in ('rate', 'duration', 'workers')
+        }
+        config['mix'] = scenario.mix
+        return loadtest.summarize(results, dropped, elapsed, config)
+
+    def start_server(self, workers):
+        server = subprocess.Popen(
+            [
+                sys.executable, 'manage.py', 'serve', '--port', '0',
+                '--workers', str(workers), '--quiet',
+                '--max-requests', '0',
+            ],
+            cwd=settings.BASE_DIR,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        found = re.search(r'http://\S+/', server.stdout.readline())
+        if found is None:
+            server.kill()
+            raise CommandError('Сервер не запустился')
+        return server, found.group()
@@ -0,0 +1,73 @@
+import logging
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from core import tasks
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Запускает пул воркеров фоновых задач'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=settings.TASKS_WORKERS,
+            help='Количество потоков-воркеров',
+        )
+        parser.add_argument(
+            '--poll', type=float, default=settings.TASKS_POLL_INTERVAL,
+            help='Пауза между опросами пустой очереди, сек.',
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Выполнить готовые задачи и выйти',
+        )
+
+    def handle(self, *args, **options):
+        tasks.discover()
+        tasks.requeue_stale()
+        if options['once']:
+            done = tasks.run_pending()
+            self.stdout.write(f'Выполнено задач: {done}')
+            return
+        stop = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: stop.set())
+        self.stdout.write(f'Запущено воркеров: {options["workers"]}')
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            for _ in range(options['workers']):
+                pool.submit(self.work, stop, options['poll'])
+            while not stop.wait(settings.TASKS_LOCK_TIMEOUT):
+                self.requeue_stale()
+        self.stdout.write('Воркеры остановлены')
+
+    def requeue_stale(self):
+        try:
+            close_old_connections()
+            tasks.requeue_stale()
+        except Exception:
+            logger.exception('Не удалось вернуть зависшие задачи в очередь')
+
+    def work(self, stop, poll):
+        """Цикл воркера; выходит только по сигналу остановки."""
+        try:
+            while not stop.is_set():
+                try:
+                    close_old_connections()
+                    job = tasks.claim()
+                    if job is None:
+                        stop.wait(poll)
+                        continue
+                    tasks.run(job)
+                except Exception:
+                    # Например, database is locked: ждём и пробуем снова.
+                    logger.exception('Ошибка воркера фоновых задач')
+                    stop.wait(poll)
+        finally:
+            connection.close()
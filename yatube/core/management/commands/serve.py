@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.servers.basehttp import get_internal_wsgi_application
+
+from core.server import Arbiter
+from core.warmup import warmup
+
+
+class Command(BaseCommand):
+    help = 'Запускает префоркинг-сервер WSGI с несколькими воркерами'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8000)
+        parser.add_argument(
+            '--workers', type=int, default=settings.SERVE_WORKERS,
+            help='Количество процессов-воркеров',
+        )
+        parser.add_argument(
+            '--max-requests', type=int, default=settings.SERVE_MAX_REQUESTS,
+            help='Перезапускать воркер после стольких запросов, 0 — никогда',
+        )
+        parser.add_argument(
+            '--max-rss-mb', type=int, default=settings.SERVE_MAX_RSS_MB,
+            help='Перезапускать воркер при таком пиковом RSS, 0 — никогда',
+        )
+        parser.add_argument(
+            '--backlog', type=int, default=settings.SERVE_BACKLOG,
+        )
+        parser.add_argument(
+            '--quiet', action='store_true',
+            help='Не писать журнал запросов',
+        )
+
+    def handle(self, *args, **options):
+        application = get_internal_wsgi_application()
+        if not settings.WARMUP_ON_START:
+            warmup()
+        arbiter = Arbiter(
+            application,
+            (options['host'], options['port']),
+            options['workers'],
+            max_requests=options['max_requests'],
+            max_rss_mb=options['max_rss_mb'],
+            backlog=options['backlog'],
+            quiet=options['quiet'],
+            stdout=self.stdout,
+        )
+        arbiter.run()
+        self.stdout.write('Сервер остановлен')
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from core.cache.stampede import reset_stats, stats
+
+
+class Command(BaseCommand):
+    help = 'Показывает, сколько пересчётов горячих ключей было склеено'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true')
+
+    def handle(self, *args, **options):
+        for name, value in stats().items():
+            self.stdout.write(f'{name}: {value}')
+        if options['reset']:
+            reset_stats()
@@ -0,0 +1,23 @@
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = 'Удаляет истёкшие сессии небольшими пачками'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        deleted = 0
+        while True:
+            keys = list(Session.objects.filter(
+                expire_date__lt=now
+            ).values_list('pk', flat=True)[:options['batch_size']])
+            if not keys:
+                break
+            Session.objects.filter(pk__in=keys).delete()
+            deleted += len(keys)
+        self.stdout.write(f'Удалено сессий: {deleted}')
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.warmup import warmup
+
+
+class Command(BaseCommand):
+    help = 'Компилирует шаблоны, заполняет URL-резолвер и кеши приложений'
+
+    def handle(self, *args, **options):
+        for name, (result, elapsed) in warmup().items():
+            self.stdout.write(f'{name}: {result} ({elapsed:.1f} мс)')
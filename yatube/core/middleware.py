@@ -0,0 +1,76 @@
+import math
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.http import HttpResponse
+
+from . import ratelimit
+from .files import serve_file
+
+
+class StaticFilesMiddleware:
+    """Отдаёт собранную статику прямо из WSGI-приложения.
+
+    Файлы с хешем в имени кешируются навсегда, остальные —
+    на STATIC_MAX_AGE секунд.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefix = settings.STATIC_URL
+        self.root = settings.STATIC_ROOT
+        self.hashed = set(
+            getattr(staticfiles_storage, 'hashed_files', {}).values()
+        )
+
+    def __call__(self, request):
+        path = request.path_info
+        if (
+            self.root
+            and path.startswith(self.prefix)
+            and request.method in ('GET', 'HEAD')
+        ):
+            name = path[len(self.prefix):]
+            immutable = name in self.hashed
+            response = serve_file(
+                request,
+                self.root,
+                name,
+                settings.STATIC_IMMUTABLE_MAX_AGE if immutable
+                else settings.STATIC_MAX_AGE,
+                immutable=immutable,
+            )
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+
+class RateLimitMiddleware:
+    """Отвечает 429 на запросы к маршрутам из RATELIMITS сверх лимита.
+
+    Лимит задаётся по имени маршрута: методы, жетонов в минуту и размер
+    ведра. Вёдра отдельные для IP и для вошедшего пользователя.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not settings.RATELIMIT_ENABLED:
+            return None
+        name, limit = ratelimit.limit_for(request)
+        if limit is None or request.method not in limit['methods']:
+            return None
+        wait = ratelimit.check(request, name, limit)
+        if not wait:
+            return None
+        response = HttpResponse(
+            'Слишком много запросов, попробуйте позже.',
+            status=429,
+            content_type='text/plain; charset=utf-8',
+        )
+        response['Retry-After'] = str(math.ceil(wait))
+        return response
@@ -0,0 +1,35 @@
+from django.core.mail import EmailMultiAlternatives
+from django.db import migrations, models
+
+
+def serialize_pending(apps, schema_editor):
+    OutgoingEmail = apps.get_model('core', 'OutgoingEmail')
+    for row in OutgoingEmail.objects.filter(status='pending'):
+        message = EmailMultiAlternatives(
+            row.subject, row.body, row.from_email, [row.to]
+        )
+        if row.html_body:
+            message.attach_alternative(row.html_body, 'text/html')
+        row.message = message.message().as_bytes()
+        row.save(update_fields=('message',))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_outgoingemail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outgoingemail',
+            name='message',
+            field=models.BinaryField(default=b'', verbose_name='Письмо целиком'),
+            preserve_default=False,
+        ),
+        migrations.RunPython(serialize_pending, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='outgoingemail',
+            name='html_body',
+        ),
+    ]
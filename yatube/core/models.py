@@ -0,0 +1,116 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (QUEUED, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Выполнена'),
+        (FAILED, 'Ошибка'),
+    )
+
+    name = models.CharField(max_length=200, verbose_name="Задача")
+    payload = models.TextField(default='{}', verbose_name="Аргументы")
+    key = models.CharField(
+        max_length=200,
+        blank=True,
+        null=True,
+        db_index=True,
+        verbose_name="Ключ идемпотентности"
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=QUEUED,
+        verbose_name="Статус"
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name="Попыток"
+    )
+    max_attempts = models.PositiveSmallIntegerField(
+        default=5,
+        verbose_name="Максимум попыток"
+    )
+    run_after = models.DateTimeField(
+        default=timezone.now,
+        verbose_name="Запустить после"
+    )
+    locked_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name="Взята в работу"
+    )
+    last_error = models.TextField(blank=True, verbose_name="Последняя ошибка")
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Дата создания"
+    )
+
+    class Meta:
+        verbose_name = "Фоновая задача"
+        verbose_name_plural = "Фоновые задачи"
+        ordering = ('run_after', 'pk')
+        indexes = (
+            models.Index(fields=('status', 'run_after')),
+        )
+
+    def __str__(self):
+        return f'{self.name} [{self.status}]'
+
+
+class OutgoingEmail(models.Model):
+    PENDING = 'pending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'Ожидает отправки'),
+        (SENT, 'Отправлено'),
+        (FAILED, 'Ошибка'),
+    )
+
+    to = models.CharField(max_length=254, verbose_name="Получатель")
+    from_email = models.CharField(max_length=254, verbose_name="Отправитель")
+    subject = models.CharField(max_length=255, verbose_name="Тема")
+    body = models.TextField(verbose_name="Текст")
+    message = models.BinaryField(verbose_name="Письмо целиком")
+    coalesce_key = models.CharField(
+        max_length=255,
+        verbose_name="Ключ склейки"
+    )
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+        verbose_name="Статус"
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name="Попыток"
+    )
+    last_error = models.TextField(blank=True, verbose_name="Последняя ошибка")
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name="Дата создания"
+    )
+    sent_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name="Дата отправки"
+    )
+
+    class Meta:
+        verbose_name = "Письмо"
+        verbose_name_plural = "Исходящие письма"
+        ordering = ('pk',)
+        indexes = (
+            models.Index(fields=('status', 'coalesce_key')),
+        )
+
+    def __str__(self):
+        return f'{self.to}: {self.subject}'
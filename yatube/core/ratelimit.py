@@ -0,0 +1,80 @@
+"""Ограничение частоты запросов по алгоритму «ведро с жетонами».
+
+У каждой пары (маршрут, IP) и (маршрут, пользователь) своё ведро
+на burst жетонов, которое пополняется со скоростью per_minute в минуту.
+Запрос забирает жетон; если жетона нет, он отклоняется, и клиенту
+сообщается, через сколько секунд жетон появится. Вёдра хранятся в кеше:
+с MmapCache они общие для всех процессов и обновляются атомарно,
+с другими бэкендами атомарность есть только внутри процесса.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import NoReverseMatch, get_urlconf, reverse
+
+_lock = threading.Lock()
+_paths = {}
+
+
+def _update(key, func, timeout):
+    update = getattr(cache, 'update', None)
+    if update is not None:
+        return update(key, func, timeout)
+    with _lock:
+        value, result = func(cache.get(key))
+        cache.set(key, value, timeout)
+        return result
+
+
+def take(key, per_minute, burst):
+    """Забирает жетон; возвращает 0 или сколько секунд ждать."""
+    rate = per_minute / 60
+    now = time.time()
+
+    def refill(state):
+        tokens, updated = state or (burst, now)
+        tokens = min(burst, tokens + (now - updated) * rate)
+        if tokens >= 1:
+            return (tokens - 1, now), 0.0
+        return (tokens, now), (1 - tokens) / rate
+
+    # Полное ведро ничем не отличается от отсутствующего.
+    return _update(f'ratelimit:{key}', refill, burst / rate + 1)
+
+
+def _limited_paths(limits):
+    key = (get_urlconf() or settings.ROOT_URLCONF, tuple(limits))
+    paths = _paths.get(key)
+    if paths is None:
+        paths = {}
+        for name in limits:
+            try:
+                paths[reverse(name)] = name
+            except NoReverseMatch:
+                pass
+        _paths[key] = paths
+    return paths
+
+
+def limit_for(request):
+    """Имя и лимит маршрута запроса; (None, None), если лимита нет."""
+    limits = settings.RATELIMITS
+    name = request.resolver_match.view_name
+    if name not in limits:
+        # Один адрес может разрешиться в маршрут с другим именем:
+        # auth/login/ есть и в django.contrib.auth.urls, и в users.
+        name = _limited_paths(limits).get(request.path_info)
+    return name, limits.get(name)
+
+
+def check(request, name, limit):
+    """Проверяет вёдра пользователя и IP; возвращает 0 или ожидание."""
+    keys = [f'{name}:ip:{request.META.get("REMOTE_ADDR", "")}']
+    if request.user.is_authenticated:
+        keys.append(f'{name}:user:{request.user.pk}')
+    wait = 0.0
+    for key in keys:
+        wait = max(wait, take(key, limit['per_minute'], limit['burst']))
+    return wait
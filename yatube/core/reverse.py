@@ -0,0 +1,62 @@
+"""Быстрое построение URL по заранее разобранным шаблонам.
+
+Для каждого имени маршрута reverse вызывается один раз с числовыми
+метками вместо аргументов; дальше адрес собирается подстановкой
+экранированных значений в готовые куски строки. Метки из цифр
+подходят под конвертеры int, slug и str.
+"""
+import threading
+from urllib.parse import quote
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.urls import get_script_prefix, get_urlconf, reverse
+
+MARKER = '7319{}4628'
+# Как в django.urls: RFC3986_SUBDELIMS + '/~:@'.
+SAFE = "!$&'()*+,;=/~:@"
+
+_templates = {}
+_lock = threading.Lock()
+
+
+def _compile(viewname, arity):
+    """Куски адреса между аргументами, по порядку аргументов."""
+    markers = [MARKER.format(number) for number in range(arity)]
+    url = reverse(viewname, args=markers)
+    parts = []
+    for marker in markers:
+        before, found, url = url.partition(marker)
+        if not found:
+            raise ValueError(
+                f'Маршрут {viewname} не подходит для шаблона URL'
+            )
+        parts.append(before)
+    parts.append(url)
+    return tuple(parts)
+
+
+def reverse_cached(viewname, args=()):
+    """То же, что reverse(viewname, args=args), без разбора маршрутов.
+
+    Аргументы не проверяются по шаблону маршрута: функция
+    рассчитана на значения из базы, а не на ввод пользователя.
+    """
+    key = (viewname, len(args), get_urlconf(), get_script_prefix())
+    parts = _templates.get(key)
+    if parts is None:
+        with _lock:
+            parts = _templates[key] = _compile(viewname, len(args))
+    if len(parts) == 1:
+        return parts[0]
+    pieces = [parts[0]]
+    for value, part in zip(args, parts[1:]):
+        pieces.append(quote(str(value), safe=SAFE))
+        pieces.append(part)
+    return ''.join(pieces)
+
+
+@receiver(setting_changed)
+def clear_templates(setting, **kwargs):
+    if setting == 'ROOT_URLCONF':
+        _templates.clear()
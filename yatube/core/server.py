@@ -0,0 +1,294 @@
+"""Префоркинг-сервер WSGI на стандартной библиотеке.
+
+Главный процесс один раз загружает и прогревает приложение, замораживает
+кучу через gc.freeze(), чтобы сборщик мусора не трогал унаследованные
+страницы памяти, и форкает воркеров, которые принимают соединения
+с общего сокета. Воркер завершается после max_requests запросов или
+при превышении max_rss_mb, главный процесс сразу запускает замену.
+
+Сигналы главного процесса: SIGHUP — плавно перезапустить воркеров,
+SIGUSR1 — напечатать статистику, SIGINT/SIGTERM — остановиться.
+"""
+import gc
+import logging
+import mmap
+import os
+import random
+import resource
+import select
+import signal
+import socket
+import struct
+import sys
+import time
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer
+
+from django.db import close_old_connections, connections
+
+logger = logging.getLogger(__name__)
+
+# pid, обработано запросов, пиковый RSS в КБ, время запуска
+STATS = struct.Struct('<iIQd')
+
+
+def peak_rss_kb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+class RequestHandler(WSGIRequestHandler):
+    quiet = False
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+class WorkerServer(WSGIServer):
+    """WSGIServer поверх уже открытого сокета главного процесса."""
+
+    def __init__(self, listener, app):
+        super().__init__(
+            listener.getsockname(), RequestHandler, bind_and_activate=False
+        )
+        self.socket.close()
+        self.socket = listener
+        host, port = listener.getsockname()[:2]
+        self.server_name = socket.getfqdn(host)
+        self.server_port = port
+        self.setup_environ()
+        self.set_app(app)
+        self.handled = False
+
+    def finish_request(self, request, client_address):
+        super().finish_request(request, client_address)
+        self.handled = True
+
+    def get_request(self):
+        request, address = super().get_request()
+        request.setblocking(True)
+        return request, address
+
+    def server_close(self):
+        """Общий сокет закрывает только главный процесс."""
+
+
+class Worker:
+    def __init__(self, index, listener, app, stats, max_requests, max_rss_kb,
+                 timeout=1.0):
+        self.index = index
+        self.listener = listener
+        self.app = app
+        self.stats = stats
+        self.max_requests = max_requests
+        self.max_rss_kb = max_rss_kb
+        self.timeout = timeout
+        self.alive = True
+        self.requests = 0
+
+    def stop(self, *args):
+        self.alive = False
+
+    def report(self):
+        STATS.pack_into(
+            self.stats, self.index * STATS.size,
+            os.getpid(), self.requests, peak_rss_kb(), self.started,
+        )
+
+    def run(self):
+        for signum in (signal.SIGINT, signal.SIGHUP, signal.SIGUSR1):
+            signal.signal(signum, signal.SIG_IGN)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, self.stop)
+        self.started = time.time()
+        self.report()
+        server = WorkerServer(self.listener, self.app)
+        server.timeout = self.timeout
+        while self.alive:
+            server.handle_request()
+            if not server.handled:
+                continue
+            server.handled = False
+            self.requests += 1
+            close_old_connections()
+            if not self.alive or self.exhausted():
+                break
+            # Уходящий после SIGHUP воркер не затирает слот замены.
+            self.report()
+        connections.close_all()
+
+    def exhausted(self):
+        if self.max_requests and self.requests >= self.max_requests:
+            logger.info('Воркер %s: лимит запросов', os.getpid())
+            return True
+        if self.max_rss_kb and peak_rss_kb() >= self.max_rss_kb:
+            logger.info('Воркер %s: лимит памяти', os.getpid())
+            return True
+        return False
+
+
+class Arbiter:
+    def __init__(self, app, address, workers, max_requests=0, max_rss_mb=0,
+                 backlog=128, quiet=False, stdout=sys.stdout):
+        self.app = app
+        self.address = address
+        self.size = workers
+        self.max_requests = max_requests
+        self.max_rss_kb = max_rss_mb * 1024
+        self.backlog = backlog
+        self.stdout = stdout
+        RequestHandler.quiet = quiet
+        self.workers = {}
+        self.retiring = set()
+        self.signals = []
+        self.pid = os.getpid()
+
+    def bind(self):
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        listener.bind(self.address)
+        listener.listen(self.backlog)
+        # Неблокирующий accept: соединение забирает один воркер,
+        # остальные просто возвращаются в цикл.
+        listener.setblocking(False)
+        return listener
+
+    def run(self):
+        self.listener = self.bind()
+        self.stats = mmap.mmap(-1, STATS.size * self.size)
+        connections.close_all()
+        gc.collect()
+        gc.freeze()
+        wakeup_read, wakeup_write = os.pipe()
+        os.set_blocking(wakeup_write, False)
+        signal.set_wakeup_fd(wakeup_write)
+        for signum in (signal.SIGINT, signal.SIGTERM, signal.SIGHUP,
+                       signal.SIGUSR1, signal.SIGCHLD):
+            signal.signal(signum, self.on_signal)
+        host, port = self.listener.getsockname()[:2]
+        self.stdout.write(
+            f'Слушаю http://{host}:{port}/, воркеров: {self.size}\n'
+        )
+        try:
+            self.spawn_missing()
+            while self.handle_signals():
+                select.select([wakeup_read], [], [], 1.0)
+                try:
+                    os.read(wakeup_read, 1024)
+                except BlockingIOError:
+                    pass
+                self.reap()
+                self.spawn_missing()
+        finally:
+            if os.getpid() == self.pid:
+                self.print_stats()
+                self.stop()
+                self.listener.close()
+
+    def on_signal(self, signum, frame):
+        self.signals.append(signum)
+
+    def handle_signals(self):
+        while self.signals:
+            signum = self.signals.pop(0)
+            if signum in (signal.SIGINT, signal.SIGTERM):
+                return False
+            if signum == signal.SIGHUP:
+                self.reload()
+            elif signum == signal.SIGUSR1:
+                self.print_stats()
+        return True
+
+    def spawn_missing(self):
+        busy = set(self.workers.values())
+        for index in range(self.size):
+            if index not in busy:
+                self.spawn(index)
+
+    def spawn(self, index):
+        max_requests = self.max_requests
+        if max_requests:
+            # Разброс, чтобы воркеры не перезапускались одновременно.
+            max_requests += random.randint(0, max_requests // 10)
+        pid = os.fork()
+        if pid:
+            self.workers[pid] = index
+            return pid
+        signal.set_wakeup_fd(-1)
+        code = 0
+        try:
+            Worker(
+                index, self.listener, self.app, self.stats, max_requests,
+                self.max_rss_kb,
+            ).run()
+        except Exception:
+            logger.exception('Воркер %s упал', os.getpid())
+            code = 1
+        # SystemExit поднимается до интерпретатора, и atexit-обработчики
+        # воркера (например, сброс сессий) выполняются.
+        sys.exit(code)
+
+    def reap(self):
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if not pid:
+                return
+            self.workers.pop(pid, None)
+            self.retiring.discard(pid)
+
+    def reload(self):
+        """Плавно заменяет воркеров: новые стартуют до остановки старых."""
+        old = dict(self.workers)
+        self.workers = {}
+        self.spawn_missing()
+        for pid in old:
+            self.retiring.add(pid)
+            self.kill(pid, signal.SIGTERM)
+
+    def kill(self, pid, signum):
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            self.workers.pop(pid, None)
+            self.retiring.discard(pid)
+
+    def stop(self, timeout=10):
+        pids = set(self.workers) | self.retiring
+        for pid in pids:
+            self.kill(pid, signal.SIGTERM)
+        deadline = time.monotonic() + timeout
+        while (self.workers or self.retiring) and (
+            time.monotonic() < deadline
+        ):
+            self.reap()
+            time.sleep(0.05)
+        for pid in set(self.workers) | self.retiring:
+            self.kill(pid, signal.SIGKILL)
+        self.reap()
+
+    def worker_stats(self):
+        now = time.time()
+        result = []
+        for index in range(self.size):
+            pid, requests, rss_kb, started = STATS.unpack_from(
+                self.stats, index * STATS.size
+            )
+            if pid:
+                result.append({
+                    'worker': index,
+                    'pid': pid,
+                    'requests': requests,
+                    'rss_mb': rss_kb / 1024,
+                    'uptime': now - started,
+                })
+        return result
+
+    def print_stats(self):
+        for row in self.worker_stats():
+            self.stdout.write(
+                'воркер {worker}: pid={pid} запросов={requests} '
+                'rss={rss_mb:.1f}МБ uptime={uptime:.0f}с\n'.format(**row)
+            )
+        self.stdout.flush()
@@ -0,0 +1,109 @@
+"""Сессии в кеше с отложенной записью в базу.
+
+Чтение и запись сессии идут только в кеш SESSION_CACHE_ALIAS.
+Изменённые ключи копятся в памяти процесса и сохраняются в таблицу
+django_session одной транзакцией не чаще раза в
+SESSION_WRITE_BEHIND_INTERVAL секунд, а также при выходе процесса.
+База нужна только как резервная копия на случай потери кеша,
+поэтому кеш должен быть общим для всех воркеров и не вытеснять
+сессии раньше записи: иначе несохранённая сессия пропадёт и
+пользователь окажется разлогинен. Поэтому режим включается явно
+(SESSION_MODE = 'write_behind'). Если запись в базу не удалась,
+ключи остаются в очереди до следующей попытки.
+"""
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.sessions.backends.base import CreateError
+from django.contrib.sessions.backends.cached_db import (
+    SessionStore as CachedDBStore
+)
+from django.contrib.sessions.models import Session
+from django.core.cache import caches
+from django.db import DatabaseError, transaction
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'core.sessions.write_behind'
+
+_dirty = {}
+_lock = threading.Lock()
+_last_flush = time.monotonic()
+
+
+class SessionStore(CachedDBStore):
+    cache_key_prefix = KEY_PREFIX
+
+    def save(self, must_create=False):
+        if self.session_key is None:
+            return self.create()
+        if must_create and self.exists(self.session_key):
+            raise CreateError
+        data = self._get_session(no_load=must_create)
+        self._cache.set(self.cache_key, data, self.get_expiry_age())
+        with _lock:
+            _dirty[self.session_key] = self.get_expiry_date()
+        if (
+            time.monotonic() - _last_flush
+            >= settings.SESSION_WRITE_BEHIND_INTERVAL
+        ):
+            flush()
+
+    def delete(self, session_key=None):
+        key = session_key or self.session_key
+        with _lock:
+            _dirty.pop(key, None)
+        super().delete(session_key)
+
+
+def _restore(dirty):
+    with _lock:
+        for key, expire_date in dirty.items():
+            # Более свежий save() уже положил ключ с новым сроком.
+            _dirty.setdefault(key, expire_date)
+
+
+def flush():
+    """Сохраняет накопленные сессии в базу, возвращает их число."""
+    global _last_flush
+    with _lock:
+        dirty = dict(_dirty)
+        _dirty.clear()
+        _last_flush = time.monotonic()
+    if not dirty:
+        return 0
+    cache = caches[settings.SESSION_CACHE_ALIAS]
+    cached = cache.get_many([KEY_PREFIX + key for key in dirty])
+    encoder = SessionStore()
+    rows = {
+        key: Session(
+            session_key=key,
+            session_data=encoder.encode(cached[KEY_PREFIX + key]),
+            expire_date=expire_date,
+        )
+        for key, expire_date in dirty.items()
+        if KEY_PREFIX + key in cached
+    }
+    try:
+        with transaction.atomic():
+            existing = set(Session.objects.filter(
+                session_key__in=list(rows)
+            ).values_list('session_key', flat=True))
+            Session.objects.bulk_update(
+                [rows[key] for key in existing],
+                ['session_data', 'expire_date'],
+            )
+            Session.objects.bulk_create(
+                row for key, row in rows.items() if key not in existing
+            )
+    except DatabaseError:
+        logger.warning('Сессии не сохранены в базу', exc_info=True)
+        _restore(dirty)
+        return 0
+    return len(rows)
+
+
+atexit.register(flush)
@@ -0,0 +1,45 @@
+import gzip
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Хранилище статики с хешами в именах и сжатыми копиями.
+
+    После обычной обработки collectstatic рядом с каждым текстовым
+    файлом кладётся ``<имя>.gz``, если сжатие даёт выигрыш.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        names = set()
+        for name, hashed_name, processed in super().post_process(
+            paths, dry_run, **options
+        ):
+            if hashed_name and not isinstance(processed, Exception):
+                names.update((name, hashed_name))
+            yield name, hashed_name, processed
+        if dry_run:
+            return
+        for name in sorted(names):
+            if self.compress(name):
+                yield name + '.gz', name + '.gz', True
+
+    def compress(self, name):
+        extension = os.path.splitext(name)[1].lower()
+        if extension not in settings.STATIC_COMPRESS_EXTENSIONS:
+            return False
+        with self.open(name) as original:
+            content = original.read()
+        if len(content) < settings.STATIC_COMPRESS_MIN_SIZE:
+            return False
+        compressed = gzip.compress(content, compresslevel=9, mtime=0)
+        if len(compressed) >= len(content) * 0.95:
+            return False
+        gz_name = name + '.gz'
+        if self.exists(gz_name):
+            self.delete(gz_name)
+        self._save(gz_name, ContentFile(compressed))
+        return True
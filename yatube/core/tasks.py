@@ -0,0 +1,123 @@
+import json
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+
+def task(name):
+    """Регистрирует функцию как фоновую задачу под именем name."""
+    def decorator(func):
+        _registry[name] = func
+        func.task_name = name
+        return func
+    return decorator
+
+
+def discover():
+    autodiscover_modules('tasks')
+
+
+def add_job(name, args=(), kwargs=None, key=None, delay=0,
+            max_attempts=None):
+    """Сразу записывает задачу в очередь.
+
+    Если задача с тем же ключом ещё ждёт в очереди, новая не создаётся.
+    """
+    if key is not None:
+        job = Job.objects.filter(key=key, status=Job.QUEUED).first()
+        if job is not None:
+            return job
+    return Job.objects.create(
+        name=name,
+        payload=json.dumps({'args': list(args), 'kwargs': kwargs or {}}),
+        key=key,
+        max_attempts=max_attempts or settings.TASKS_MAX_ATTEMPTS,
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def enqueue(name, *args, key=None, delay=0, max_attempts=None, **kwargs):
+    """Ставит задачу в очередь после коммита текущей транзакции."""
+    transaction.on_commit(lambda: add_job(
+        name, args, kwargs, key=key, delay=delay, max_attempts=max_attempts
+    ))
+
+
+def requeue_stale():
+    """Возвращает в очередь задачи упавших воркеров."""
+    deadline = timezone.now() - timedelta(seconds=settings.TASKS_LOCK_TIMEOUT)
+    return Job.objects.filter(
+        status=Job.RUNNING, locked_at__lt=deadline
+    ).update(status=Job.QUEUED, locked_at=None)
+
+
+def claim():
+    """Забирает одну готовую к запуску задачу или возвращает None."""
+    now = timezone.now()
+    candidates = Job.objects.filter(
+        status=Job.QUEUED, run_after__lte=now
+    ).values_list('pk', flat=True)[:settings.TASKS_CLAIM_BATCH]
+    for pk in candidates:
+        claimed = Job.objects.filter(pk=pk, status=Job.QUEUED).update(
+            status=Job.RUNNING,
+            locked_at=now,
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def run(job):
+    func = _registry.get(job.name)
+    payload = json.loads(job.payload)
+    try:
+        if func is None:
+            raise LookupError(f'Неизвестная задача: {job.name}')
+        func(*payload['args'], **payload['kwargs'])
+    except Exception:
+        job.last_error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            job.status = Job.QUEUED
+            job.run_after = timezone.now() + timedelta(
+                seconds=settings.TASKS_RETRY_DELAY * 2 ** (job.attempts - 1)
+            )
+        else:
+            job.status = Job.FAILED
+            logger.error('Задача %s (%s) провалена', job.pk, job.name)
+    else:
+        job.status = Job.DONE
+    job.locked_at = None
+    job.save(update_fields=('status', 'run_after', 'locked_at', 'last_error'))
+    return job.status == Job.DONE
+
+
+def run_pending(limit=None):
+    """Выполняет готовые задачи в текущем потоке, пока очередь не опустеет."""
+    discover()
+    done = 0
+    while limit is None or done < limit:
+        job = claim()
+        if job is None:
+            break
+        run(job)
+        done += 1
+    return done
+
+
+@task('core.send_outbox')
+def send_outbox():
+    from .mail import deliver
+    deliver()
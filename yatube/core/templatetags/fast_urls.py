@@ -0,0 +1,11 @@
+from django import template
+
+from ..reverse import reverse_cached
+
+register = template.Library()
+
+
+@register.simple_tag
+def fast_url(viewname, *args):
+    """Замена {% url %} для маршрутов без пользовательского ввода."""
+    return reverse_cached(viewname, args)
@@ -0,0 +1,59 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.test import SimpleTestCase
+
+from .. import loadtest
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(404 if self.path == '/missing/' else 200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, *args):
+        pass
+
+
+class LoadtestTest(SimpleTestCase):
+    def test_parse_mix_and_percentile(self):
+        """Разбор весов и перцентили по ближайшему рангу"""
+        self.assertEqual(
+            loadtest.parse_mix('index=3,profile=1'),
+            {'index': 3.0, 'profile': 1.0},
+        )
+        values = list(range(1, 101))
+        self.assertEqual(loadtest.percentile(values, 50), 50)
+        self.assertEqual(loadtest.percentile(values, 99), 99)
+        self.assertEqual(loadtest.percentile([], 95), 0.0)
+
+    def test_run_against_server(self):
+        """Открытый поток запросов, ошибки считаются отдельно"""
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = 'http://127.0.0.1:%d/' % server.server_address[1]
+        requests = iter(['/', '/missing/'] * 1000)
+
+        def choose():
+            path = next(requests)
+            return path.strip('/') or 'index', ('GET', path, {}, b'')
+
+        results, dropped, elapsed = loadtest.run(url, choose, 200, 0.5)
+        summary = loadtest.summarize(results, dropped, elapsed)
+        endpoints = summary['endpoints']
+        self.assertGreater(endpoints['index']['requests'], 0)
+        self.assertEqual(endpoints['index']['errors'], 0)
+        self.assertEqual(
+            endpoints['missing']['errors'], endpoints['missing']['requests']
+        )
+        self.assertEqual(
+            endpoints['total']['requests'],
+            endpoints['index']['requests'] + endpoints['missing']['requests'],
+        )
+        diff = loadtest.format_diff(summary, summary)
+        self.assertIn('index', diff)
+        self.assertIn('(+0%)', diff)
@@ -0,0 +1,152 @@
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from ..mail import deliver
+from ..models import Job, OutgoingEmail
+from ..tasks import run_pending
+
+User = get_user_model()
+
+
+@override_settings(
+    EMAIL_BACKEND='core.mail.OutboxBackend',
+    OUTBOX_DELIVERY_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+)
+class OutboxTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='auth', email='auth@example.com', password='pass12345'
+        )
+
+    def test_send_mail_is_queued(self):
+        """Письмо не отправляется в запросе, а попадает в очередь."""
+        mail.send_mail('Тема', 'Текст', 'from@example.com', ['a@example.com'])
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutgoingEmail.objects.count(), 1)
+        self.assertTrue(Job.objects.filter(name='core.send_outbox').exists())
+
+    def test_password_reset_coalesced(self):
+        """Повторные запросы сброса пароля не плодят письма."""
+        for _ in range(3):
+            self.client.post(
+                reverse('users:password_reset'),
+                {'email': self.user.email},
+            )
+        self.assertEqual(OutgoingEmail.objects.count(), 1)
+        self.assertEqual(
+            Job.objects.filter(name='core.send_outbox').count(), 1
+        )
+        run_pending()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, [self.user.email])
+        self.assertEqual(
+            OutgoingEmail.objects.get().status, OutgoingEmail.SENT
+        )
+
+    def test_password_reset_per_account(self):
+        """Аккаунты с общим адресом получают каждый своё письмо."""
+        users = [
+            User.objects.create_user(
+                username=username, email='same@example.com',
+                password='pass12345'
+            )
+            for username in ('a', 'b')
+        ]
+        self.client.post(
+            reverse('users:password_reset'), {'email': 'same@example.com'}
+        )
+        self.assertEqual(OutgoingEmail.objects.count(), 2)
+        run_pending()
+        self.assertEqual(len(mail.outbox), 2)
+        for user in users:
+            uid = urlsafe_base64_encode(force_bytes(user.pk))
+            bodies = [message.body for message in mail.outbox]
+            self.assertEqual(
+                sum(f'/reset/{uid}/' in body for body in bodies), 1
+            )
+
+    def test_deliver_batches(self):
+        """Все ожидающие письма уходят, отправленные не повторяются."""
+        for number in range(5):
+            mail.send_mail(
+                f'Тема {number}', 'Текст', None, ['a@example.com']
+            )
+        self.assertEqual(deliver(batch_size=2), 5)
+        self.assertEqual(deliver(batch_size=2), 0)
+        self.assertEqual(len(mail.outbox), 5)
+
+    def test_whole_message_delivered(self):
+        """Копии, Reply-To, заголовки и вложения не теряются в очереди."""
+        message = mail.EmailMessage(
+            'Тема', 'Текст', 'from@example.com', ['a@example.com'],
+            cc=['c@example.com'], reply_to=['reply@example.com'],
+            headers={'X-Tag': 'test'},
+        )
+        message.attach('report.txt', 'Отчёт', 'text/plain')
+        message.send()
+        self.assertEqual(OutgoingEmail.objects.count(), 2)
+        self.assertEqual(deliver(), 2)
+        self.assertEqual(
+            sorted(sent.to[0] for sent in mail.outbox),
+            ['a@example.com', 'c@example.com'],
+        )
+        data = mail.outbox[0].message().as_bytes()
+        for part in (
+            b'Cc: c@example.com', b'Reply-To: reply@example.com',
+            b'X-Tag: test', b'filename="report.txt"',
+        ):
+            with self.subTest(part=part):
+                self.assertIn(part, data)
+
+    @override_settings(
+        OUTBOX_DELIVERY_BACKEND='core.tests.test_mail.ResendingBackend',
+    )
+    def test_message_replaced_during_delivery(self):
+        """Письмо, заменённое во время отправки, остаётся в очереди."""
+        mail.send_mail('Тема', 'Старый текст', None, ['a@example.com'])
+        self.assertEqual(deliver(), 1)
+        email = OutgoingEmail.objects.get()
+        self.assertEqual(email.status, OutgoingEmail.PENDING)
+        self.assertEqual(email.body, 'Новый текст')
+        with override_settings(
+            OUTBOX_DELIVERY_BACKEND='django.core.mail.backends.locmem.'
+                                    'EmailBackend',
+        ):
+            deliver()
+        self.assertEqual(mail.outbox[-1].body, 'Новый текст')
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutgoingEmail.SENT)
+
+    @override_settings(
+        OUTBOX_DELIVERY_BACKEND='core.tests.test_mail.BrokenBackend',
+        OUTBOX_MAX_ATTEMPTS=2,
+    )
+    def test_failed_delivery(self):
+        """Неотправленное письмо повторяется и помечается ошибкой."""
+        mail.send_mail('Тема', 'Текст', None, ['a@example.com'])
+        deliver()
+        email = OutgoingEmail.objects.get()
+        self.assertEqual(email.status, OutgoingEmail.PENDING)
+        self.assertEqual(email.attempts, 1)
+        deliver()
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutgoingEmail.FAILED)
+
+
+class BrokenBackend(mail.backends.base.BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise ConnectionError('SMTP недоступен')
+
+
+class ResendingBackend(EmailBackend):
+    """Пока письмо отправляется, приходит новое с той же темой."""
+
+    def send_messages(self, email_messages):
+        mail.send_mail('Тема', 'Новый текст', None, ['a@example.com'])
+        return super().send_messages(email_messages)
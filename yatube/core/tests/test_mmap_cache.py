@@ -0,0 +1,151 @@
+import os
+import tempfile
+import time
+
+from django.test import SimpleTestCase
+
+from ..cache.mmap import MmapCache
+
+
+def _child_set(cache):
+    cache.set('from-child', os.getpid())
+    for _ in range(100):
+        cache.incr('counter')
+
+
+def _append(value):
+    return (value or ()) + (os.getpid(),), None
+
+
+def _child_update(cache):
+    for _ in range(20):
+        cache.update('pids', _append)
+
+
+def _run_children(target, cache, count=4):
+    """Запускает target в count дочерних процессах; возвращает их pid.
+
+    Прямой fork, а не multiprocessing: процессы manage.py test --parallel
+    сами демоны, и multiprocessing не даёт им заводить потомков.
+    """
+    pids = []
+    for _ in range(count):
+        pid = os.fork()
+        if pid == 0:
+            status = 1
+            try:
+                target(cache)
+                status = 0
+            finally:
+                os._exit(status)
+        pids.append(pid)
+    for pid in pids:
+        os.waitpid(pid, 0)
+    return pids
+
+
+class MmapCacheTest(SimpleTestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.mmap')
+        os.close(handle)
+        self.addCleanup(os.remove, self.path)
+        self.cache = self.make_cache()
+
+    def make_cache(self, **options):
+        params = {'OPTIONS': {'SLOTS': 64, 'SLOT_SIZE': 512}}
+        params['OPTIONS'].update(options)
+        return MmapCache(self.path, params)
+
+    def test_basic_operations(self):
+        cache = self.cache
+        self.assertIsNone(cache.get('missing'))
+        self.assertEqual(cache.get('missing', 'default'), 'default')
+        cache.set('key', {'value': [1, 2, 3]})
+        self.assertEqual(cache.get('key'), {'value': [1, 2, 3]})
+        self.assertTrue(cache.has_key('key'))
+        self.assertFalse(cache.add('key', 'other'))
+        self.assertTrue(cache.add('new', 'value'))
+        cache.delete('key')
+        self.assertIsNone(cache.get('key'))
+        cache.clear()
+        self.assertIsNone(cache.get('new'))
+
+    def test_many(self):
+        cache = self.cache
+        self.assertEqual(cache.set_many({'a': 1, 'b': 2, 'c': 3}), [])
+        self.assertEqual(
+            cache.get_many(['a', 'b', 'missing']), {'a': 1, 'b': 2}
+        )
+        cache.delete_many(['a', 'b'])
+        self.assertEqual(cache.get_many(['a', 'b', 'c']), {'c': 3})
+
+    def test_expiration(self):
+        cache = self.cache
+        cache.set('short', 1, 0.05)
+        cache.set('forever', 1, None)
+        cache.set('zero', 1, 0)
+        self.assertIsNone(cache.get('zero'))
+        time.sleep(0.1)
+        self.assertIsNone(cache.get('short'))
+        self.assertTrue(cache.add('short', 2))
+        self.assertEqual(cache.get('forever'), 1)
+        self.assertTrue(cache.touch('forever', 0.05))
+        time.sleep(0.1)
+        self.assertIsNone(cache.get('forever'))
+
+    def test_incr(self):
+        cache = self.cache
+        cache.set('counter', 1)
+        self.assertEqual(cache.incr('counter'), 2)
+        self.assertEqual(cache.decr('counter', 5), -3)
+        with self.assertRaises(ValueError):
+            cache.incr('missing')
+
+    def test_oversized_value_not_stored(self):
+        """Значение больше слота не кешируется, стирает старое, пишет в лог."""
+        cache = self.cache
+        cache.set('key', 'small')
+        with self.assertLogs('core.cache.mmap', 'WARNING') as logs:
+            self.assertEqual(cache.set_many({'key': 'x' * 1000}), ['key'])
+            cache.set('key', 'x' * 1000)
+        self.assertIsNone(cache.get('key'))
+        self.assertEqual(len(logs.output), 2)
+        self.assertIn(':key', logs.output[0])
+
+    def test_eviction_keeps_table_bounded(self):
+        """При переполнении старые записи вытесняются, новые доступны."""
+        cache = self.cache
+        for number in range(500):
+            cache.set(f'key{number}', number)
+        self.assertEqual(cache.get('key499'), 499)
+        stored = cache.get_many([f'key{number}' for number in range(500)])
+        self.assertLessEqual(len(stored), 64)
+        for key, value in stored.items():
+            self.assertEqual(key, f'key{value}')
+
+    def test_shared_between_processes(self):
+        """Запись из дочернего процесса видна родителю, incr атомарен."""
+        self.cache.set('counter', 0)
+        pids = _run_children(_child_set, self.cache)
+        self.assertIn(self.cache.get('from-child'), pids)
+        self.assertEqual(self.cache.get('counter'), 400)
+        other = self.make_cache()
+        self.assertEqual(other.get('counter'), 400)
+
+    def test_update_is_atomic(self):
+        """update видит старое значение и не теряет записи процессов."""
+        self.assertEqual(
+            self.cache.update('key', lambda value: (1, value)), None
+        )
+        self.assertEqual(
+            self.cache.update('key', lambda value: (value + 1, value)), 1
+        )
+        _run_children(_child_update, self.cache)
+        self.assertEqual(len(self.cache.get('pids')), 80)
+
+    def test_layout_change_resets_file(self):
+        self.cache.set('key', 1)
+        cache = self.make_cache(SLOTS=32)
+        self.assertIsNone(cache.get('key'))
+        cache.set('key', 2)
+        self.assertEqual(cache.get('key'), 2)
@@ -0,0 +1,77 @@
+import gzip
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Post
+
+User = get_user_model()
+
+
+class GzipPageCacheTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='auth')
+        Post.objects.create(author=cls.user, text='Первый пост')
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('posts:index')
+
+    def test_cached_page_is_stored_compressed(self):
+        """Повторный запрос отдаёт сохранённые сжатые байты."""
+        first = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(second['Content-Encoding'], 'gzip')
+        self.assertEqual(first.content, second.content)
+        self.assertIn('Первый пост', gzip.decompress(second.content).decode())
+        self.assertIn('Accept-Encoding', second['Vary'])
+
+    def test_plain_client_gets_decompressed_page(self):
+        """Клиент без gzip получает распакованную страницу."""
+        self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        response = self.client.get(self.url)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertContains(response, 'Первый пост')
+
+    def test_etag_not_modified(self):
+        response = self.client.get(self.url)
+        response = self.client.get(
+            self.url, HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_gzip_body_has_own_etag(self):
+        """У сжатого и несжатого тела разные ETag."""
+        plain = self.client.get(self.url)['ETag']
+        compressed = self.client.get(
+            self.url, HTTP_ACCEPT_ENCODING='gzip'
+        )['ETag']
+        self.assertEqual(compressed, plain[:-1] + '-gz"')
+        response = self.client.get(
+            self.url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=plain
+        )
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(
+            self.url, HTTP_ACCEPT_ENCODING='gzip',
+            HTTP_IF_NONE_MATCH=compressed,
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_new_post_invalidates_page(self):
+        """Новый пост сбрасывает закешированную страницу."""
+        self.client.get(self.url)
+        Post.objects.create(author=self.user, text='Второй пост')
+        self.assertContains(self.client.get(self.url), 'Второй пост')
+
+    def test_authenticated_not_cached(self):
+        """Авторизованным пользователям страница не кешируется."""
+        client = Client()
+        client.force_login(self.user)
+        client.get(self.url)
+        response = client.get(self.url)
+        self.assertIsNotNone(response.context)
+        self.assertFalse(response.has_header('Content-Encoding'))
@@ -0,0 +1,70 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from .. import ratelimit
+
+User = get_user_model()
+
+LIMITS = {
+    'posts:post_create': {'methods': ('POST',), 'per_minute': 60, 'burst': 2},
+    'users:login': {'methods': ('POST',), 'per_minute': 6, 'burst': 1},
+}
+
+
+@override_settings(RATELIMIT_ENABLED=True, RATELIMITS=LIMITS)
+class RateLimitTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='auth')
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def test_bucket_refills(self):
+        """Ведро отдаёт burst жетонов и пополняется со временем."""
+        with mock.patch('core.ratelimit.time.time', return_value=1000.0):
+            self.assertEqual(ratelimit.take('key', 60, 2), 0)
+            self.assertEqual(ratelimit.take('key', 60, 2), 0)
+            self.assertAlmostEqual(ratelimit.take('key', 60, 2), 1.0)
+        with mock.patch('core.ratelimit.time.time', return_value=1001.0):
+            self.assertEqual(ratelimit.take('key', 60, 2), 0)
+
+    def test_too_many_posts(self):
+        """Сверх лимита создание поста получает 429 с Retry-After."""
+        url = reverse('posts:post_create')
+        for _ in range(2):
+            self.assertEqual(
+                self.client.post(url, {'text': 'Пост'}).status_code, 302
+            )
+        response = self.client.post(url, {'text': 'Пост'})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_login_limited_per_ip(self):
+        """Попытки входа ограничены по IP даже без пользователя."""
+        url = reverse('users:login')
+        anonymous = Client()
+        anonymous.post(url, {'username': 'auth', 'password': 'wrong'})
+        response = anonymous.post(
+            url, {'username': 'auth', 'password': 'wrong'}
+        )
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '10')
+        other_ip = Client(REMOTE_ADDR='10.0.0.2')
+        response = other_ip.post(url, {'username': 'auth', 'password': 'x'})
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(RATELIMIT_ENABLED=False)
+    def test_disabled(self):
+        """С выключенным ограничением лимиты не действуют."""
+        url = reverse('users:login')
+        for _ in range(3):
+            response = self.client.post(url, {'username': 'auth'})
+            self.assertEqual(response.status_code, 200)
@@ -0,0 +1,62 @@
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import path, reverse
+
+from posts.models import Group, Post
+from posts.rows import Rows
+from ..reverse import reverse_cached
+
+User = get_user_model()
+
+
+def view(request, value):
+    pass
+
+
+class Urls:
+    urlpatterns = [path('other/<str:value>/', view, name='other')]
+
+
+class ReverseCachedTest(SimpleTestCase):
+    def test_matches_reverse(self):
+        """Адреса совпадают с reverse для разных конвертеров"""
+        cases = (
+            ('posts:index', ()),
+            ('posts:post_detail', (42,)),
+            ('posts:group_list', ('test-slug',)),
+            ('posts:profile', ('Пользователь',)),
+            ('posts:profile', ("o'neil+me@home",)),
+        )
+        for viewname, args in cases:
+            with self.subTest(viewname=viewname, args=args):
+                self.assertEqual(
+                    reverse_cached(viewname, args),
+                    reverse(viewname, args=args),
+                )
+
+    def test_urlconf_change(self):
+        """Смена URLconf сбрасывает разобранные шаблоны"""
+        reverse_cached('posts:index')
+        with override_settings(ROOT_URLCONF=Urls):
+            self.assertEqual(reverse_cached('other', ('x',)), '/other/x/')
+
+
+class AbsoluteUrlTest(TestCase):
+    def test_models_and_rows(self):
+        """Модели и строки ленты дают одинаковые адреса"""
+        user = User.objects.create_user(username='auth')
+        group = Group.objects.create(
+            title='Группа', slug='test-slug', description='Описание'
+        )
+        post = Post.objects.create(text='Текст', author=user, group=group)
+        row = Rows(Post.objects.all())[0]
+        self.assertEqual(post.get_absolute_url(), '/posts/%d/' % post.pk)
+        self.assertEqual(group.get_absolute_url(), '/group/test-slug/')
+        self.assertEqual(user.get_absolute_url(), '/profile/auth/')
+        self.assertEqual(row.get_absolute_url(), post.get_absolute_url())
+        self.assertEqual(
+            row.group.get_absolute_url(), group.get_absolute_url()
+        )
+        self.assertEqual(
+            row.author.get_absolute_url(), user.get_absolute_url()
+        )
@@ -0,0 +1,61 @@
+import os
+import re
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+
+class ServeCommandTest(SimpleTestCase):
+    def setUp(self):
+        data_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(data_dir.cleanup)
+        env = {
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': 'yatube.settings_test',
+            'YATUBE_TEST_DATA_DIR': data_dir.name,
+        }
+        self.process = subprocess.Popen(
+            [
+                sys.executable, 'manage.py', 'serve', '--port', '0',
+                '--workers', '2', '--max-requests', '2', '--quiet',
+            ],
+            cwd=settings.BASE_DIR,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            env=env,
+        )
+        self.addCleanup(self.process.stdout.close)
+        self.addCleanup(self.process.kill)
+        # База пустая: прогрев пишет в лог ошибки до строки с адресом.
+        match = None
+        for line in self.process.stdout:
+            match = re.search(r'http://\S+/', line)
+            if match:
+                break
+        self.url = match.group()
+
+    def get(self, count):
+        return [
+            urllib.request.urlopen(self.url + 'about/author/').status
+            for _ in range(count)
+        ]
+
+    def test_recycle_reload_and_stop(self):
+        """Воркеры перезапускаются по лимиту и SIGHUP, сервер завершается"""
+        self.assertEqual(self.get(6), [200] * 6)
+        self.process.send_signal(signal.SIGHUP)
+        time.sleep(0.5)
+        self.assertEqual(self.get(3), [200] * 3)
+        self.process.send_signal(signal.SIGTERM)
+        self.assertEqual(self.process.wait(timeout=15), 0)
+        output = self.process.stdout.read()
+        self.assertIn('воркер 0: pid=', output)
+        self.assertIn('воркер 1: pid=', output)
+        self.assertIn('Сервер остановлен', output)
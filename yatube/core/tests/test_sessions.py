@@ -0,0 +1,101 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from ..sessions import write_behind
+
+User = get_user_model()
+
+
+@override_settings(
+    SESSION_ENGINE='core.sessions.write_behind',
+    SESSION_WRITE_BEHIND_INTERVAL=3600,
+)
+class WriteBehindSessionTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='auth')
+
+    def setUp(self):
+        write_behind.flush()
+
+    def test_requests_do_not_touch_session_table(self):
+        """Запросы авторизованного пользователя не читают django_session."""
+        self.client.force_login(self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('posts:index'))
+        self.assertEqual(response.context['user'], self.user)
+        self.assertFalse(any(
+            'django_session' in query['sql'] for query in queries
+        ))
+
+    def test_flush_writes_sessions_to_db(self):
+        """Накопленные сессии сохраняются в базу одной пачкой."""
+        self.client.force_login(self.user)
+        key = self.client.session.session_key
+        self.assertFalse(Session.objects.filter(pk=key).exists())
+        self.assertEqual(write_behind.flush(), 1)
+        session = Session.objects.get(pk=key)
+        self.assertEqual(
+            session.get_decoded()['_auth_user_id'], str(self.user.pk)
+        )
+        self.assertEqual(write_behind.flush(), 0)
+
+    def test_failed_flush_keeps_sessions(self):
+        """Ошибка базы не теряет сессии: они пишутся при следующем flush."""
+        self.client.force_login(self.user)
+        key = self.client.session.session_key
+        with mock.patch.object(
+            Session.objects, 'bulk_create',
+            side_effect=OperationalError('database is locked'),
+        ), self.assertLogs('core.sessions.write_behind', 'WARNING'):
+            self.assertEqual(write_behind.flush(), 0)
+        self.assertFalse(Session.objects.filter(pk=key).exists())
+        self.assertEqual(write_behind.flush(), 1)
+        session = self.client.session
+        session['visits'] = 1
+        session.save()
+        self.assertEqual(write_behind.flush(), 1)
+        stored = Session.objects.get(pk=key).get_decoded()
+        self.assertEqual(stored['visits'], 1)
+
+    def test_logout_removes_session(self):
+        self.client.force_login(self.user)
+        key = self.client.session.session_key
+        write_behind.flush()
+        self.client.get(reverse('users:logout'))
+        self.assertFalse(Session.objects.filter(pk=key).exists())
+        self.assertEqual(write_behind.flush(), 0)
+
+
+class SweepSessionsTest(TestCase):
+    def test_expired_sessions_deleted_in_batches(self):
+        """Команда удаляет только истёкшие сессии."""
+        now = timezone.now()
+        Session.objects.bulk_create(
+            Session(
+                session_key=f'expired{number}',
+                session_data='',
+                expire_date=now - timedelta(days=1),
+            )
+            for number in range(5)
+        )
+        Session.objects.create(
+            session_key='alive', session_data='',
+            expire_date=now + timedelta(days=1),
+        )
+        out = StringIO()
+        call_command('sweep_sessions', batch_size=2, stdout=out)
+        self.assertIn('5', out.getvalue())
+        self.assertEqual(
+            list(Session.objects.values_list('pk', flat=True)), ['alive']
+        )
@@ -0,0 +1,72 @@
+import threading
+import time
+import uuid
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from ..cache.stampede import get_or_compute, reset_stats, stats
+
+
+@override_settings(STAMPEDE_WAIT_INTERVAL=0.01)
+class GetOrComputeTest(SimpleTestCase):
+    def setUp(self):
+        self.key = f'test:{uuid.uuid4().hex}'
+        self.calls = 0
+        reset_stats()
+
+    def compute(self, value='value', delay=0):
+        def func():
+            self.calls += 1
+            time.sleep(delay)
+            return value
+        return func
+
+    def test_computed_once_then_cached(self):
+        self.assertEqual(get_or_compute(self.key, self.compute(), 60), 'value')
+        self.assertEqual(get_or_compute(self.key, self.compute(), 60), 'value')
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(stats()['computed'], 1)
+
+    def test_stale_value_served_while_other_rebuilds(self):
+        """Пока ключ пересчитывает другой, отдаётся устаревшее значение."""
+        cache.set(self.key, ('old', time.time() - 1, 0.1), 60)
+        cache.add(f'{self.key}:lock', 'other', 30)
+        value = get_or_compute(self.key, self.compute('new'), 60)
+        self.assertEqual(value, 'old')
+        self.assertEqual(self.calls, 0)
+        self.assertEqual(stats()['coalesced'], 1)
+
+    def test_concurrent_misses_single_flight(self):
+        """Одновременные промахи порождают один пересчёт."""
+        results = []
+        compute = self.compute('built', delay=0.2)
+        threads = [
+            threading.Thread(target=lambda: results.append(
+                get_or_compute(self.key, compute, 60)
+            ))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, ['built'] * 8)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(stats()['waited'], 7)
+
+    def test_probabilistic_early_expiration(self):
+        """Дорогой ключ пересчитывается заранее, до истечения срока."""
+        cache.set(self.key, ('old', time.time() + 5, 10.0), 60)
+        value = get_or_compute(self.key, self.compute('new'), 60, beta=100)
+        self.assertEqual(value, 'new')
+        self.assertEqual(stats()['early'], 1)
+
+    def test_failed_compute_releases_lock(self):
+        def broken():
+            raise RuntimeError
+
+        with self.assertRaises(RuntimeError):
+            get_or_compute(self.key, broken, 60)
+        self.assertIsNone(cache.get(f'{self.key}:lock'))
+        self.assertEqual(get_or_compute(self.key, self.compute(), 60), 'value')
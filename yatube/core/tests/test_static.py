@@ -0,0 +1,100 @@
+import gzip
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.http import FileResponse
+from django.test import TestCase, override_settings
+
+STATIC_SOURCE = tempfile.mkdtemp(dir=settings.BASE_DIR)
+STATIC_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+CSS = b'body { color: red; }\n' * 100
+
+
+@override_settings(
+    STATICFILES_DIRS=[STATIC_SOURCE],
+    STATIC_ROOT=STATIC_ROOT,
+    STATICFILES_STORAGE='core.storage.CompressedManifestStaticFilesStorage',
+)
+class StaticFilesTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        os.makedirs(os.path.join(STATIC_SOURCE, 'css'))
+        with open(os.path.join(STATIC_SOURCE, 'css', 'site.css'), 'wb') as f:
+            f.write(CSS)
+        with open(os.path.join(STATIC_SOURCE, 'logo.png'), 'wb') as f:
+            f.write(b'\x89PNG' + bytes(500))
+        call_command('collectstatic', interactive=False, verbosity=0)
+        cls.css_name = staticfiles_storage.stored_name('css/site.css')
+        cls.css_url = staticfiles_storage.url('css/site.css')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(STATIC_SOURCE, ignore_errors=True)
+        shutil.rmtree(STATIC_ROOT, ignore_errors=True)
+
+    def test_collectstatic_fingerprints_and_compresses(self):
+        """collectstatic создаёт файлы с хешем и сжатые копии."""
+        self.assertNotEqual(self.css_name, 'css/site.css')
+        self.assertTrue(staticfiles_storage.exists(self.css_name + '.gz'))
+        self.assertFalse(staticfiles_storage.exists('logo.png.gz'))
+
+    def test_gzip_negotiation(self):
+        """Сжатая копия отдаётся только клиентам, принимающим gzip."""
+        response = self.client.get(
+            self.css_url, HTTP_ACCEPT_ENCODING='gzip, deflate'
+        )
+        self.assertIsInstance(response, FileResponse)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        body = b''.join(response.streaming_content)
+        self.assertEqual(gzip.decompress(body), CSS)
+        response = self.client.get(self.css_url)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(b''.join(response.streaming_content), CSS)
+
+    def test_cache_headers(self):
+        """Файлы с хешем кешируются навсегда, остальные — ненадолго."""
+        response = self.client.get(self.css_url)
+        self.assertIn('immutable', response['Cache-Control'])
+        response = self.client.get(settings.STATIC_URL + 'css/site.css')
+        self.assertEqual(
+            response['Cache-Control'],
+            f'public, max-age={settings.STATIC_MAX_AGE}'
+        )
+
+    def test_not_modified(self):
+        response = self.client.get(self.css_url)
+        response = self.client.get(
+            self.css_url, HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_not_modified_etag_list_and_weak(self):
+        """304 и для списка ETag, и для слабой метки."""
+        etag = self.client.get(self.css_url)['ETag']
+        for header in (f'"other", {etag}', f'W/{etag}', '*'):
+            with self.subTest(header=header):
+                response = self.client.get(
+                    self.css_url, HTTP_IF_NONE_MATCH=header
+                )
+                self.assertEqual(response.status_code, 304)
+
+    def test_head_without_body(self):
+        """На HEAD приходят заголовки без тела."""
+        response = self.client.head(self.css_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Length'], str(len(CSS)))
+        self.assertFalse(response.streaming)
+
+    def test_missing_file_falls_through(self):
+        for path in ('missing.css', '../settings.py', '%2e%2e/manage.py'):
+            with self.subTest(path=path):
+                response = self.client.get(settings.STATIC_URL + path)
+                self.assertEqual(response.status_code, 404)
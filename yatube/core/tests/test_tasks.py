@@ -0,0 +1,133 @@
+import threading
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import OperationalError
+from django.test import Client, TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.models import Post
+from posts.signals import post_written
+from ..management.commands.run_workers import Command
+from ..models import Job
+from ..tasks import add_job, requeue_stale, run_pending, task
+
+User = get_user_model()
+
+calls = []
+
+
+@task('core.tests.record')
+def record(value):
+    calls.append(value)
+
+
+@task('core.tests.fail')
+def fail():
+    raise ValueError('Тестовая ошибка')
+
+
+class TaskQueueTest(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_run_pending(self):
+        """Готовые задачи выполняются и помечаются выполненными."""
+        job = add_job('core.tests.record', args=(1,))
+        self.assertEqual(run_pending(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.DONE)
+        self.assertEqual(calls, [1])
+
+    def test_idempotency_key(self):
+        """Задача с тем же ключом не дублируется, пока ждёт в очереди."""
+        first = add_job('core.tests.record', args=(1,), key='same')
+        second = add_job('core.tests.record', args=(2,), key='same')
+        self.assertEqual(first.pk, second.pk)
+        run_pending()
+        self.assertEqual(calls, [1])
+        add_job('core.tests.record', args=(3,), key='same')
+        run_pending()
+        self.assertEqual(calls, [1, 3])
+
+    def test_delayed_job_waits(self):
+        """Отложенная задача не запускается раньше времени."""
+        add_job('core.tests.record', args=(1,), delay=60)
+        self.assertEqual(run_pending(), 0)
+        self.assertEqual(calls, [])
+
+    def test_retry_then_fail(self):
+        """Упавшая задача повторяется, затем помечается ошибкой."""
+        job = add_job('core.tests.fail', max_attempts=2)
+        run_pending()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.QUEUED)
+        self.assertEqual(job.attempts, 1)
+        self.assertIn('Тестовая ошибка', job.last_error)
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        run_pending()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertEqual(job.attempts, 2)
+
+    def test_unknown_task_fails(self):
+        job = add_job('core.tests.missing', max_attempts=1)
+        run_pending()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+
+    def test_stale_job_requeued(self):
+        """Задачи упавших воркеров возвращаются в очередь."""
+        job = add_job('core.tests.record', args=(1,))
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.RUNNING,
+            locked_at=timezone.now() - timedelta(days=1),
+        )
+        self.assertEqual(requeue_stale(), 1)
+        run_pending()
+        self.assertEqual(calls, [1])
+
+    def test_worker_survives_errors(self):
+        """Ошибка базы не останавливает воркер: он ждёт и пробует снова."""
+        stop = threading.Event()
+        results = [OperationalError('database is locked'), None]
+
+        def claim():
+            result = results.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            stop.set()
+
+        logger = 'core.management.commands.run_workers'
+        with mock.patch('core.tasks.claim', side_effect=claim), \
+                self.assertLogs(logger, 'ERROR'):
+            # В своём потоке: воркер закрывает своё соединение с базой.
+            worker = threading.Thread(target=Command().work, args=(stop, 0))
+            worker.start()
+            worker.join(5)
+        self.assertFalse(worker.is_alive())
+        self.assertEqual(results, [])
+
+
+class PostWrittenTest(TransactionTestCase):
+    def test_post_create_enqueues_after_commit(self):
+        """Создание поста ставит задачу, воркер отправляет сигнал."""
+        user = User.objects.create_user(username='auth')
+        client = Client()
+        client.force_login(user)
+        received = []
+
+        def receiver(sender, post, created, **kwargs):
+            received.append((post.pk, created))
+
+        post_written.connect(receiver)
+        self.addCleanup(post_written.disconnect, receiver)
+        client.post(reverse('posts:post_create'), {'text': 'Новый пост'})
+        post = Post.objects.get()
+        self.assertTrue(
+            Job.objects.filter(key=f'post_written:{post.pk}').exists()
+        )
+        run_pending()
+        self.assertEqual(received, [(post.pk, True)])
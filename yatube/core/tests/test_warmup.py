@@ -0,0 +1,36 @@
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.template import engines
+from django.test import TestCase, override_settings
+
+CACHED_TEMPLATES = [{
+    'BACKEND': 'django.template.backends.django.DjangoTemplates',
+    'DIRS': [settings.TEMPLATES_DIR],
+    'OPTIONS': {
+        'loaders': [(
+            'django.template.loaders.cached.Loader', [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ],
+        )],
+        'context_processors': settings.TEMPLATES[0]['OPTIONS'][
+            'context_processors'
+        ],
+    },
+}]
+
+
+@override_settings(TEMPLATES=CACHED_TEMPLATES)
+class WarmupTest(TestCase):
+    def test_templates_compiled_into_cache(self):
+        """Прогрев кладёт все шаблоны проекта в кеширующий загрузчик"""
+        out = StringIO()
+        call_command('warmup', stdout=out)
+        loader = engines['django'].engine.template_loaders[0]
+        cached = {key.split('-')[0] for key in loader.get_template_cache}
+        self.assertIn('posts/index.html', cached)
+        self.assertIn('includes/header.html', cached)
+        self.assertIn('templates:', out.getvalue())
+        self.assertIn('hooks: 2', out.getvalue())
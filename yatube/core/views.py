@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.http import Http404
+from django.utils.cache import patch_cache_control
+from django.views.static import serve
+from sorl.thumbnail.conf import settings as thumbnail_settings
+
+from .files import serve_file
+
+
+def media(request, path):
+    """Отдаёт загруженные файлы с заголовками кеширования.
+
+    Имена миниатюр содержат хеш исходника и параметров, поэтому
+    их можно кешировать навсегда.
+    """
+    response = serve(request, path, document_root=settings.MEDIA_ROOT)
+    if path.startswith(thumbnail_settings.THUMBNAIL_PREFIX):
+        patch_cache_control(
+            response, public=True, max_age=60 * 60 * 24 * 365, immutable=True
+        )
+    else:
+        patch_cache_control(
+            response, public=True, max_age=settings.MEDIA_CACHE_MAX_AGE
+        )
+    return response
+
+
+def sitemap(request, path='sitemap.xml'):
+    """Отдаёт заранее собранные sitemap-файлы и их gzip-копии."""
+    response = serve_file(
+        request, settings.SITEMAP_ROOT, path, settings.SITEMAP_MAX_AGE
+    )
+    if response is None or not path.endswith('.xml'):
+        raise Http404('Нет такого sitemap')
+    return response
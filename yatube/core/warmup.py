@@ -0,0 +1,80 @@
+"""Прогрев процесса перед тем, как он начнёт принимать запросы.
+
+Компилирует все шаблоны из DIRS (с кеширующим загрузчиком они
+остаются в памяти), заполняет URL-резолвер, загружает переводы
+и форматы дат и вызывает функции из WARMUP_HOOKS, которые заполняют
+кеши приложений.
+"""
+import logging
+import os
+import time
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.template import TemplateSyntaxError, engines
+from django.urls import get_resolver
+from django.utils import timezone, translation
+from django.utils.formats import date_format
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+def compile_templates():
+    count = 0
+    for engine in engines.all():
+        for directory in engine.dirs:
+            for root, _, files in os.walk(directory):
+                for filename in files:
+                    name = os.path.relpath(
+                        os.path.join(root, filename), directory
+                    )
+                    try:
+                        engine.get_template(name)
+                    except TemplateSyntaxError:
+                        logger.warning('Шаблон %s не скомпилирован', name)
+                    else:
+                        count += 1
+    return count
+
+
+def populate_urls():
+    resolver = get_resolver()
+    return len(resolver.reverse_dict)
+
+
+def load_locale():
+    with translation.override(settings.LANGUAGE_CODE):
+        translation.gettext('Home')
+        date_format(timezone.now(), 'd E Y')
+    return settings.LANGUAGE_CODE
+
+
+def run_hooks():
+    done = 0
+    for path in settings.WARMUP_HOOKS:
+        try:
+            import_string(path)()
+        except DatabaseError:
+            logger.warning('Прогрев %s пропущен', path, exc_info=True)
+        else:
+            done += 1
+    return done
+
+
+STEPS = (
+    ('templates', compile_templates),
+    ('urls', populate_urls),
+    ('locale', load_locale),
+    ('hooks', run_hooks),
+)
+
+
+def warmup():
+    """Выполняет все шаги и возвращает их результаты и время в мс."""
+    results = {}
+    for name, step in STEPS:
+        started = time.perf_counter()
+        result = step()
+        results[name] = (result, (time.perf_counter() - started) * 1000)
+    return results
@@ -11,11 +11,38 @@ class PostAdmin(admin.ModelAdmin):
         'author',
         'group',
     )
+    list_select_related = ('group', 'author')
     list_editable = ('group',)
-    search_fields = ('text',)
+    # Сжатые посты хранят в колонке text пустую строку, их находит
+    # только поиск по отрывку.
+    search_fields = ('text', 'excerpt')
     list_filter = ('pub_date',)
     empty_value_display = '-пусто-'
 
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        field = super().formfield_for_foreignkey(db_field, request, **kwargs)
+        if db_field.name == 'group':
+            # Список групп один на все строки list_editable, а не запрос
+            # на каждую строку.
+            field.choices = list(field.choices)
+        return field
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer('text', 'text_compressed')
+
+    def get_list_display(self, request):
+        # Вместо поля text — отрывок: поле модели admin взял бы раньше
+        # метода и дочитывал бы отложенный текст по запросу на строку.
+        return tuple(
+            'excerpt_text' if name == 'text' else name
+            for name in super().get_list_display(request)
+        )
+
+    def excerpt_text(self, obj):
+        return obj.excerpt
+
+    excerpt_text.short_description = 'Текст'
+
 
 class GroupAdmin(admin.ModelAdmin):
     list_display = ("pk", "title", "slug", "description")
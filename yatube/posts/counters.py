@@ -0,0 +1,137 @@
+"""Счётчики просмотров постов с отложенной записью в базу.
+
+Просмотры копятся в памяти процесса и сохраняются одним пакетным
+upsert раз в VIEW_COUNTS_FLUSH_INTERVAL секунд фоновым потоком, а также
+при выходе процесса, поэтому читатели не ждут блокировку записи SQLite.
+Вместе с числом просмотров пересчитывается затухающая популярность
+(posts.popular). Несохранённые просмотры при падении процесса теряются.
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+
+from .models import Post, PostViews
+from .popular import decayed
+
+logger = logging.getLogger(__name__)
+
+_pending = Counter()
+_lock = threading.Lock()
+_last_flush = time.monotonic()
+_flusher = None
+
+
+def _upsert_sql():
+    quote = connection.ops.quote_name
+    table = quote(PostViews._meta.db_table)
+    post, count, score, score_at = (
+        quote(PostViews._meta.get_field(name).column)
+        for name in ('post', 'count', 'score', 'score_at')
+    )
+    return (
+        f'INSERT INTO {table} ({post}, {count}, {score}, {score_at}) '
+        f'VALUES (%s, %s, %s, %s) '
+        f'ON CONFLICT ({post}) DO UPDATE SET '
+        f'{count} = {table}.{count} + excluded.{count}, '
+        f'{score} = excluded.{score}, {score_at} = excluded.{score_at}'
+    )
+
+
+def _flush_periodically():
+    # Интервал перечитывается на каждом шаге; 0 останавливает поток.
+    while settings.VIEW_COUNTS_FLUSH_INTERVAL:
+        time.sleep(settings.VIEW_COUNTS_FLUSH_INTERVAL)
+        try:
+            flush()
+        except Exception:
+            logger.exception('Просмотры не сохранены')
+        finally:
+            connection.close()
+
+
+def _start_flusher():
+    # Поток запускается при первом просмотре, в том числе заново
+    # в процессе, полученном через fork.
+    global _flusher
+    if _flusher is not None and _flusher.is_alive():
+        return
+    with _lock:
+        if _flusher is None or not _flusher.is_alive():
+            _flusher = threading.Thread(
+                target=_flush_periodically, name='view-counts', daemon=True
+            )
+            _flusher.start()
+
+
+def record_view(post_id):
+    with _lock:
+        _pending[post_id] += 1
+    if time.monotonic() - _last_flush >= settings.VIEW_COUNTS_FLUSH_INTERVAL:
+        flush()
+    else:
+        _start_flusher()
+
+
+def views_count(post_id):
+    """Сохранённые просмотры плюс ещё не записанные этим процессом."""
+    stored = PostViews.objects.filter(post_id=post_id).values_list(
+        'count', flat=True
+    ).first()
+    with _lock:
+        return (stored or 0) + _pending[post_id]
+
+
+def _restore(pending):
+    with _lock:
+        _pending.update(pending)
+
+
+def flush():
+    """Сохраняет накопленные просмотры, возвращает число постов.
+
+    Если база занята, просмотры возвращаются в очередь до следующей
+    попытки: страница, которая вызвала запись, не должна падать.
+    """
+    global _last_flush
+    with _lock:
+        pending = dict(_pending)
+        _pending.clear()
+        _last_flush = time.monotonic()
+    if not pending:
+        return 0
+    now = timezone.now()
+    db_now = PostViews._meta.get_field('score_at').get_db_prep_value(
+        now, connection
+    )
+    try:
+        with transaction.atomic():
+            rows = []
+            for pk, score, score_at in Post.objects.filter(
+                pk__in=list(pending)
+            ).values_list(
+                'pk', 'views__score', 'views__score_at'
+            ).order_by():
+                score = decayed(score, score_at, now) if score_at else 0.0
+                rows.append((pk, pending[pk], score + pending[pk], db_now))
+            with connection.cursor() as cursor:
+                cursor.executemany(_upsert_sql(), rows)
+    except DatabaseError:
+        logger.warning('Просмотры не сохранены', exc_info=True)
+        _restore(pending)
+        return 0
+    return len(rows)
+
+
+def reset():
+    """Забывает несохранённые просмотры этого процесса."""
+    with _lock:
+        _pending.clear()
+
+
+atexit.register(flush)
@@ -0,0 +1,119 @@
+"""RSS- и Atom-ленты: общая, по группе и по автору.
+
+Записи читаются строками (posts.rows) теми же запросами, что и страницы,
+по индексам (author, -pub_date) и (group, -pub_date). Готовые ленты
+кешируются сжатыми вместе с ETag и Last-Modified и сбрасываются при
+изменении постов, поэтому опрашивающий читатель обычно получает 304.
+"""
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.text import Truncator
+
+from core.cache.pages import gzip_page_cache
+from core.reverse import reverse_cached
+from .lookups import groups, users
+from .models import Post
+from .rows import Rows
+
+TITLE_LENGTH = 80
+
+
+class PostsFeed(Feed):
+    def posts(self, obj):
+        return Post.objects.all()
+
+    def items(self, obj):
+        return Rows(self.posts(obj))[:settings.FEED_ITEMS]
+
+    def item_title(self, item):
+        return Truncator(item.excerpt).chars(TITLE_LENGTH)
+
+    def item_description(self, item):
+        return item.excerpt
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_author_name(self, item):
+        return item.author.get_full_name() or item.author.username
+
+
+class IndexFeed(PostsFeed):
+    def title(self):
+        return 'Последние обновления на сайте'
+
+    def description(self):
+        return 'Новые записи всех авторов'
+
+    def link(self):
+        return reverse_cached('posts:index')
+
+
+class GroupFeed(PostsFeed):
+    def get_object(self, request, slug):
+        return groups.get_or_404(slug)
+
+    def posts(self, group):
+        return group.posts.all()
+
+    def title(self, group):
+        return f'Записи сообщества {group.title}'
+
+    def description(self, group):
+        return group.description
+
+    def link(self, group):
+        return group.get_absolute_url()
+
+
+class AuthorFeed(PostsFeed):
+    def get_object(self, request, username):
+        return users.get_or_404(username)
+
+    def posts(self, author):
+        return author.posts.all()
+
+    def title(self, author):
+        return f'Записи {author.get_full_name() or author.username}'
+
+    def description(self, author):
+        return f'Новые записи пользователя {author.username}'
+
+    def link(self, author):
+        return reverse_cached('posts:profile', (author.username,))
+
+
+class AtomIndexFeed(IndexFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self):
+        return self.description()
+
+
+class AtomGroupFeed(GroupFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, group):
+        return self.description(group)
+
+
+class AtomAuthorFeed(AuthorFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, author):
+        return self.description(author)
+
+
+def cached(feed):
+    return gzip_page_cache(settings.FEED_CACHE_TIMEOUT, key_prefix='feeds')(
+        feed
+    )
+
+
+index_rss = cached(IndexFeed())
+index_atom = cached(AtomIndexFeed())
+group_rss = cached(GroupFeed())
+group_atom = cached(AtomGroupFeed())
+profile_rss = cached(AuthorFeed())
+profile_atom = cached(AtomAuthorFeed())
@@ -1,17 +1,68 @@
+from django.conf import settings
 from django.forms import ModelForm
+from django.urls import reverse
 
-from .models import Post
+from core.cache.versions import get_version
+from .lookups import groups
+from .models import Group, Post
+
+
+# (версия кеша поиска групп, список) — общий для потоков процесса.
+_group_choices = (None, None)
+
+
+def group_choices():
+    """Пары (pk, title) всех групп или None, если групп слишком много.
+
+    Список держится в памяти процесса под версией кеша поиска групп и
+    перечитывается при любом изменении группы. В общий кеш он не
+    кладётся: сотня длинных названий не помещается в слот MmapCache.
+    """
+    global _group_choices
+    version = get_version(groups.version_name)
+    cached_version, choices = _group_choices
+    if cached_version != version:
+        limit = settings.GROUP_CHOICES_LIMIT
+        choices = list(
+            Group.objects.order_by('title').values_list('pk', 'title')
+            [:limit + 1]
+        )
+        if len(choices) > limit:
+            choices = None
+        _group_choices = (version, choices)
+    return choices
 
 
 class PostForm(ModelForm):
     class Meta:
         model = Post
-        fields = ('text', 'group')
+        fields = ('text', 'group', 'image')
         help_texts = {
             'text': 'Введите текст',
-            'group': 'Выберите группу из списка'
+            'group': 'Выберите группу из списка',
+            'image': 'Загрузите картинку'
         }
         labels = {
             'text': 'Текст публикации',
-            'group': 'Группа публикации'
+            'group': 'Группа публикации',
+            'image': 'Картинка'
         }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        field = self.fields['group']
+        choices = group_choices()
+        if choices is None:
+            # Групп больше GROUP_CHOICES_LIMIT: выводится только выбранная,
+            # остальные подбираются через автодополнение.
+            selected = self['group'].value()
+            group = groups.get(selected, field='pk') if selected else None
+            choices = [] if group is None else [(group.pk, group.title)]
+            field.widget.attrs['data-autocomplete'] = reverse(
+                'posts:group_autocomplete'
+            )
+        if field.empty_label is not None:
+            choices = [('', field.empty_label), *choices]
+        # Варианты строятся один раз на форму, а не при каждом обходе
+        # поля; значение по-прежнему проверяется по queryset поля.
+        field.choices = choices
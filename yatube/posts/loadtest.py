@@ -0,0 +1,102 @@
+"""Сценарий нагрузки на ленты и создание постов для manage.py loadtest."""
+import random
+from importlib import import_module
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.middleware.csrf import get_token
+from django.test import Client, RequestFactory
+
+from core.reverse import reverse_cached
+from .models import Group, Post, User
+
+USERNAME = 'loadtest'
+SAMPLE = 100
+
+
+class Scenario:
+    """Готовит адреса из базы и выдаёт запросы по весам mix.
+
+    post_create ходит от имени пользователя loadtest; его посты
+    удаляются в cleanup().
+    """
+
+    def __init__(self, mix):
+        self.groups = list(
+            Group.objects.values_list('slug', flat=True)[:SAMPLE]
+        )
+        self.authors = list(User.objects.filter(
+            posts__isnull=False
+        ).values_list('username', flat=True).distinct()[:SAMPLE])
+        self.posts = list(Post.objects.values_list('pk', flat=True)[:SAMPLE])
+        self.user, _ = User.objects.get_or_create(username=USERNAME)
+        self.headers = self.login()
+        available = {
+            'index': True,
+            'group_posts': bool(self.groups),
+            'profile': bool(self.authors),
+            'post_detail': bool(self.posts),
+            'post_create': True,
+        }
+        self.skipped = [name for name in mix if not available.get(name)]
+        self.mix = {
+            name: weight for name, weight in mix.items()
+            if available.get(name)
+        }
+        self.names = list(self.mix)
+        self.weights = list(self.mix.values())
+
+    def login(self):
+        client = Client()
+        client.force_login(self.user)
+        flush = getattr(import_module(settings.SESSION_ENGINE), 'flush', None)
+        if flush is not None:
+            flush()
+        request = RequestFactory().get('/')
+        self.csrf_token = get_token(request)
+        cookies = {
+            settings.SESSION_COOKIE_NAME:
+                client.cookies[settings.SESSION_COOKIE_NAME].value,
+            settings.CSRF_COOKIE_NAME: request.META['CSRF_COOKIE'],
+        }
+        return {
+            'Cookie': '; '.join(
+                f'{name}={value}' for name, value in cookies.items()
+            ),
+        }
+
+    def request(self, name):
+        if name == 'index':
+            page = random.choice((1, 1, 1, 2, 3))
+            return 'GET', f'/?page={page}', {}, b''
+        if name == 'group_posts':
+            path = reverse_cached(
+                'posts:group_list', (random.choice(self.groups),)
+            )
+            return 'GET', path, {}, b''
+        if name == 'profile':
+            path = reverse_cached(
+                'posts:profile', (random.choice(self.authors),)
+            )
+            return 'GET', path, {}, b''
+        if name == 'post_detail':
+            path = reverse_cached(
+                'posts:post_detail', (random.choice(self.posts),)
+            )
+            return 'GET', path, {}, b''
+        body = urlencode({
+            'text': 'Пост нагрузочного теста',
+            'csrfmiddlewaretoken': self.csrf_token,
+        }).encode()
+        headers = dict(
+            self.headers,
+            **{'Content-Type': 'application/x-www-form-urlencoded'},
+        )
+        return 'POST', reverse_cached('posts:post_create'), headers, body
+
+    def choose(self):
+        name = random.choices(self.names, self.weights)[0]
+        return name, self.request(name)
+
+    def cleanup(self):
+        return self.user.posts.all().delete()[0]
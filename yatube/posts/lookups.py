@@ -0,0 +1,81 @@
+"""Кеш поиска групп по slug и пользователей по username.
+
+Каждый процесс держит ограниченный LRU-словарь найденных объектов,
+включая промахи, чтобы перебор несуществующих адресов не доходил
+до базы. Создание, переименование и удаление меняют общую версию
+в кеше, и словарь во всех процессах сбрасывается.
+"""
+import copy
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.http import Http404
+
+from core.cache.versions import bump_version, get_version
+from .models import Group, Post, User
+
+MISSING = object()
+
+
+class Lookup:
+    def __init__(self, model, field, size):
+        self.model = model
+        self.field = field
+        self.size = size
+        self._lock = threading.Lock()
+        self._version = None
+        self._entries = OrderedDict()
+
+    @property
+    def version_name(self):
+        return f'lookups:{self.model._meta.label_lower}'
+
+    def invalidate(self):
+        bump_version(self.version_name)
+
+    def _load(self, field, value):
+        try:
+            return self.model.objects.get(**{field: value})
+        except (self.model.DoesNotExist, ValueError):
+            return None
+
+    def get(self, value, field=None):
+        """Объект по значению поля (по умолчанию self.field) или None."""
+        field = field or self.field
+        version = get_version(self.version_name)
+        key = (field, value)
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            found = self._entries.get(key, MISSING)
+            if found is not MISSING:
+                self._entries.move_to_end(key)
+        if found is MISSING:
+            found = self._load(field, value)
+            with self._lock:
+                if version == self._version:
+                    self._entries[key] = found
+                    if len(self._entries) > self.size:
+                        self._entries.popitem(last=False)
+        return copy.copy(found)
+
+    def get_or_404(self, value, field=None):
+        found = self.get(value, field)
+        if found is None:
+            raise Http404(f'Не найдено: {value}')
+        return found
+
+
+groups = Lookup(Group, 'slug', settings.LOOKUP_CACHE_SIZE)
+users = Lookup(User, 'username', settings.LOOKUP_CACHE_SIZE)
+
+
+def attach_relations(post):
+    """Подставляет автора и группу поста из кеша вместо запросов."""
+    if not Post.author.is_cached(post):
+        post.author = users.get_or_404(post.author_id, field='pk')
+    if post.group_id is not None and not Post.group.is_cached(post):
+        post.group = groups.get(post.group_id, field='pk')
+    return post
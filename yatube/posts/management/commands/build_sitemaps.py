@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from posts.sitemaps import build
+
+
+class Command(BaseCommand):
+    help = 'Собирает sitemap-файлы постов, групп и профилей'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full', action='store_true',
+            help='Пересобрать все шарды, а не только новые посты',
+        )
+
+    def handle(self, *args, **options):
+        count = build(full=options['full'])
+        self.stdout.write(f'Адресов в sitemap: {count}')
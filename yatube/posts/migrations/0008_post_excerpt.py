@@ -0,0 +1,41 @@
+# Generated by Django 2.2.16 on 2026-10-19 10:55
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils.text import Truncator
+
+
+def fill_excerpts(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    length = settings.POST_EXCERPT_LENGTH
+    for post in Post.objects.only('pk', 'text').iterator():
+        Post.objects.filter(pk=post.pk).update(
+            excerpt=Truncator(post.text).chars(length),
+            is_long=len(post.text) > length,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0007_auto_20261019_1352'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False, verbose_name='Отрывок'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='is_long',
+            field=models.BooleanField(default=False, editable=False, verbose_name='Длинный пост'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='text_compressed',
+            field=models.BinaryField(null=True, verbose_name='Сжатый текст'),
+        ),
+        migrations.RunPython(fill_excerpts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 2.2.16 on 2026-10-19 11:15
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0010_follow_timeline'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostViews',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='views', serialize=False, to='posts.Post', verbose_name='Пост')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Просмотров')),
+                ('score', models.FloatField(default=0, verbose_name='Популярность')),
+                ('score_at', models.DateTimeField(db_index=True, verbose_name='Популярность на момент')),
+            ],
+            options={
+                'verbose_name': 'Просмотры поста',
+                'verbose_name_plural': 'Просмотры постов',
+            },
+        ),
+    ]
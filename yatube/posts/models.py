@@ -1,12 +1,22 @@
+import zlib
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.utils.text import Truncator
+
+from core.reverse import reverse_cached
 
 
 User = get_user_model()
 
 
 class Group(models.Model):
-    title = models.CharField(max_length=200, verbose_name="Заголовок")
+    title = models.CharField(
+        max_length=200,
+        db_index=True,
+        verbose_name="Заголовок"
+    )
     slug = models.SlugField(
         max_length=100,
         unique=True,
@@ -21,9 +31,53 @@ class Group(models.Model):
     def __str__(self):
         return self.title
 
+    def get_absolute_url(self):
+        return reverse_cached('posts:group_list', (self.slug,))
+
+
+def make_excerpt(text):
+    """Отрывок для карточки и признак того, что пост длиннее него."""
+    length = settings.POST_EXCERPT_LENGTH
+    return Truncator(text).chars(length), len(text) > length
+
+
+def stored_text(text, compressed):
+    """Текст поста по значениям колонок text и text_compressed."""
+    if compressed:
+        return zlib.decompress(compressed).decode()
+    return text
+
+
+class PostQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        """Заполняет отрывки; сжатие текстов здесь не применяется."""
+        objs = list(objs)
+        for post in objs:
+            post.excerpt, post.is_long = make_excerpt(post.text)
+        return super().bulk_create(objs, *args, **kwargs)
+
 
 class Post(models.Model):
     text = models.TextField(verbose_name="Текст")
+    excerpt = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name="Отрывок"
+    )
+    is_long = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name="Длинный пост"
+    )
+    # Тексты от POST_COMPRESS_MIN_LENGTH хранятся сжатыми, а колонка text
+    # у них пустая: модели и Rows распаковывают текст сами, но filter(),
+    # values('text') и поиск по text таких постов не видят. Для поиска
+    # есть excerpt.
+    text_compressed = models.BinaryField(
+        null=True,
+        editable=False,
+        verbose_name="Сжатый текст"
+    )
     pub_date = models.DateTimeField(
         auto_now_add=True,
         verbose_name="Дата публикации"
@@ -42,11 +96,167 @@ class Post(models.Model):
         null=True,
         verbose_name="Группа"
     )
+    image = models.ImageField(
+        upload_to='posts/',
+        blank=True,
+        verbose_name="Картинка"
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         verbose_name = "Пост"
         verbose_name_plural = "Посты"
         ordering = ('-pub_date',)
+        indexes = [
+            models.Index(
+                fields=['author', '-pub_date'], name='posts_author_date_idx'
+            ),
+            models.Index(
+                fields=['group', '-pub_date'], name='posts_group_date_idx'
+            ),
+        ]
 
         def __str__(self):
             return self.text[:15]
+
+    def get_absolute_url(self):
+        return reverse_cached('posts:post_detail', (self.pk,))
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        data = instance.__dict__.get('text_compressed')
+        if data and 'text' in instance.__dict__:
+            instance.text = stored_text(instance.text, data)
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None):
+        if fields is not None and 'text' in fields:
+            fields = {*fields, 'text_compressed'}
+        super().refresh_from_db(using, fields)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'text' not in update_fields:
+            return super().save(*args, **kwargs)
+        if update_fields is not None:
+            kwargs['update_fields'] = {
+                *update_fields, 'excerpt', 'is_long', 'text_compressed'
+            }
+        text = self.text
+        self.excerpt, self.is_long = make_excerpt(text)
+        self.text_compressed = None
+        min_length = settings.POST_COMPRESS_MIN_LENGTH
+        if min_length is not None and len(text) >= min_length:
+            self.text_compressed = zlib.compress(text.encode())
+            self.text = ''
+        try:
+            super().save(*args, **kwargs)
+        finally:
+            self.text = text
+
+
+class Follow(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='follower',
+        verbose_name="Подписчик"
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='following',
+        verbose_name="Автор"
+    )
+
+    class Meta:
+        verbose_name = "Подписка"
+        verbose_name_plural = "Подписки"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'author'], name='unique_follow'
+            ),
+            models.CheckConstraint(
+                check=~models.Q(user=models.F('author')),
+                name='no_self_follow'
+            ),
+        ]
+
+
+class TimelineEntry(models.Model):
+    """Пост в ленте подписок пользователя, разложенный при публикации."""
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='timeline',
+        verbose_name="Читатель"
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name="Пост"
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name="Автор"
+    )
+    pub_date = models.DateTimeField(verbose_name="Дата публикации")
+
+    class Meta:
+        verbose_name = "Запись ленты подписок"
+        verbose_name_plural = "Записи лент подписок"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'post'], name='unique_timeline_entry'
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['user', '-pub_date'], name='posts_timeline_user_idx'
+            ),
+        ]
+
+
+class PulledAuthor(models.Model):
+    """Автор, чьи посты с since не раскладываются по лентам подписок,
+    а подмешиваются к ним при чтении."""
+    author = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name="Автор"
+    )
+    since = models.DateTimeField(verbose_name="С какого времени")
+
+    class Meta:
+        verbose_name = "Автор без раскладки"
+        verbose_name_plural = "Авторы без раскладки"
+
+
+class PostViews(models.Model):
+    """Просмотры поста и затухающая со временем популярность."""
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='views',
+        verbose_name="Пост"
+    )
+    count = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Просмотров"
+    )
+    score = models.FloatField(default=0, verbose_name="Популярность")
+    score_at = models.DateTimeField(
+        db_index=True,
+        verbose_name="Популярность на момент"
+    )
+
+    class Meta:
+        verbose_name = "Просмотры поста"
+        verbose_name_plural = "Просмотры постов"
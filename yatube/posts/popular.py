@@ -0,0 +1,51 @@
+"""Популярные посты: всего сайта и каждой группы.
+
+Популярность — число просмотров, каждое из которых теряет половину
+веса за POPULAR_HALF_LIFE секунд. Она хранится в PostViews вместе
+с моментом, на который посчитана, и досчитывается при чтении.
+Списки лучших POPULAR_SIZE постов пересчитываются не чаще раза
+в POPULAR_REFRESH секунд и отдаются из кеша.
+"""
+import heapq
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from core.cache.stampede import get_or_compute
+from .models import PostViews
+
+# Через столько периодов полураспада вес просмотров меньше 0,1 %.
+HORIZON = 10
+
+
+def decayed(score, score_at, now):
+    elapsed = (now - score_at).total_seconds()
+    return score * 0.5 ** (elapsed / settings.POPULAR_HALF_LIFE)
+
+
+def _compute(group_id):
+    now = timezone.now()
+    rows = PostViews.objects.filter(
+        score_at__gte=now - timedelta(
+            seconds=settings.POPULAR_HALF_LIFE * HORIZON
+        )
+    )
+    if group_id is not None:
+        rows = rows.filter(post__group_id=group_id)
+    best = heapq.nlargest(
+        settings.POPULAR_SIZE,
+        rows.values_list('post_id', 'score', 'score_at').iterator(),
+        key=lambda row: decayed(row[1], row[2], now),
+    )
+    return [post_id for post_id, _, _ in best]
+
+
+def popular_ids(group_id=None):
+    """id самых популярных постов сайта или группы, по убыванию."""
+    scope = 'all' if group_id is None else f'group:{group_id}'
+    return get_or_compute(
+        f'popular:{scope}',
+        lambda: _compute(group_id),
+        settings.POPULAR_REFRESH,
+    )
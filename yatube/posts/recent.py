@@ -0,0 +1,83 @@
+"""Буфер последних постов в памяти процесса.
+
+Первые RECENT_POSTS_PAGES страниц главной отдаются из буфера без
+запросов к базе; посты хранятся строками posts.rows вместе с автором
+и группой. Любое изменение постов, групп или авторов меняет общую
+версию в кеше, и каждый процесс перечитывает буфер при следующем
+обращении.
+"""
+import logging
+import threading
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import DatabaseError
+
+from core.cache.versions import bump_version, get_version
+from .models import Post
+from .rows import Rows
+
+logger = logging.getLogger(__name__)
+
+VERSION = 'recent_posts'
+
+
+class _BufferedList:
+    """Последовательность для Paginator: длина — число всех постов."""
+
+    def __init__(self, posts, total):
+        self.posts = posts
+        self.total = total
+
+    def __len__(self):
+        return self.total
+
+    def __getitem__(self, index):
+        return self.posts[index]
+
+
+class RecentPosts:
+    def __init__(self, size):
+        self.size = size
+        self._lock = threading.Lock()
+        self._state = (None, (), 0)
+
+    def prime(self):
+        """Перечитывает буфер из базы."""
+        version = get_version(VERSION)
+        posts = tuple(Rows(Post.objects.all())[:self.size])
+        self._state = (version, posts, Post.objects.count())
+        return self._state
+
+    def _current(self):
+        state = self._state
+        if state[0] == get_version(VERSION):
+            return state
+        with self._lock:
+            state = self._state
+            if state[0] == get_version(VERSION):
+                return state
+            return self.prime()
+
+    def page(self, number):
+        """Страница главной из буфера или None, если её там нет."""
+        _, posts, total = self._current()
+        paginator = Paginator(_BufferedList(posts, total), settings.SORT10)
+        page = paginator.get_page(number)
+        if page.end_index() > len(posts):
+            return None
+        return page
+
+
+recent_posts = RecentPosts(settings.SORT10 * settings.RECENT_POSTS_PAGES)
+
+
+def invalidate():
+    bump_version(VERSION)
+
+
+def prime():
+    try:
+        recent_posts.prime()
+    except DatabaseError:
+        logger.warning('Буфер последних постов не заполнен', exc_info=True)
@@ -0,0 +1,171 @@
+"""Лёгкие строки постов для лент вместо экземпляров моделей.
+
+Из базы берутся только колонки, которые нужны карточке поста
+(вместо текста — сохранённый отрывок), и раскладываются по объектам
+со __slots__. Имена атрибутов совпадают с моделями, поэтому шаблоны
+работают без изменений, а сравнение с экземплярами моделей идёт
+по первичному ключу.
+"""
+from core.reverse import reverse_cached
+from .models import Group, Post, User
+
+FIELDS = (
+    'pk', 'excerpt', 'is_long', 'pub_date', 'image',
+    'author_id', 'author__username',
+    'author__first_name', 'author__last_name',
+    'group_id', 'group__title', 'group__slug',
+)
+IMAGE_FIELD = Post._meta.get_field('image')
+
+
+class Row:
+    __slots__ = ()
+    model = None
+
+    def __eq__(self, other):
+        if isinstance(other, (type(self), self.model)):
+            return self.pk == other.pk
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.pk)
+
+    @property
+    def id(self):
+        return self.pk
+
+
+class AuthorRow(Row):
+    __slots__ = ('pk', 'username', 'first_name', 'last_name')
+    model = User
+
+    def __init__(self, pk, username, first_name, last_name):
+        self.pk = pk
+        self.username = username
+        self.first_name = first_name
+        self.last_name = last_name
+
+    def __str__(self):
+        return self.username
+
+    def get_full_name(self):
+        return f'{self.first_name} {self.last_name}'.strip()
+
+    def get_absolute_url(self):
+        return reverse_cached('posts:profile', (self.username,))
+
+
+class GroupRow(Row):
+    __slots__ = ('pk', 'title', 'slug')
+    model = Group
+
+    def __init__(self, pk, title, slug):
+        self.pk = pk
+        self.title = title
+        self.slug = slug
+
+    def __str__(self):
+        return self.title
+
+    def get_absolute_url(self):
+        return reverse_cached('posts:group_list', (self.slug,))
+
+
+class PostRow(Row):
+    __slots__ = (
+        'pk', 'excerpt', 'is_long', 'pub_date', 'image_name', 'author',
+        'group', '_text',
+    )
+    model = Post
+
+    def __init__(self, pk, excerpt, is_long, pub_date, image_name, author,
+                 group):
+        self.pk = pk
+        self.excerpt = excerpt
+        self.is_long = is_long
+        self._text = None
+        self.pub_date = pub_date
+        self.image_name = image_name
+        self.author = author
+        self.group = group
+
+    @property
+    def text(self):
+        """Полный текст; у длинных постов загружается при обращении."""
+        if not self.is_long:
+            return self.excerpt
+        if self._text is None:
+            self._text = Post.objects.only(
+                'text', 'text_compressed'
+            ).get(pk=self.pk).text
+        return self._text
+
+    @property
+    def author_id(self):
+        return self.author.pk
+
+    @property
+    def group_id(self):
+        return self.group.pk if self.group is not None else None
+
+    @property
+    def image(self):
+        return IMAGE_FIELD.attr_class(self, IMAGE_FIELD, self.image_name)
+
+    def __str__(self):
+        return self.excerpt[:15]
+
+    def get_absolute_url(self):
+        return reverse_cached('posts:post_detail', (self.pk,))
+
+
+def make_rows(values):
+    """Строит PostRow из кортежей FIELDS; авторы и группы общие."""
+    authors, groups, rows = {}, {}, []
+    for (pk, excerpt, is_long, pub_date, image, author_id, username,
+         first_name, last_name, group_id, title, slug) in values:
+        author = authors.get(author_id)
+        if author is None:
+            author = authors[author_id] = AuthorRow(
+                author_id, username, first_name, last_name
+            )
+        group = None
+        if group_id is not None:
+            group = groups.get(group_id)
+            if group is None:
+                group = groups[group_id] = GroupRow(group_id, title, slug)
+        rows.append(PostRow(
+            pk, excerpt, is_long, pub_date, image, author, group
+        ))
+    return rows
+
+
+class Rows:
+    """Ленивая последовательность строк поверх QuerySet для Paginator."""
+
+    def __init__(self, queryset):
+        self.queryset = queryset
+
+    @property
+    def ordered(self):
+        return self.queryset.ordered
+
+    def count(self):
+        return self.queryset.count()
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return make_rows(self.queryset.values_list(*FIELDS)[index])
+        return self[index:index + 1][0]
+
+
+def rows_by_ids(ids):
+    """Строки постов с данными id в том же порядке."""
+    position = {pk: number for number, pk in enumerate(ids)}
+    rows = make_rows(
+        Post.objects.filter(pk__in=ids).values_list(*FIELDS).order_by()
+    )
+    return sorted(rows, key=lambda row: position[row.pk])
@@ -0,0 +1,44 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from core.cache.pages import invalidate
+from . import recent
+from .lookups import groups, users
+from .models import Group, Post, User
+
+
+# Отправляется воркером фоновых задач после коммита записи поста.
+post_written = Signal(providing_args=['post', 'created'])
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_index(sender, **kwargs):
+    invalidate('index_page')
+    invalidate('feeds')
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_recent(sender, **kwargs):
+    recent.invalidate()
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_group_lookups(sender, **kwargs):
+    groups.invalidate()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_users(sender, update_fields=None, **kwargs):
+    # Вход пользователя обновляет только last_login, кеши не меняются.
+    if update_fields is None or set(update_fields) != {'last_login'}:
+        recent.invalidate()
+        users.invalidate()
+        invalidate('feeds')
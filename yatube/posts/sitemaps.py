@@ -0,0 +1,254 @@
+"""Статические sitemap-файлы для постов, групп и профилей.
+
+Строки читаются из базы пачками по ключу (keyset), а не через OFFSET,
+и сразу пишутся в файлы-шарды по SITEMAP_SHARD_SIZE адресов рядом
+с gzip-копией, поэтому память не зависит от числа постов. Посты
+упорядочены по (pub_date, pk): новые дописываются в последний шард,
+и при обычной сборке перечитывается только он, начиная с сохранённой
+позиции. Удалённые посты и посты, закоммиченные с датой раньше
+сохранённой позиции, попадают в файлы при полной сборке.
+"""
+import fcntl
+import gzip
+import json
+import os
+from contextlib import contextmanager
+from datetime import datetime
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db.models import Q
+from django.dispatch import receiver
+from django.utils import timezone
+
+from core.reverse import reverse_cached
+from core.tasks import add_job
+from .models import Group, Post, User
+from .signals import post_written
+
+STATE_FILE = 'state.json'
+INDEX_FILE = 'sitemap.xml'
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+NAMESPACE = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+
+class ShardWriter:
+    """Пишет один файл urlset и его .gz через временные файлы."""
+
+    def __init__(self, name, after):
+        self.name = name
+        self.after = after
+        self.count = 0
+        self.lastmod = None
+        self.path = os.path.join(settings.SITEMAP_ROOT, name)
+        self.plain = open(self.path + '.tmp', 'w', encoding='utf-8')
+        self.packed = gzip.open(
+            self.path + '.gz.tmp', 'wt', encoding='utf-8'
+        )
+        self.write(f'{XML_HEADER}<urlset xmlns="{NAMESPACE}">\n')
+
+    def write(self, text):
+        self.plain.write(text)
+        self.packed.write(text)
+
+    def add(self, path, lastmod=None):
+        loc = escape(settings.SITEMAP_BASE_URL + path)
+        entry = f'<url><loc>{loc}</loc>'
+        if lastmod is not None:
+            entry += f'<lastmod>{lastmod.date().isoformat()}</lastmod>'
+            self.lastmod = max(self.lastmod or lastmod, lastmod)
+        self.write(entry + '</url>\n')
+        self.count += 1
+
+    def close(self):
+        self.write('</urlset>\n')
+        self.plain.close()
+        self.packed.close()
+        os.replace(self.path + '.tmp', self.path)
+        os.replace(self.path + '.gz.tmp', self.path + '.gz')
+        return {
+            'name': self.name,
+            'after': self.after,
+            'count': self.count,
+            'lastmod': _dump_key(self.lastmod),
+        }
+
+
+def _dump_key(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        return [_dump_key(item) for item in value]
+    return value
+
+
+def _load_post_key(value):
+    if value is None:
+        return None
+    return (datetime.fromisoformat(value[0]), value[1])
+
+
+def after_key(queryset, key_fields, after):
+    """Строки queryset, у которых key_fields строго больше after."""
+    condition = Q()
+    for position, field in enumerate(key_fields):
+        equal = dict(zip(key_fields[:position], after[:position]))
+        condition |= Q(**equal, **{f'{field}__gt': after[position]})
+    return queryset.filter(condition)
+
+
+def keyset(queryset, key_fields, after=None):
+    """Строки queryset (ключ — первые колонки) пачками по ключу."""
+    queryset = queryset.order_by(*key_fields)
+    while True:
+        page = queryset
+        if after is not None:
+            page = after_key(queryset, key_fields, after)
+        batch = list(page[:settings.SITEMAP_BATCH_SIZE])
+        if not batch:
+            return
+        yield from batch
+        after = batch[-1][:len(key_fields)]
+
+
+def write_shards(prefix, rows, make_entry, first_number=1, after=None):
+    """Раскладывает строки по шардам; возвращает их описания и ключ.
+
+    Ключ — первые две колонки последней строки; нужен только постам.
+    """
+    shards, writer, number = [], None, first_number
+    size = settings.SITEMAP_SHARD_SIZE
+    for row in rows:
+        if writer is not None and writer.count >= size:
+            shards.append(writer.close())
+            writer = None
+        if writer is None:
+            writer = ShardWriter(f'{prefix}-{number:04d}.xml', after)
+            number += 1
+        writer.add(*make_entry(row))
+        after = _dump_key(row[:2])
+    if writer is not None:
+        shards.append(writer.close())
+    return shards, after
+
+
+def _post_entry(row):
+    pub_date, pk = row
+    return reverse_cached('posts:post_detail', (pk,)), pub_date
+
+
+def build_posts(state, full=False):
+    shards = [] if full else state.get('shards', [])
+    watermark = None if full else _load_post_key(state.get('watermark'))
+    rows = Post.objects.values_list('pub_date', 'pk')
+    if watermark is not None and not after_key(
+        rows, ('pub_date', 'pk'), watermark
+    ).exists():
+        return state
+    after = None
+    if shards and shards[-1]['count'] < settings.SITEMAP_SHARD_SIZE:
+        after = shards.pop()['after']
+    elif shards:
+        after = _dump_key(watermark)
+    new_shards, last = write_shards(
+        'posts',
+        keyset(rows, ('pub_date', 'pk'), _load_post_key(after)),
+        _post_entry,
+        first_number=len(shards) + 1,
+        after=after,
+    )
+    return {
+        'shards': shards + new_shards,
+        'watermark': last or _dump_key(watermark),
+    }
+
+
+def build_groups():
+    rows = Group.objects.values_list('pk', 'slug')
+    return write_shards(
+        'groups', keyset(rows, ('pk',)),
+        lambda row: (reverse_cached('posts:group_list', (row[1],)), None),
+    )[0]
+
+
+def build_profiles():
+    rows = User.objects.filter(posts__isnull=False).distinct().values_list(
+        'pk', 'username'
+    )
+    return write_shards(
+        'profiles', keyset(rows, ('pk',)),
+        lambda row: (reverse_cached('posts:profile', (row[1],)), None),
+    )[0]
+
+
+def write_index(shards):
+    now = timezone.now().isoformat()
+    path = os.path.join(settings.SITEMAP_ROOT, INDEX_FILE)
+    entries = ''.join(
+        '<sitemap><loc>{}</loc><lastmod>{}</lastmod></sitemap>\n'.format(
+            escape(
+                settings.SITEMAP_BASE_URL + settings.SITEMAP_URL
+                + shard['name']
+            ),
+            shard['lastmod'] or now,
+        )
+        for shard in shards
+    )
+    content = (
+        f'{XML_HEADER}<sitemapindex xmlns="{NAMESPACE}">\n'
+        f'{entries}</sitemapindex>\n'
+    )
+    for name, opener in ((path, open), (path + '.gz', gzip.open)):
+        with opener(name + '.tmp', 'wt', encoding='utf-8') as file:
+            file.write(content)
+        os.replace(name + '.tmp', name)
+
+
+def remove_stale(shards):
+    keep = {INDEX_FILE, STATE_FILE, '.lock'}
+    for shard in shards:
+        keep.add(shard['name'])
+    for name in os.listdir(settings.SITEMAP_ROOT):
+        if name.endswith('.gz'):
+            name = name[:-3]
+        if name not in keep:
+            path = os.path.join(settings.SITEMAP_ROOT, name)
+            for stale in (path, path + '.gz'):
+                if os.path.exists(stale):
+                    os.remove(stale)
+
+
+@contextmanager
+def _locked():
+    os.makedirs(settings.SITEMAP_ROOT, exist_ok=True)
+    with open(os.path.join(settings.SITEMAP_ROOT, '.lock'), 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+
+def build(full=False):
+    """Пересобирает sitemap-файлы и возвращает число адресов."""
+    with _locked():
+        state_path = os.path.join(settings.SITEMAP_ROOT, STATE_FILE)
+        state = {}
+        if not full and os.path.exists(state_path):
+            with open(state_path) as file:
+                state = json.load(file)
+        posts = build_posts(state.get('posts', {}), full=full)
+        shards = posts['shards'] + build_groups() + build_profiles()
+        write_index(shards)
+        with open(state_path + '.tmp', 'w') as file:
+            json.dump({'posts': posts}, file)
+        os.replace(state_path + '.tmp', state_path)
+        remove_stale(shards)
+    return sum(shard['count'] for shard in shards)
+
+
+@receiver(post_written, sender=Post)
+def schedule_sitemaps(sender, post, created, **kwargs):
+    if created:
+        add_job(
+            'posts.build_sitemaps',
+            key='build_sitemaps',
+            delay=settings.SITEMAP_REBUILD_DELAY,
+        )
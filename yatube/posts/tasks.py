@@ -0,0 +1,37 @@
+from core.tasks import task
+
+from .models import Post
+from .signals import post_written
+
+
+@task('posts.post_written')
+def post_written_task(post_id, created):
+    post = Post.objects.select_related('author', 'group').filter(
+        pk=post_id
+    ).first()
+    if post is not None:
+        post_written.send(sender=Post, post=post, created=created)
+
+
+@task('posts.build_sitemaps')
+def build_sitemaps(full=False):
+    from .sitemaps import build
+    build(full=full)
+
+
+@task('posts.fan_out')
+def fan_out(post_id):
+    from .timeline import fan_out
+    fan_out(post_id)
+
+
+@task('posts.trim_timelines')
+def trim_timelines():
+    from .timeline import trim
+    trim()
+
+
+@task('posts.unpull_author')
+def unpull_author(author_id):
+    from .timeline import unpull
+    unpull(author_id)
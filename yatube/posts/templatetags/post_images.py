@@ -0,0 +1,13 @@
+from django import template
+
+from ..thumbnails import get_pregenerated
+
+
+register = template.Library()
+
+
+@register.filter
+def thumbnail_for(image, size):
+    if not image:
+        return None
+    return get_pregenerated(image, size)
@@ -0,0 +1,34 @@
+"""Тестовые данные для setUpTestData: группы и посты создаются пачкой."""
+from ..models import Group, Post
+
+
+def _last(model, count):
+    # На SQLite bulk_create не возвращает id, перечитываем созданное.
+    return list(model.objects.order_by('-pk')[:count])[::-1]
+
+
+def make_group(slug='test-slug', title='Тестовая группа', **fields):
+    fields.setdefault('description', 'Тестовое описание')
+    return Group.objects.create(slug=slug, title=title, **fields)
+
+
+def make_groups(count, title='Группа', slug='group'):
+    """Группы «<title> 0» … со слагами <slug>-0 …"""
+    Group.objects.bulk_create([
+        Group(
+            title=f'{title} {number}',
+            slug=f'{slug}-{number}',
+            description='Тестовое описание',
+        )
+        for number in range(count)
+    ])
+    return _last(Group, count)
+
+
+def make_posts(author, count, group=None, text='Тестовый пост'):
+    """Посты «<text> 0» … в порядке создания."""
+    Post.objects.bulk_create([
+        Post(text=f'{text} {number}', author=author, group=group)
+        for number in range(count)
+    ])
+    return _last(Post, count)
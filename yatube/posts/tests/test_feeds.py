@@ -0,0 +1,97 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from ..models import Group, Post
+
+User = get_user_model()
+
+
+class FeedTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='auth')
+        cls.other = User.objects.create_user(username='other')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user, group=cls.group, text='Пост в группе'
+        )
+        Post.objects.create(author=cls.other, text='Пост без группы')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_feeds_list_their_posts(self):
+        """Каждая лента содержит только свои посты."""
+        feeds = {
+            reverse('posts:index_rss'): ('Пост в группе', 'Пост без группы'),
+            reverse('posts:group_rss', args=('test-slug',)): (
+                'Пост в группе',
+            ),
+            reverse('posts:profile_atom', args=('other',)): (
+                'Пост без группы',
+            ),
+        }
+        for url, texts in feeds.items():
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                content = response.content.decode()
+                for text in ('Пост в группе', 'Пост без группы'):
+                    self.assertEqual(text in content, text in texts)
+
+    def test_item_links_are_absolute(self):
+        """Ссылки записей ведут на полные адреса постов."""
+        response = self.client.get(reverse('posts:index_atom'))
+        self.assertContains(
+            response, f'http://testserver/posts/{self.post.pk}/'
+        )
+
+    def test_feed_content_types(self):
+        """RSS и Atom отдаются со своими типами."""
+        rss = self.client.get(reverse('posts:index_rss'))
+        atom = self.client.get(
+            reverse('posts:group_atom', args=('test-slug',))
+        )
+        self.assertTrue(rss['Content-Type'].startswith('application/rss+xml'))
+        self.assertTrue(
+            atom['Content-Type'].startswith('application/atom+xml')
+        )
+
+    def test_unknown_object_404(self):
+        """Лента несуществующей группы или автора — 404."""
+        for url in (
+            reverse('posts:group_rss', args=('missing',)),
+            reverse('posts:profile_rss', args=('missing',)),
+        ):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_conditional_requests(self):
+        """Повторный опрос с ETag или Last-Modified получает 304."""
+        url = reverse('posts:profile_rss', args=('auth',))
+        response = self.client.get(url)
+        with self.assertNumQueries(0):
+            by_etag = self.client.get(
+                url, HTTP_IF_NONE_MATCH=response['ETag']
+            )
+            by_date = self.client.get(
+                url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+            )
+        self.assertEqual(by_etag.status_code, 304)
+        self.assertEqual(by_date.status_code, 304)
+
+    def test_new_post_invalidates_feed(self):
+        """Новый пост сразу попадает в ленту, старый ETag не подходит."""
+        url = reverse('posts:group_rss', args=('test-slug',))
+        etag = self.client.get(url)['ETag']
+        Post.objects.create(
+            author=self.user, group=self.group, text='Свежий пост'
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Свежий пост')
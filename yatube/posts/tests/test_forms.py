@@ -1,25 +1,37 @@
+import shutil
+import tempfile
 from http import HTTPStatus
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.test import Client, TestCase
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, TestCase, override_settings
 from django.urls import reverse
 
+from ..forms import PostForm
 from ..models import Group, Post
+from .factories import make_group, make_groups
 
 User = get_user_model()
 
+TEMP_MEDIA_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
+
 
 class PostFormsTest(TestCase):
     @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
+    def setUpTestData(cls):
         cls.author = User.objects.create_user(username='auth')
-        cls.group = Group.objects.create(
-            title='Тестовое название',
-            description='Тестовое описание',
-            slug='test-slug',
-        )
+        cls.group = make_group(title='Тестовое название')
         cls.post = Post.objects.create(
             author=cls.author,
             text='Тестовая пост1234',
@@ -102,3 +114,105 @@ class PostFormsTest(TestCase):
         self.assertNotEqual(post.text, form_data['text'])
         response = self.client.get(reverse('posts:index'))
         self.assertEqual(len(response.context['page_obj']), post_count)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class PostImageFormTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='auth')
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.authorized_author = Client()
+        self.authorized_author.force_login(self.author)
+
+    def test_create_post_with_image(self):
+        """Пост с картинкой сохраняется, картинка видна на странице."""
+        uploaded = SimpleUploadedFile(
+            name='small.gif',
+            content=SMALL_GIF,
+            content_type='image/gif'
+        )
+        self.authorized_author.post(
+            reverse('posts:post_create'),
+            data={'text': 'Пост с картинкой', 'image': uploaded},
+            follow=True
+        )
+        post = Post.objects.get(text='Пост с картинкой')
+        self.assertEqual(post.image.name, 'posts/small.gif')
+        response = self.authorized_author.get(
+            reverse('posts:post_detail', args=(post.id,))
+        )
+        self.assertContains(response, post.image.url)
+
+
+class GroupChoicesTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='auth')
+        cls.groups = make_groups(3)
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_author = Client()
+        self.authorized_author.force_login(self.author)
+
+    def test_choices_cached(self):
+        """Список групп формы берётся из кеша"""
+        self.assertEqual(len(list(PostForm().fields['group'].choices)), 4)
+        with self.assertNumQueries(0):
+            choices = list(PostForm().fields['group'].choices)
+        self.assertEqual(choices[1], (self.groups[0].pk, 'Группа 0'))
+
+    def test_long_choices_render_without_queries(self):
+        """Сотня длинных названий групп не требует запросов при выводе"""
+        make_groups(
+            97, title='Группа с очень длинным названием для проверки',
+            slug='long',
+        )
+        list(PostForm().fields['group'].choices)
+        with self.assertNumQueries(0):
+            form = PostForm()
+            str(form['group'])
+            str(form['group'])
+        self.assertEqual(len(form.fields['group'].choices), 101)
+
+    def test_choices_invalidated_on_group_change(self):
+        """Изменение группы сбрасывает кеш списка"""
+        list(PostForm().fields['group'].choices)
+        self.groups[0].title = 'Переименованная'
+        self.groups[0].save()
+        labels = [label for _, label in PostForm().fields['group'].choices]
+        self.assertIn('Переименованная', labels)
+
+    @override_settings(GROUP_CHOICES_LIMIT=2)
+    def test_many_groups_render_selected_only(self):
+        """При большом числе групп выводится только выбранная"""
+        form = PostForm(initial={'group': self.groups[1].pk})
+        self.assertEqual(
+            list(form.fields['group'].choices),
+            [('', '---------'), (self.groups[1].pk, 'Группа 1')],
+        )
+        self.assertIn('data-autocomplete', str(form['group']))
+        form = PostForm(data={'text': 'Текст', 'group': self.groups[2].pk})
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data['group'], self.groups[2])
+
+    def test_group_autocomplete(self):
+        """Автодополнение ищет группы по началу названия"""
+        Group.objects.create(
+            title='Другая', slug='other', description='Описание'
+        )
+        response = self.authorized_author.get(
+            reverse('posts:group_autocomplete'), {'q': 'Груп'}
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(
+            [group['title'] for group in response.json()['results']],
+            ['Группа 0', 'Группа 1', 'Группа 2'],
+        )
@@ -1,15 +1,16 @@
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.urls import reverse
 
 from ..models import Group, Post
+from ..rows import Rows
 
 User = get_user_model()
 
 
 class PostModelTest(TestCase):
     @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
+    def setUpTestData(cls):
         cls.user = User.objects.create_user(username='auth')
         cls.group = Group.objects.create(
             title='Тестовая группа123',
@@ -35,3 +36,77 @@ class PostModelTest(TestCase):
         # post_text15 = post._meta.get_field('text'[:15])
         expected_object_name = self.post.text[:15]
         self.assertEqual(expected_object_name, 'Тестовая пост1234'[:15])
+
+
+@override_settings(POST_EXCERPT_LENGTH=20, POST_COMPRESS_MIN_LENGTH=100)
+class PostExcerptTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='auth')
+
+    def test_short_post_excerpt(self):
+        """Отрывок короткого поста совпадает с текстом"""
+        post = Post.objects.create(author=self.user, text='Короткий пост')
+        self.assertEqual(post.excerpt, 'Короткий пост')
+        self.assertFalse(post.is_long)
+
+    def test_long_post_excerpt(self):
+        """У длинного поста сохраняется обрезанный отрывок"""
+        post = Post.objects.create(author=self.user, text='Слово ' * 10)
+        self.assertTrue(post.is_long)
+        self.assertEqual(len(post.excerpt), 20)
+        row = Rows(Post.objects.filter(pk=post.pk))[0]
+        self.assertEqual(row.excerpt, post.excerpt)
+        self.assertEqual(row.text, post.text)
+
+    def test_large_text_compressed(self):
+        """Очень длинный текст хранится сжатым и читается целиком"""
+        text = 'Очень длинный пост. ' * 50
+        post = Post.objects.create(author=self.user, text=text)
+        self.assertEqual(post.text, text)
+        stored = Post.objects.filter(pk=post.pk).values_list(
+            'text', 'text_compressed'
+        ).get()
+        self.assertEqual(stored[0], '')
+        self.assertLess(len(stored[1]), len(text.encode()))
+        self.assertEqual(Post.objects.get(pk=post.pk).text, text)
+        deferred = Post.objects.defer('text').get(pk=post.pk)
+        self.assertEqual(deferred.text, text)
+
+    def test_compressed_post_found_in_admin(self):
+        """Админка находит сжатый пост по отрывку и берёт автора JOIN-ом"""
+        post = Post.objects.create(
+            author=self.user, text='Очень длинный пост. ' * 50
+        )
+        admin = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        self.client.force_login(admin)
+        response = self.client.get(
+            reverse('admin:posts_post_changelist'), {'q': 'длинный'}
+        )
+        changelist = response.context['cl']
+        self.assertEqual(list(changelist.result_list), [post])
+        # Автор и группа строк приходят тем же запросом, без N+1.
+        self.assertEqual(
+            set(changelist.queryset.query.select_related), {'group', 'author'}
+        )
+
+    def test_admin_changelist_queries(self):
+        """Список постов в админке: отрывки и число запросов без N+1"""
+        text = 'Очень длинный пост. ' * 50
+        Post.objects.bulk_create(
+            Post(author=self.user, text=text) for _ in range(20)
+        )
+        Group.objects.create(title='Группа', slug='group')
+        admin = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password'
+        )
+        self.client.force_login(admin)
+        url = reverse('admin:posts_post_changelist')
+        # Сессия, пользователь, два COUNT постов, группы для
+        # list_editable и сами строки — независимо от их числа.
+        with self.assertNumQueries(9):
+            response = self.client.get(url)
+        self.assertContains(response, Post.objects.first().excerpt)
+        self.assertNotContains(response, text)
@@ -0,0 +1,130 @@
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import OperationalError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .. import counters
+from ..models import Group, Post, PostViews
+from ..popular import popular_ids
+
+User = get_user_model()
+
+
+@override_settings(VIEW_COUNTS_FLUSH_INTERVAL=3600)
+class PostViewsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.grouped = Post.objects.create(
+            author=cls.user, group=cls.group, text='В группе'
+        )
+        cls.single = Post.objects.create(author=cls.user, text='Без группы')
+
+    def setUp(self):
+        cache.clear()
+        counters.reset()
+        self.addCleanup(counters.reset)
+
+    def view(self, post, times=1):
+        for _ in range(times):
+            counters.record_view(post.pk)
+
+    def test_flush_upserts_counts(self):
+        """Просмотры копятся в памяти и дописываются в базу пачкой."""
+        self.view(self.grouped, 3)
+        self.assertFalse(PostViews.objects.exists())
+        self.assertEqual(counters.views_count(self.grouped.pk), 3)
+        # Точка сохранения, чтение отметок, upsert, снятие точки.
+        with self.assertNumQueries(4):
+            self.assertEqual(counters.flush(), 1)
+        self.view(self.grouped, 2)
+        self.view(self.single)
+        self.assertEqual(counters.flush(), 2)
+        self.assertEqual(
+            dict(PostViews.objects.values_list('post_id', 'count')),
+            {self.grouped.pk: 5, self.single.pk: 1},
+        )
+
+    def test_failed_flush_keeps_views(self):
+        """Занятая база не роняет страницу: просмотры ждут следующей записи."""
+        self.view(self.single, 2)
+        with mock.patch.object(
+            counters, '_upsert_sql',
+            side_effect=OperationalError('database is locked'),
+        ), self.assertLogs('posts.counters', 'WARNING'):
+            self.assertEqual(counters.flush(), 0)
+        self.assertEqual(counters.views_count(self.single.pk), 2)
+        self.assertEqual(counters.flush(), 1)
+        self.assertEqual(PostViews.objects.get().count, 2)
+
+    @override_settings(VIEW_COUNTS_FLUSH_INTERVAL=0.2)
+    def test_views_flushed_in_background(self):
+        """Просмотры сохраняются по таймеру, без следующего просмотра."""
+        flushed = threading.Event()
+        threads = []
+
+        def fake_flush():
+            threads.append(threading.current_thread().name)
+            flushed.set()
+
+        with mock.patch.object(counters, '_flusher', None), \
+                mock.patch.object(counters, '_last_flush', time.monotonic()), \
+                mock.patch.object(counters, 'flush', side_effect=fake_flush):
+            self.view(self.single)
+            self.assertTrue(flushed.wait(5))
+        self.assertEqual(threads[0], 'view-counts')
+
+    def test_deleted_post_skipped(self):
+        """Просмотры удалённого поста не ломают сохранение."""
+        post = Post.objects.create(author=self.user, text='Удалённый')
+        self.view(post)
+        post.delete()
+        self.assertEqual(counters.flush(), 0)
+
+    def test_score_decays(self):
+        """Старые просмотры весят меньше новых."""
+        self.view(self.grouped, 10)
+        counters.flush()
+        PostViews.objects.update(
+            score_at=timezone.now() - timedelta(hours=12)
+        )
+        self.view(self.grouped)
+        counters.flush()
+        score = PostViews.objects.get().score
+        self.assertAlmostEqual(score, 10 * 0.25 + 1, places=2)
+
+    def test_popular_lists(self):
+        """Списки популярного — по сайту и отдельно по группе."""
+        self.view(self.single, 3)
+        self.view(self.grouped, 2)
+        counters.flush()
+        self.assertEqual(
+            popular_ids(), [self.single.pk, self.grouped.pk]
+        )
+        self.assertEqual(popular_ids(self.group.pk), [self.grouped.pk])
+        response = self.client.get(
+            reverse('posts:group_popular', args=('test-slug',))
+        )
+        self.assertEqual(
+            [post.pk for post in response.context['posts']],
+            [self.grouped.pk],
+        )
+
+    def test_post_detail_counts_views(self):
+        """Страница поста учитывает просмотр и показывает их число."""
+        url = reverse('posts:post_detail', args=(self.single.pk,))
+        self.client.get(url)
+        response = self.client.get(url)
+        self.assertEqual(response.context['views'], 2)
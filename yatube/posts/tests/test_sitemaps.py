@@ -0,0 +1,107 @@
+import gzip
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from ..models import Group, Post
+from ..sitemaps import build
+
+User = get_user_model()
+
+SITEMAP_ROOT = tempfile.mkdtemp(dir=settings.BASE_DIR)
+
+
+@override_settings(
+    SITEMAP_ROOT=SITEMAP_ROOT,
+    SITEMAP_SHARD_SIZE=3,
+    SITEMAP_BATCH_SIZE=2,
+    SITEMAP_BASE_URL='http://testserver',
+)
+class SitemapTest(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(SITEMAP_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        shutil.rmtree(SITEMAP_ROOT, ignore_errors=True)
+        self.user = User.objects.create_user(username='auth')
+        self.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        self.posts = [
+            Post.objects.create(
+                text=f'Пост {number}', author=self.user, group=self.group
+            )
+            for number in range(5)
+        ]
+
+    def read(self, name):
+        with open(os.path.join(SITEMAP_ROOT, name), encoding='utf-8') as f:
+            return f.read()
+
+    def test_shards_and_index(self):
+        """Все адреса разложены по шардам, индекс ссылается на каждый"""
+        self.assertEqual(build(), 7)
+        first = self.read('posts-0001.xml')
+        second = self.read('posts-0002.xml')
+        self.assertEqual(first.count('<url>'), 3)
+        self.assertEqual(second.count('<url>'), 2)
+        for post in self.posts:
+            self.assertIn(
+                f'http://testserver/posts/{post.pk}/', first + second
+            )
+        self.assertIn('/group/test-slug/', self.read('groups-0001.xml'))
+        self.assertIn('/profile/auth/', self.read('profiles-0001.xml'))
+        index = self.read('sitemap.xml')
+        for name in ('posts-0001', 'posts-0002', 'groups-0001'):
+            self.assertIn(f'http://testserver/sitemaps/{name}.xml', index)
+        with gzip.open(os.path.join(SITEMAP_ROOT, 'posts-0001.xml.gz')) as f:
+            self.assertEqual(f.read().decode(), first)
+
+    def test_incremental_build_appends(self):
+        """Новые посты дописываются, полные шарды не переписываются"""
+        build()
+        full_shard = os.path.join(SITEMAP_ROOT, 'posts-0001.xml')
+        mtime = os.stat(full_shard).st_mtime_ns
+        new_posts = [
+            Post.objects.create(text=f'Новый {number}', author=self.user)
+            for number in range(2)
+        ]
+        self.assertEqual(build(), 9)
+        self.assertEqual(os.stat(full_shard).st_mtime_ns, mtime)
+        self.assertEqual(self.read('posts-0002.xml').count('<url>'), 3)
+        self.assertIn(
+            f'/posts/{new_posts[1].pk}/', self.read('posts-0003.xml')
+        )
+
+    def test_full_build_drops_deleted(self):
+        """Полная сборка убирает удалённые посты и лишние шарды"""
+        build()
+        for post in self.posts[:3]:
+            post.delete()
+        build(full=True)
+        self.assertNotIn(
+            f'/posts/{self.posts[0].pk}/', self.read('posts-0001.xml')
+        )
+        self.assertFalse(
+            os.path.exists(os.path.join(SITEMAP_ROOT, 'posts-0002.xml'))
+        )
+
+    def test_served_compressed(self):
+        """Sitemap отдаётся статикой, в том числе сжатым"""
+        build()
+        response = self.client.get('/sitemap.xml', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        response = self.client.get('/sitemaps/posts-0002.xml')
+        self.assertIn(b'<urlset', b''.join(response.streaming_content))
+        self.assertEqual(
+            self.client.get('/sitemaps/state.json').status_code, 404
+        )
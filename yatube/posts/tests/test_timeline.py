@@ -0,0 +1,130 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core.models import Job
+from ..models import Follow, Post, PulledAuthor, TimelineEntry
+from ..timeline import Timeline, fan_out, follow, trim, unfollow, unpull
+
+User = get_user_model()
+
+
+class TimelineTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.reader = User.objects.create_user(username='reader')
+        cls.author = User.objects.create_user(username='author')
+        cls.stranger = User.objects.create_user(username='stranger')
+        cls.old_post = Post.objects.create(author=cls.author, text='Старый')
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(self.reader)
+
+    def feed_ids(self, user=None):
+        timeline = Timeline((user or self.reader).pk)
+        return [row.pk for row in timeline[:timeline.count()]]
+
+    def test_follow_backfills_and_unfollow_clears(self):
+        """Подписка добавляет посты автора в ленту, отписка убирает."""
+        self.assertTrue(follow(self.reader, self.author))
+        self.assertFalse(follow(self.reader, self.reader))
+        self.assertEqual(self.feed_ids(), [self.old_post.pk])
+        unfollow(self.reader, self.author)
+        self.assertEqual(self.feed_ids(), [])
+        self.assertFalse(Follow.objects.exists())
+
+    def test_fan_out_to_followers_only(self):
+        """Новый пост попадает в ленты подписчиков, но не остальных."""
+        follow(self.reader, self.author)
+        post = Post.objects.create(author=self.author, text='Новый')
+        self.assertEqual(fan_out(post.pk), 1)
+        self.assertEqual(self.feed_ids(), [post.pk, self.old_post.pk])
+        self.assertEqual(self.feed_ids(self.stranger), [])
+
+    @override_settings(TIMELINE_FANOUT_MAX_FOLLOWERS=2)
+    def test_popular_author_merged_on_read(self):
+        """Посты автора с множеством подписчиков подмешиваются при чтении."""
+        follow(self.reader, self.author)
+        follow(self.stranger, self.author)
+        other = User.objects.create_user(username='other')
+        follow(self.reader, other)
+        post = Post.objects.create(author=self.author, text='Новый')
+        self.assertEqual(fan_out(post.pk), 0)
+        self.assertTrue(
+            PulledAuthor.objects.filter(author=self.author).exists()
+        )
+        self.assertFalse(TimelineEntry.objects.filter(post=post).exists())
+        other_post = Post.objects.create(author=other, text='Другой')
+        fan_out(other_post.pk)
+        self.assertEqual(
+            self.feed_ids(), [other_post.pk, post.pk, self.old_post.pk]
+        )
+        self.assertEqual(Timeline(self.reader.pk).count(), 3)
+
+    def test_overlapping_streams_counted_once(self):
+        """Пост и в ленте, и среди подмешиваемых учитывается один раз."""
+        follow(self.reader, self.author)
+        post = Post.objects.create(author=self.author, text='Новый')
+        fan_out(post.pk)
+        PulledAuthor.objects.create(author=self.author, since=post.pub_date)
+        timeline = Timeline(self.reader.pk)
+        self.assertEqual(timeline.count(), 2)
+        self.assertEqual(self.feed_ids(), [post.pk, self.old_post.pk])
+
+    @override_settings(TIMELINE_FANOUT_MAX_FOLLOWERS=2)
+    def test_unpull_after_unfollow(self):
+        """Когда подписчиков снова мало, посты автора раскладываются."""
+        follow(self.reader, self.author)
+        follow(self.stranger, self.author)
+        post = Post.objects.create(author=self.author, text='Новый')
+        fan_out(post.pk)
+        unfollow(self.stranger, self.author)
+        self.assertTrue(
+            Job.objects.filter(name='posts.unpull_author').exists()
+        )
+        self.assertEqual(unpull(self.author.pk), 1)
+        self.assertFalse(PulledAuthor.objects.exists())
+        self.assertTrue(
+            TimelineEntry.objects.filter(user=self.reader, post=post).exists()
+        )
+        self.assertEqual(self.feed_ids(), [post.pk, self.old_post.pk])
+        self.assertEqual(Timeline(self.reader.pk).count(), 2)
+
+    @override_settings(TIMELINE_LENGTH=2)
+    def test_trim_keeps_newest(self):
+        """Лента обрезается до TIMELINE_LENGTH самых новых записей."""
+        follow(self.reader, self.author)
+        posts = [
+            Post.objects.create(author=self.author, text=f'Пост {number}')
+            for number in range(3)
+        ]
+        for post in posts:
+            fan_out(post.pk)
+        self.assertEqual(trim(), 2)
+        self.assertEqual(self.feed_ids(), [posts[2].pk, posts[1].pk])
+
+    def test_follow_views(self):
+        """Подписка идёт только POST-запросом, лента видна подписчику."""
+        url = reverse('posts:profile_follow', args=('author',))
+        self.assertEqual(self.client.get(url).status_code, 405)
+        self.client.post(url)
+        self.assertTrue(
+            Follow.objects.filter(user=self.reader, author=self.author)
+            .exists()
+        )
+        response = self.client.get(reverse('posts:follow_index'))
+        self.assertEqual(
+            list(response.context['page_obj']), [self.old_post]
+        )
+        profile = self.client.get(reverse('posts:profile', args=('author',)))
+        self.assertTrue(profile.context['following'])
+        self.client.post(
+            reverse('posts:profile_unfollow', args=('author',))
+        )
+        self.assertFalse(Follow.objects.exists())
+
+    def test_follow_index_requires_login(self):
+        """Анонима лента подписок отправляет на страницу входа."""
+        response = Client().get(reverse('posts:follow_index'))
+        self.assertEqual(response.status_code, 302)
@@ -4,21 +4,20 @@ from django.contrib.auth import get_user_model
 from django.test import TestCase, Client
 from django.urls import reverse
 
-from ..models import Post, Group
+from ..models import Post
+from .factories import make_group
 
 User = get_user_model()
 
 
 class FirstAccess(TestCase):
     @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
+    def setUpTestData(cls):
         cls.user = User.objects.create_user(username='auth')
         cls.author = User.objects.create_user(username='auth2')
         # cls.author = User.objects.get(username='auth')
-        cls.group = Group.objects.create(
-            title='Тестовая группа123',
-            slug='testslug',
+        cls.group = make_group(
+            'testslug', 'Тестовая группа123',
             description='Тестовое описание123',
         )
         cls.post = Post.objects.create(
@@ -1,10 +1,21 @@
+import shutil
+
 from django.contrib.auth import get_user_model
-from django.test import Client, TestCase
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, TestCase, override_settings
 from django.urls import reverse
 from django import forms
 
 from ..forms import PostForm
 from ..models import Group, Post
+from ..lookups import groups, users
+from ..recent import recent_posts
+from ..rows import PostRow, Rows
+from ..tasks import post_written_task
+from ..thumbnails import get_pregenerated
+from .factories import make_group, make_posts
+from .test_forms import SMALL_GIF, TEMP_MEDIA_ROOT
 from yatube import settings
 
 User = get_user_model()
@@ -13,14 +24,11 @@ User = get_user_model()
 class CorrectTemplateTests(TestCase):
 
     @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
+    def setUpTestData(cls):
         cls.user = User.objects.create_user(username='auth')
         cls.author = User.objects.get(username='auth')
-        cls.group = Group.objects.create(
-            title='Тестовая группа123',
-            slug='test-slug',
-            description='Тестовое описание123',
+        cls.group = make_group(
+            title='Тестовая группа123', description='Тестовое описание123'
         )
         cls.post = Post.objects.create(
             author=cls.author,
@@ -125,24 +133,13 @@ class CorrectTemplateTests(TestCase):
 
 class PaginatorViewsTest(TestCase):
     @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
+    def setUpTestData(cls):
         cls.user = User.objects.create_user(username='auth')
         cls.author = User.objects.get(username='auth')
-        cls.group = Group.objects.create(
-            title='Тестовая группа123',
-            slug='test-slug',
-            description='Тестовое описание123',
+        cls.group = make_group(
+            title='Тестовая группа123', description='Тестовое описание123'
         )
-        cls.posts = [
-            Post(
-                text=f'Тестовый пост {number_post}',
-                author=cls.user,
-                group=cls.group,
-            )
-            for number_post in range(settings.SORT13)
-        ]
-        Post.objects.bulk_create(cls.posts)
+        cls.posts = make_posts(cls.user, settings.SORT13, cls.group)
 
     def setUp(self):
         self.authorized_author = Client()
@@ -168,3 +165,191 @@ class PaginatorViewsTest(TestCase):
                             reverse(address, args=args) + page
                         )
         self.assertEqual(len(response.context['page_obj']), units)
+
+
+@override_settings(MEDIA_ROOT=TEMP_MEDIA_ROOT)
+class PostThumbnailTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='auth')
+        cls.post = Post.objects.create(
+            author=cls.user,
+            text='Пост с картинкой',
+            image=SimpleUploadedFile(
+                name='thumb.gif',
+                content=SMALL_GIF,
+                content_type='image/gif'
+            )
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEMP_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_thumbnails_pregenerated_in_background(self):
+        """Миниатюры создаются воркером, а не при рендере страницы."""
+        self.assertIsNone(get_pregenerated(self.post.image, 'card'))
+        self.client.get(reverse('posts:index'))
+        self.assertIsNone(get_pregenerated(self.post.image, 'card'))
+        post_written_task(self.post.id, True)
+        thumbnail = get_pregenerated(self.post.image, 'card')
+        self.assertEqual((thumbnail.width, thumbnail.height), (960, 339))
+        response = self.client.get(reverse('posts:index'))
+        self.assertContains(response, thumbnail.url)
+        self.assertContains(response, 'width="960" height="339"')
+
+    def test_thumbnail_served_with_cache_headers(self):
+        """Миниатюры отдаются с бессрочным кешированием."""
+        post_written_task(self.post.id, True)
+        thumbnail = get_pregenerated(self.post.image, 'detail')
+        response = self.client.get(thumbnail.url)
+        self.assertIn('immutable', response['Cache-Control'])
+        response = self.client.get(self.post.image.url)
+        self.assertNotIn('immutable', response['Cache-Control'])
+
+
+class RecentPostsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = make_group()
+        make_posts(cls.user, settings.SORT13, cls.group)
+
+    def setUp(self):
+        cache.clear()
+        recent_posts.prime()
+
+    def test_first_page_without_queries(self):
+        """Первая страница главной отдаётся из буфера без запросов"""
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('posts:index'))
+        page_obj = response.context['page_obj']
+        self.assertEqual(len(page_obj), settings.SORT10)
+        self.assertEqual(page_obj[0], Post.objects.first())
+        self.assertEqual(page_obj[0].author, self.user)
+        self.assertEqual(page_obj.paginator.count, settings.SORT13)
+
+    def test_buffer_reloaded_after_new_post(self):
+        """Новый пост сразу появляется на главной"""
+        post = Post.objects.create(text='Новый пост', author=self.user)
+        response = self.client.get(reverse('posts:index'))
+        self.assertEqual(response.context['page_obj'][0], post)
+        self.assertEqual(
+            response.context['page_obj'].paginator.count,
+            settings.SORT13 + 1,
+        )
+
+    def test_pages_beyond_buffer_from_db(self):
+        """Страницы за пределами буфера берутся из базы"""
+        recent_posts.size = settings.SORT10
+        self.addCleanup(
+            setattr, recent_posts, 'size',
+            settings.SORT10 * settings.RECENT_POSTS_PAGES,
+        )
+        recent_posts.prime()
+        self.assertIsNone(recent_posts.page(2))
+        response = self.client.get(reverse('posts:index') + '?page=2')
+        self.assertEqual(
+            len(response.context['page_obj']),
+            settings.SORT13 - settings.SORT10,
+        )
+
+
+class LookupCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='auth')
+        self.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+
+    def test_lookup_hits_db_once(self):
+        """Повторный поиск группы и автора не обращается к базе"""
+        self.assertEqual(groups.get('test-slug'), self.group)
+        self.assertEqual(users.get('auth'), self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(groups.get('test-slug'), self.group)
+            self.assertEqual(users.get('auth'), self.user)
+
+    def test_missing_cached_until_created(self):
+        """Промах кешируется и сбрасывается при создании объекта"""
+        self.assertIsNone(groups.get('new-slug'))
+        with self.assertNumQueries(0):
+            self.assertIsNone(groups.get('new-slug'))
+        group = Group.objects.create(
+            title='Новая группа', slug='new-slug', description='Описание'
+        )
+        self.assertEqual(groups.get('new-slug'), group)
+
+    def test_rename_and_delete_invalidate(self):
+        """Переименование и удаление сбрасывают кеш"""
+        groups.get('test-slug')
+        self.group.slug = 'renamed'
+        self.group.save()
+        self.assertIsNone(groups.get('test-slug'))
+        self.assertEqual(groups.get('renamed'), self.group)
+        users.get('auth')
+        self.user.delete()
+        response = self.client.get(
+            reverse('posts:profile', args=('auth',))
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_post_detail_relations_from_cache(self):
+        """Автор и группа поста берутся из кеша поиска"""
+        post = Post.objects.create(
+            text='Тестовый пост', author=self.user, group=self.group
+        )
+        self.client.get(reverse('posts:post_detail', args=(post.pk,)))
+        response = self.client.get(
+            reverse('posts:post_detail', args=(post.pk,))
+        )
+        self.assertEqual(response.context['post'].author, self.user)
+        self.assertEqual(response.context['post'].group, self.group)
+
+
+class PostRowsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='auth', first_name='Имя', last_name='Фамилия'
+        )
+        cls.group = make_group()
+        cls.post = Post.objects.create(
+            text='Тестовый пост', author=cls.user, group=cls.group
+        )
+        cls.post_without_group = Post.objects.create(
+            text='Пост без группы', author=cls.user
+        )
+
+    def test_rows_match_models(self):
+        """Строки ленты совпадают с моделями по данным и ключам"""
+        rows = Rows(Post.objects.all())[:2]
+        self.assertIsInstance(rows[0], PostRow)
+        self.assertEqual(rows, [self.post_without_group, self.post])
+        self.assertEqual(rows[1].author, self.user)
+        self.assertEqual(rows[1].author.get_full_name(), 'Имя Фамилия')
+        self.assertEqual(rows[1].group, self.group)
+        self.assertEqual(str(rows[1].group), self.group.title)
+        self.assertIsNone(rows[0].group)
+        self.assertIs(rows[0].author, rows[1].author)
+        self.assertFalse(rows[0].image)
+
+    def test_group_page_queries(self):
+        """Страница группы строится из строк за фиксированное число запросов"""
+        for number in range(settings.SORT10):
+            Post.objects.create(
+                text=f'Пост {number}', author=self.user, group=self.group
+            )
+        groups.get(self.group.slug)
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                reverse('posts:group_list', args=(self.group.slug,))
+            )
+        self.assertIsInstance(response.context['page_obj'][0], PostRow)
@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.dispatch import receiver
+from sorl.thumbnail import default
+from sorl.thumbnail.base import ThumbnailBackend
+from sorl.thumbnail.conf import defaults as default_settings
+from sorl.thumbnail.conf import settings as thumbnail_settings
+from sorl.thumbnail.images import ImageFile
+
+from core.cache.pages import invalidate
+from .models import Post
+from .signals import post_written
+
+
+class PregeneratedThumbnailBackend(ThumbnailBackend):
+    def get_cached(self, file_, geometry_string, **options):
+        """Ищет готовую миниатюру только в kvstore.
+
+        В отличие от get_thumbnail не обращается к хранилищу
+        и ничего не генерирует, если миниатюры ещё нет.
+        """
+        source = ImageFile(file_)
+        if thumbnail_settings.THUMBNAIL_PRESERVE_FORMAT:
+            options.setdefault('format', self._get_format(source))
+        for key, value in self.default_options.items():
+            options.setdefault(key, value)
+        for key, attr in self.extra_options:
+            value = getattr(thumbnail_settings, attr)
+            if value != getattr(default_settings, attr):
+                options.setdefault(key, value)
+        name = self._get_thumbnail_filename(source, geometry_string, options)
+        return default.kvstore.get(ImageFile(name, default.storage))
+
+
+def get_pregenerated(image, size):
+    geometry, options = settings.POST_THUMBNAILS[size]
+    return default.backend.get_cached(image, geometry, **options)
+
+
+def generate(image):
+    for geometry, options in settings.POST_THUMBNAILS.values():
+        default.backend.get_thumbnail(image, geometry, **options)
+
+
+@receiver(post_written, sender=Post)
+def make_thumbnails(sender, post, **kwargs):
+    if post.image:
+        generate(post.image)
+        invalidate('index_page')
@@ -0,0 +1,219 @@
+"""Ленты подписок: раскладка постов при записи и слияние при чтении.
+
+Новый пост фоновой задачей раскладывается по лентам всех подписчиков
+автора (TimelineEntry), поэтому чтение ленты — один запрос по индексу
+(user, -pub_date), а не IN по тысячам авторов. Авторы, у которых
+подписчиков больше TIMELINE_FANOUT_MAX_FOLLOWERS, с этого момента
+не раскладываются (PulledAuthor): их свежие посты подмешиваются при
+чтении. Когда подписчиков снова меньше порога (после отписок),
+задача unpull возвращает автору раскладку. Длина ленты ограничена
+TIMELINE_LENGTH, лишнее удаляет отложенная задача.
+"""
+import heapq
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+from django.dispatch import receiver
+
+from core.tasks import add_job
+from .models import Follow, Post, PulledAuthor, TimelineEntry
+from .rows import rows_by_ids
+from .signals import post_written
+
+
+def _entry(post, user_id):
+    return TimelineEntry(
+        user_id=user_id,
+        post_id=post['pk'],
+        author_id=post['author_id'],
+        pub_date=post['pub_date'],
+    )
+
+
+def fan_out(post_id):
+    """Раскладывает пост по лентам подписчиков; возвращает их число."""
+    post = Post.objects.filter(pk=post_id).values(
+        'pk', 'author_id', 'pub_date'
+    ).first()
+    if post is None:
+        return 0
+    author_id = post['author_id']
+    if PulledAuthor.objects.filter(author_id=author_id).exists():
+        return 0
+    followers = Follow.objects.filter(author_id=author_id)
+    if followers.count() >= settings.TIMELINE_FANOUT_MAX_FOLLOWERS:
+        PulledAuthor.objects.get_or_create(
+            author_id=author_id, defaults={'since': post['pub_date']}
+        )
+        return 0
+    return _write([post], followers)
+
+
+def _write(posts, followers):
+    """Раскладывает посты по лентам подписчиков; возвращает их число."""
+    written, after = 0, 0
+    size = max(1, settings.TIMELINE_BATCH_SIZE // len(posts))
+    while True:
+        user_ids = list(followers.filter(user_id__gt=after).order_by(
+            'user_id'
+        ).values_list('user_id', flat=True)[:size])
+        if not user_ids:
+            break
+        TimelineEntry.objects.bulk_create(
+            [_entry(post, user_id) for user_id in user_ids for post in posts],
+            ignore_conflicts=True,
+        )
+        written += len(user_ids)
+        after = user_ids[-1]
+    if written:
+        add_job(
+            'posts.trim_timelines',
+            key='trim_timelines',
+            delay=settings.TIMELINE_TRIM_DELAY,
+        )
+    return written
+
+
+def unpull(author_id):
+    """Возвращает раскладку автору, у которого подписчиков снова меньше
+    TIMELINE_FANOUT_MAX_FOLLOWERS; возвращает число лент.
+
+    Его посты с момента since (последние TIMELINE_BACKFILL, как при
+    подписке) раскладываются по лентам подписчиков. Около порога автор
+    может переключаться туда и обратно — это лишь лишняя раскладка.
+    """
+    pulled = PulledAuthor.objects.filter(author_id=author_id).first()
+    followers = Follow.objects.filter(author_id=author_id)
+    if (
+        pulled is None
+        or followers.count() >= settings.TIMELINE_FANOUT_MAX_FOLLOWERS
+    ):
+        return 0
+    # Сначала снимаем отметку: новый пост тогда либо разложит fan_out,
+    # либо он уже в базе и попадёт в выборку ниже.
+    since = pulled.since
+    pulled.delete()
+    posts = list(Post.objects.filter(
+        author_id=author_id, pub_date__gte=since
+    ).values('pk', 'author_id', 'pub_date')[:settings.TIMELINE_BACKFILL])
+    if not posts:
+        return 0
+    return _write(posts, followers)
+
+
+def trim():
+    """Оставляет в каждой ленте TIMELINE_LENGTH самых новых записей."""
+    length = settings.TIMELINE_LENGTH
+    overflowing = TimelineEntry.objects.values('user_id').annotate(
+        total=Count('pk')
+    ).filter(total__gt=length).values_list('user_id', flat=True)
+    removed = 0
+    for user_id in overflowing:
+        entries = TimelineEntry.objects.filter(user_id=user_id)
+        oldest_kept = entries.order_by('-pub_date', '-pk').values_list(
+            'pub_date', 'pk'
+        )[length - 1]
+        removed += entries.filter(
+            Q(pub_date__lt=oldest_kept[0])
+            | Q(pub_date=oldest_kept[0], pk__lt=oldest_kept[1])
+        ).delete()[0]
+    return removed
+
+
+def follow(user, author):
+    """Подписывает и сразу добавляет в ленту последние посты автора."""
+    if user.pk == author.pk:
+        return False
+    with transaction.atomic():
+        _, created = Follow.objects.get_or_create(user=user, author=author)
+        if created and not PulledAuthor.objects.filter(
+            author_id=author.pk
+        ).exists():
+            posts = Post.objects.filter(author_id=author.pk).values(
+                'pk', 'author_id', 'pub_date'
+            )[:settings.TIMELINE_BACKFILL]
+            TimelineEntry.objects.bulk_create(
+                [_entry(post, user.pk) for post in posts],
+                ignore_conflicts=True,
+            )
+    return created
+
+
+def unfollow(user, author):
+    with transaction.atomic():
+        Follow.objects.filter(user=user, author=author).delete()
+        TimelineEntry.objects.filter(user=user, author=author).delete()
+        if PulledAuthor.objects.filter(author_id=author.pk).exists():
+            add_job(
+                'posts.unpull_author',
+                args=(author.pk,),
+                key=f'unpull_author:{author.pk}',
+            )
+
+
+class Timeline:
+    """Лента подписок для Paginator: разложенные записи и посты
+    авторов без раскладки, слитые по (pub_date, id)."""
+
+    ordered = True
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self._recent = None
+
+    @property
+    def recent(self):
+        """Условие на посты подписок без раскладки: автор и начало."""
+        if self._recent is None:
+            condition = Q(pk__in=[])
+            for author_id, since in PulledAuthor.objects.filter(
+                author__following__user_id=self.user_id
+            ).values_list('author_id', 'since'):
+                condition |= Q(author_id=author_id, pub_date__gte=since)
+            self._recent = condition
+        return self._recent
+
+    @property
+    def inbox(self):
+        # Записи, которые есть и среди подмешиваемых постов (разложенные
+        # около since), исключаются: потоки не пересекаются, и count()
+        # совпадает с числом постов на страницах.
+        return TimelineEntry.objects.filter(user_id=self.user_id).exclude(
+            self.recent
+        )
+
+    @property
+    def pulled(self):
+        """Посты подписок, которые не раскладывались по лентам."""
+        return Post.objects.filter(self.recent)
+
+    def count(self):
+        return self.inbox.count() + self.pulled.count()
+
+    def __len__(self):
+        return self.count()
+
+    def _keys(self, stop):
+        streams = (
+            self.inbox.order_by('-pub_date', '-post_id').values_list(
+                'pub_date', 'post_id'
+            )[:stop],
+            self.pulled.order_by('-pub_date', '-pk').values_list(
+                'pub_date', 'pk'
+            )[:stop],
+        )
+        for pub_date, pk in heapq.merge(*streams, reverse=True):
+            yield pk
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start, stop = index.start or 0, index.stop
+        return rows_by_ids(list(self._keys(stop))[start:stop])
+
+
+@receiver(post_written, sender=Post)
+def schedule_fan_out(sender, post, created, **kwargs):
+    if created:
+        add_job('posts.fan_out', args=(post.pk,))
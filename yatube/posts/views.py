@@ -1,14 +1,27 @@
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, render, redirect
+from django.views.decorators.http import require_POST
 
+from core.cache.pages import gzip_page_cache
+from core.tasks import enqueue
+from .counters import record_view, views_count
 from .forms import PostForm
-from .models import Group, Post, User
+from .lookups import attach_relations, groups, users
+from .models import Follow, Group, Post
+from .popular import popular_ids
+from .recent import recent_posts
+from .rows import Rows, rows_by_ids
+from .timeline import Timeline, follow, unfollow
 from .utils import pagination
 
 
+@gzip_page_cache(settings.INDEX_CACHE_TIMEOUT, key_prefix='index_page')
 def index(request):
-    posts = Post.objects.select_related('group', 'author').all()
-    page_obj = pagination(request, posts)
+    page_obj = recent_posts.page(request.GET.get('page'))
+    if page_obj is None:
+        page_obj = pagination(request, Rows(Post.objects.all()))
     context = {
         'page_obj': page_obj,
     }
@@ -16,9 +29,8 @@ def index(request):
 
 
 def group_posts(request, slug):
-    group = get_object_or_404(Group, slug=slug)
-    posts = group.posts.select_related('author').all()
-    page_obj = pagination(request, posts)
+    group = groups.get_or_404(slug)
+    page_obj = pagination(request, Rows(group.posts.all()))
     context = {
         'group': group,
         'page_obj': page_obj
@@ -26,32 +38,75 @@ def group_posts(request, slug):
     return render(request, 'posts/group_list.html', context)
 
 
+def popular(request):
+    context = {
+        'posts': rows_by_ids(popular_ids()),
+    }
+    return render(request, 'posts/popular.html', context)
+
+
+def group_popular(request, slug):
+    group = groups.get_or_404(slug)
+    context = {
+        'group': group,
+        'posts': rows_by_ids(popular_ids(group.pk)),
+    }
+    return render(request, 'posts/popular.html', context)
+
+
+@login_required
+def group_autocomplete(request):
+    """Группы, название которых начинается с q, для формы поста.
+
+    Поиск по префиксу идёт диапазоном по индексу на title.
+    """
+    prefix = request.GET.get('q', '').strip()
+    found = []
+    if prefix:
+        found = list(Group.objects.filter(
+            title__gte=prefix, title__lt=prefix + '\U0010ffff'
+        ).order_by('title').values('id', 'title')[
+            :settings.GROUP_AUTOCOMPLETE_LIMIT
+        ])
+    return JsonResponse({'results': found})
+
+
 def profile(request, username):
-    author = get_object_or_404(User, username=username)
-    posts = author.posts.select_related('group').all()
-    page_obj = pagination(request, posts)
+    author = users.get_or_404(username)
+    page_obj = pagination(request, Rows(author.posts.all()))
+    following = (
+        request.user.is_authenticated
+        and Follow.objects.filter(user=request.user, author=author).exists()
+    )
     context = {
         'page_obj': page_obj,
         'author': author,
+        'following': following,
     }
     return render(request, 'posts/profile.html', context)
 
 
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, id=post_id)
+    post = attach_relations(get_object_or_404(Post, id=post_id))
+    record_view(post.pk)
     context = {
         'post': post,
+        'views': views_count(post.pk),
     }
     return render(request, 'posts/post_detail.html', context)
 
 
 @login_required
 def post_create(request):
-    form = PostForm(request.POST or None)
+    form = PostForm(request.POST or None, files=request.FILES or None)
     if form.is_valid():
         new_post = form.save(commit=False)
         new_post.author = request.user
         new_post.save()
+        enqueue(
+            'posts.post_written', new_post.pk, True,
+            key=f'post_written:{new_post.pk}'
+        )
         return redirect('posts:profile', username=request.user)
     context = {
         'form': form
@@ -64,11 +119,42 @@ def post_edit(request, post_id):
     post = get_object_or_404(Post, id=post_id)
     if request.user != post.author:
         return redirect('posts:post_detail', post_id=post_id)
-    form = PostForm(request.POST or None, instance=post)
+    form = PostForm(
+        request.POST or None,
+        files=request.FILES or None,
+        instance=post
+    )
     if form.is_valid():
         form.save()
+        enqueue(
+            'posts.post_written', post.pk, False,
+            key=f'post_written:{post.pk}'
+        )
         return redirect('posts:post_detail', post_id=post_id)
     context = {
         'form': form,
     }
     return render(request, 'posts/create_post.html', context)
+
+
+@login_required
+def follow_index(request):
+    page_obj = pagination(request, Timeline(request.user.pk))
+    context = {
+        'page_obj': page_obj,
+    }
+    return render(request, 'posts/follow.html', context)
+
+
+@require_POST
+@login_required
+def profile_follow(request, username):
+    follow(request.user, users.get_or_404(username))
+    return redirect('posts:profile', username=username)
+
+
+@require_POST
+@login_required
+def profile_unfollow(request, username):
+    unfollow(request.user, users.get_or_404(username))
+    return redirect('posts:profile', username=username)
@@ -1,5 +1,10 @@
+from django.contrib.auth import forms as auth_forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth import get_user_model
+from django.core.mail import EmailMultiAlternatives
+from django.template import loader
+
+from core.mail import ACCOUNT_HEADER
 
 
 User = get_user_model()
@@ -9,3 +14,28 @@ class CreationForm(UserCreationForm):
     class Meta(UserCreationForm.Meta):
         model = User
         fields = ('first_name', 'last_name', 'username', 'email')
+
+
+class PasswordResetForm(auth_forms.PasswordResetForm):
+    """Сброс пароля, у которого письмо помечено аккаунтом.
+
+    На один адрес может быть заведено несколько аккаунтов: письмо
+    каждому из них должно дойти, а не заменить письмо соседу.
+    """
+
+    def send_mail(self, subject_template_name, email_template_name,
+                  context, from_email, to_email,
+                  html_email_template_name=None):
+        subject = loader.render_to_string(subject_template_name, context)
+        subject = ''.join(subject.splitlines())
+        body = loader.render_to_string(email_template_name, context)
+        email_message = EmailMultiAlternatives(
+            subject, body, from_email, [to_email],
+            headers={ACCOUNT_HEADER: context['uid']},
+        )
+        if html_email_template_name is not None:
+            html_email = loader.render_to_string(
+                html_email_template_name, context
+            )
+            email_message.attach_alternative(html_email, 'text/html')
+        email_message.send()
@@ -2,6 +2,7 @@ from django.urls import path
 from django.contrib.auth.views import LoginView, LogoutView, PasswordResetView
 
 from . import views
+from .forms import PasswordResetForm
 
 app_name = 'users'
 
@@ -20,6 +21,7 @@ urlpatterns = [
     path(
         'password_reset/',
         PasswordResetView.as_view(
+            form_class=PasswordResetForm,
             template_name='registration/password_reset.html'
         ),
         name='password_reset'
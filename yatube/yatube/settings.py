@@ -21,20 +21,24 @@ INSTALLED_APPS = [
     'core.apps.CoreConfig',
     'users.apps.UsersConfig',
     'posts.apps.PostsConfig',
+    'api.apps.ApiConfig',
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'sorl.thumbnail',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.StaticFilesMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.RateLimitMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -43,12 +47,22 @@ ROOT_URLCONF = 'yatube.urls'
 
 TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
 
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+# Без DEBUG шаблоны компилируются один раз на процесс.
+if not DEBUG:
+    TEMPLATE_LOADERS = [
+        ('django.template.loaders.cached.Loader', TEMPLATE_LOADERS),
+    ]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': TEMPLATE_LOADERS,
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -62,11 +76,35 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'yatube.wsgi.application'
 
+# Прогревать ли процесс при импорте WSGI-приложения (core.warmup).
+WARMUP_ON_START = True
+WARMUP_HOOKS = [
+    'posts.recent.prime',
+    'posts.forms.group_choices',
+]
+
+# manage.py serve (core.server).
+SERVE_WORKERS = os.cpu_count() or 2
+SERVE_MAX_REQUESTS = 10000
+SERVE_MAX_RSS_MB = 512
+SERVE_BACKLOG = 128
+
+# manage.py loadtest (core.loadtest).
+LOADTEST_SCENARIO = 'posts.loadtest.Scenario'
+LOADTEST_MIX = (
+    'index=50,group_posts=15,profile=15,post_detail=15,post_create=5'
+)
+LOADTEST_RATE = 50
+LOADTEST_DURATION = 10
+
 
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        'OPTIONS': {
+            'timeout': 20,
+        },
     }
 }
 
@@ -98,15 +136,161 @@ USE_L10N = True
 USE_TZ = True
 
 STATIC_URL = '/static/'
+STATIC_ROOT = os.path.join(BASE_DIR, 'collected_static')
+STATIC_MAX_AGE = 60
+STATIC_IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+STATIC_COMPRESS_MIN_SIZE = 256
+STATIC_COMPRESS_EXTENSIONS = (
+    '.css', '.js', '.svg', '.txt', '.xml', '.json', '.map', '.ico', '.html',
+)
+
+if not DEBUG:
+    STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+
+MEDIA_URL = '/media/'
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+MEDIA_CACHE_MAX_AGE = 60 * 60 * 24
+
+# Sitemap-файлы собирает manage.py build_sitemaps (posts.sitemaps).
+SITEMAP_ROOT = os.path.join(BASE_DIR, 'sitemaps')
+SITEMAP_URL = '/sitemaps/'
+SITEMAP_BASE_URL = 'http://localhost:8000'
+SITEMAP_SHARD_SIZE = 50000
+SITEMAP_BATCH_SIZE = 2000
+SITEMAP_MAX_AGE = 60 * 60
+SITEMAP_REBUILD_DELAY = 5 * 60
 
 SORT10 = 10
 
 SORT13 = 13
 
+INDEX_CACHE_TIMEOUT = 20
+
+# Ленты сбрасываются при изменении постов, срок лишь страхует.
+FEED_ITEMS = 10
+FEED_CACHE_TIMEOUT = 60 * 60
+
+# Ленты подписок (posts.timeline): длина ленты, сколько постов
+# добавлять при подписке, размер пачки раскладки и число подписчиков,
+# начиная с которого посты автора подмешиваются при чтении.
+TIMELINE_LENGTH = 1000
+TIMELINE_BACKFILL = 50
+TIMELINE_BATCH_SIZE = 1000
+TIMELINE_FANOUT_MAX_FOLLOWERS = 10000
+TIMELINE_TRIM_DELAY = 60
+
+# Просмотры постов пишутся в базу пачками раз в столько секунд
+# фоновым потоком (posts.counters); 0 — сразу, без потока.
+VIEW_COUNTS_FLUSH_INTERVAL = 5
+# Популярные посты (posts.popular): размер списка, период полураспада
+# веса просмотра и как часто пересчитывать списки, в секундах.
+POPULAR_SIZE = 10
+POPULAR_HALF_LIFE = 6 * 60 * 60
+POPULAR_REFRESH = 60
+
+# Ограничение частоты запросов (core.ratelimit) по имени маршрута:
+# методы, жетонов в минуту и размер ведра. С DEBUG выключено.
+RATELIMIT_ENABLED = not DEBUG
+RATELIMITS = {
+    'posts:post_create': {'methods': ('POST',), 'per_minute': 10, 'burst': 5},
+    'posts:post_edit': {'methods': ('POST',), 'per_minute': 20, 'burst': 10},
+    'users:login': {'methods': ('POST',), 'per_minute': 5, 'burst': 5},
+    'users:signup': {'methods': ('POST',), 'per_minute': 3, 'burst': 3},
+    'users:password_reset': {
+        'methods': ('POST',), 'per_minute': 3, 'burst': 3,
+    },
+}
+
+# JSON API: размер страницы по умолчанию и наибольший через limit=.
+API_PAGE_SIZE = 10
+API_MAX_PAGE_SIZE = 100
+API_MAX_AGE = 10
+# Отметки самых новых постов для api/v1/posts/since/ (api.since).
+SINCE_CACHE_TIMEOUT = 60 * 60
+# Сервер долгого опроса (manage.py longpoll) и адрес его UDP-уведомлений;
+# None отключает уведомления.
+LONGPOLL_HOST = '127.0.0.1'
+LONGPOLL_PORT = 8001
+LONGPOLL_NOTIFY_ADDRESS = ('127.0.0.1', 8002)
+LONGPOLL_MAX_WAIT = 30
+LONGPOLL_THREADS = 4
+
+# Сколько первых страниц главной отдаётся из буфера в памяти процесса.
+RECENT_POSTS_PAGES = 3
+
+# Сколько групп и пользователей помнит кеш поиска в каждом процессе.
+LOOKUP_CACHE_SIZE = 1024
+
+# Больше групп форма поста не выводит списком, а подбирает по вводу.
+GROUP_CHOICES_LIMIT = 100
+GROUP_AUTOCOMPLETE_LIMIT = 20
+
+# Карточка поста показывает отрывок такой длины.
+POST_EXCERPT_LENGTH = 500
+# Тексты от этой длины хранятся в базе сжатыми; None отключает сжатие.
+POST_COMPRESS_MIN_LENGTH = 64 * 1024
+
+
+def _profile_url(user):
+    # Импорт внутри функции: settings.py не тянет код приложений.
+    from core.reverse import reverse_cached
+    return reverse_cached('posts:profile', (user.username,))
+
+
+# Ссылка на профиль пользователя строится через кеш reverse.
+ABSOLUTE_URL_OVERRIDES = {
+    'auth.user': _profile_url,
+}
+
 ZERO = 0
 
 LOGIN_URL = 'users:login'
 LOGIN_REDIRECT_URL = 'posts:index'
 
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+CACHES = {
+    'default': {
+        'BACKEND': 'core.cache.mmap.MmapCache',
+        'LOCATION': os.path.join(BASE_DIR, 'cache.mmap'),
+        'OPTIONS': {
+            'SLOTS': 8192,
+            'SLOT_SIZE': 8192,
+        },
+    },
+}
+
+STAMPEDE_LOCK_TIMEOUT = 30
+STAMPEDE_STALE_TIMEOUT = 60
+STAMPEDE_WAIT_INTERVAL = 0.05
+STAMPEDE_BETA = 1.0
+
+# db — каждая сессия читается из таблицы django_session;
+# signed_cookies — данные сессии целиком в подписанной cookie;
+# write_behind — сессии в кеше, в базу пишутся пачками (нужен общий кеш,
+# не вытесняющий сессии до записи, поэтому только явно).
+SESSION_MODE = 'db'
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+    'write_behind': 'core.sessions.write_behind',
+}
+SESSION_ENGINE = SESSION_ENGINES[SESSION_MODE]
+SESSION_WRITE_BEHIND_INTERVAL = 5
+
+EMAIL_BACKEND = 'core.mail.OutboxBackend'
+OUTBOX_DELIVERY_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+OUTBOX_BATCH_SIZE = 100
+OUTBOX_MAX_ATTEMPTS = 5
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
+
+TASKS_WORKERS = 4
+TASKS_POLL_INTERVAL = 1
+TASKS_MAX_ATTEMPTS = 5
+TASKS_RETRY_DELAY = 10
+TASKS_LOCK_TIMEOUT = 300
+TASKS_CLAIM_BATCH = 10
+
+THUMBNAIL_BACKEND = 'posts.thumbnails.PregeneratedThumbnailBackend'
+POST_THUMBNAILS = {
+    'card': ('960x339', {'crop': 'center', 'upscale': True}),
+    'detail': ('960x600', {'upscale': False}),
+}
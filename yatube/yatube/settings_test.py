@@ -0,0 +1,53 @@
+"""Настройки для тестов: manage.py test и pytest выбирают их сами."""
+import atexit
+import os
+import shutil
+import tempfile
+
+from .settings import *  # noqa: F401,F403
+
+# Пароли в тестах хешируются быстро, а не сотнями тысяч итераций.
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
+
+# Тестовая база — в памяти; при --parallel у каждого процесса своя копия.
+DATABASES['default']['TEST'] = {'NAME': ':memory:'}  # noqa: F405
+
+# Свой кеш у каждого процесса: тесты чистят кеш и не должны мешать
+# соседним процессам, а общий файл cache.mmap живёт между запусками.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'yatube-tests',
+    },
+}
+
+# Серверам, которые тесты запускают подпроцессами, передаётся временный
+# каталог: база и общий кеш воркеров — там, а не в BASE_DIR.
+TEST_DATA_DIR = os.environ.get('YATUBE_TEST_DATA_DIR')
+if TEST_DATA_DIR:
+    DATABASES['default']['NAME'] = os.path.join(  # noqa: F405
+        TEST_DATA_DIR, 'db.sqlite3'
+    )
+    CACHES['default'] = {
+        'BACKEND': 'core.cache.mmap.MmapCache',
+        'LOCATION': os.path.join(TEST_DATA_DIR, 'cache.mmap'),
+        'OPTIONS': {'SLOTS': 256, 'SLOT_SIZE': 8192},
+    }
+
+# Картинки, которые создают тесты и фикстуры mixer, пишутся во временный
+# каталог, а не в media проекта, и удаляются по завершении прогона.
+MEDIA_ROOT = tempfile.mkdtemp(prefix='yatube-media-', dir=TEST_DATA_DIR)
+atexit.register(shutil.rmtree, MEDIA_ROOT, ignore_errors=True)
+
+# Шаблоны компилируются один раз за прогон.
+TEMPLATES[0]['OPTIONS']['loaders'] = [  # noqa: F405
+    ('django.template.loaders.cached.Loader', TEMPLATE_LOADERS),  # noqa: F405
+]
+
+RATELIMIT_ENABLED = False
+LONGPOLL_NOTIFY_ADDRESS = None
+
+# Просмотры пишутся сразу, в транзакции теста, и не копятся до выхода.
+VIEW_COUNTS_FLUSH_INTERVAL = 0
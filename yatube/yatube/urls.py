@@ -1,11 +1,30 @@
+from django.conf import settings
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
+
+from core.views import media, sitemap
 
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', include('posts.urls', namespace='posts')),
-    path('auth/', include('django.contrib.auth.urls')),
+    path('api/v1/', include('api.urls', namespace='api')),
+    # Свои маршруты раньше стандартных: на auth/password_reset/
+    # работает форма из users, а не из django.contrib.auth.
     path('auth/', include('users.urls', namespace='users')),
-    path('about/', include('about.urls', namespace='about'))
+    path('auth/', include('django.contrib.auth.urls')),
+    path('about/', include('about.urls', namespace='about')),
+    re_path(
+        r'^{}(?P<path>.*)$'.format(settings.MEDIA_URL.lstrip('/')),
+        media,
+        name='media'
+    ),
+    path('sitemap.xml', sitemap, name='sitemap'),
+    re_path(
+        r'^{}(?P<path>[\w-]+\.xml)$'.format(
+            settings.SITEMAP_URL.lstrip('/')
+        ),
+        sitemap,
+        name='sitemap_shard',
+    ),
 ]